@@ -0,0 +1,199 @@
+import numpy as np
+
+from .board import SYMBOL_CODES, CELL_WEIGHTS
+from .metrics import RESULT_CODES
+from .tic_tac_toe import TicTacToe
+
+# Cell positions of the eight winning lines
+LINES = np.array([[0, 1, 2], [3, 4, 5], [6, 7, 8],
+                  [0, 3, 6], [1, 4, 7], [2, 5, 8],
+                  [0, 4, 8], [2, 4, 6]])
+WEIGHTS = np.array(CELL_WEIGHTS, dtype=np.int64)
+
+# The bot plays as the first player of TicTacToe and the model as the second one, as in main.py train
+BOT_CODE = SYMBOL_CODES[TicTacToe.SYMBOL_PLAYER1]
+MODEL_CODE = SYMBOL_CODES[TicTacToe.SYMBOL_PLAYER2]
+
+# Rewards of the model, the same the learners use
+REWARD_WIN = 10
+REWARD_LOOSE = -10
+REWARD_DRAW = -2
+REWARD_STEP = -0.1
+REWARD_INVALID = -50
+
+# Game result codes, the same the training metrics record
+RESULT_NONE = -1
+RESULT_WIN = RESULT_CODES['W']
+RESULT_LOOSE = RESULT_CODES['L']
+RESULT_DRAW = RESULT_CODES['D']
+RESULT_INVALID = RESULT_CODES['I']
+
+
+def winners(boards: np.ndarray, code: int) -> np.ndarray:
+    """
+    Checks which boards of a batch have a winning line of the given symbol code.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        Array of shape (n, 9) with the symbol code of each cell.
+    code : int
+        The symbol code to check.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (n,), True for the boards where the symbol has won.
+    """
+    return (boards[:, LINES] == code).all(axis=2).any(axis=1)
+
+
+class BatchTicTacToe:
+    """
+    Headless Tic Tac Toe environment stepping a batch of independent games at once.
+    The model plays against a uniformly random bot, which replies inside each step, so every observed state has the
+    model to move.
+    """
+
+    def __init__(self, n_games: int, rng: np.random.Generator = None, random_start: bool = False):
+        """
+        Initializes the batch of games. Call reset to start them.
+
+        Parameters
+        ----------
+        n_games : int
+            The number of games played at once.
+        rng : np.random.Generator, optional
+            The random generator for the bot moves and the starting positions.
+        random_start : bool
+            If True, games start from a random board without winner, as TicTacToe.random_board.
+        """
+        self.n_games = n_games
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.random_start = random_start
+        self.boards = np.zeros((n_games, 9), dtype=np.int8)
+        self.states = np.zeros(n_games, dtype=np.int64)
+
+    def legal_mask(self) -> np.ndarray:
+        """
+        Returns the legal moves of every game.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array of shape (n_games, 9), True for the empty cells.
+        """
+        return self.boards == 0
+
+    def random_legal_actions(self, games: np.ndarray = None) -> np.ndarray:
+        """
+        Picks a uniformly random legal move for each of the given games.
+
+        Parameters
+        ----------
+        games : np.ndarray, optional
+            Indexes of the games, all of them if not given.
+
+        Returns
+        -------
+        np.ndarray
+            The chosen cell of each game.
+        """
+        boards = self.boards if games is None else self.boards[games]
+        scores = self.rng.random(boards.shape)
+        scores[boards != 0] = -1
+        return scores.argmax(axis=1)
+
+    def reset(self, games: np.ndarray = None) -> np.ndarray:
+        """
+        Starts new games. Each game is randomly started by the bot or the model, and if random_start is set it begins
+        from a random board. Positions where the game ends before the model moves are drawn again.
+
+        Parameters
+        ----------
+        games : np.ndarray, optional
+            Indexes of the games to restart, all of them if not given.
+
+        Returns
+        -------
+        np.ndarray
+            The state codes of all the games.
+        """
+        pending = np.arange(self.n_games) if games is None else np.asarray(games)
+        while len(pending) > 0:
+            self.boards[pending] = 0
+            self.states[pending] = 0
+            if self.random_start:
+                self._random_boards(pending)
+            bot_first = pending[self.rng.random(len(pending)) < 0.5]
+            self._place(bot_first, self.random_legal_actions(bot_first), BOT_CODE)
+            boards = self.boards[pending]
+            ended = winners(boards, BOT_CODE) | winners(boards, MODEL_CODE) | (boards != 0).all(axis=1)
+            pending = pending[ended]
+        return self.states.copy()
+
+    def step(self, actions: np.ndarray, games: np.ndarray = None):
+        """
+        Plays the model moves and the bot replies of the given games.
+        An occupied cell ends the game as an invalid move.
+
+        Parameters
+        ----------
+        actions : np.ndarray
+            The cell chosen by the model in each game.
+        games : np.ndarray, optional
+            Indexes of the games, all of them if not given.
+
+        Returns
+        -------
+        tuple
+            The state codes after the bot reply, the model rewards, whether each game is over and the result code of
+            each game (RESULT_NONE while the game continues).
+        """
+        games = np.arange(self.n_games) if games is None else np.asarray(games)
+        actions = np.asarray(actions)
+        rewards = np.full(len(games), REWARD_STEP)
+        results = np.full(len(games), RESULT_NONE)
+
+        invalid = self.boards[games, actions] != 0
+        rewards[invalid] = REWARD_INVALID
+        results[invalid] = RESULT_INVALID
+        valid = ~invalid
+        self._place(games[valid], actions[valid], MODEL_CODE)
+
+        boards = self.boards[games]
+        full = (boards != 0).all(axis=1)
+        won = valid & winners(boards, MODEL_CODE)
+        rewards[won] = REWARD_WIN
+        results[won] = RESULT_WIN
+        drawn = valid & ~won & full
+        rewards[drawn] = REWARD_DRAW
+        results[drawn] = RESULT_DRAW
+
+        # The bot replies on the games still going
+        playing = results == RESULT_NONE
+        bot_games = games[playing]
+        self._place(bot_games, self.random_legal_actions(bot_games), BOT_CODE)
+        boards = self.boards[games]
+        full = (boards != 0).all(axis=1)
+        lost = playing & winners(boards, BOT_CODE)
+        rewards[lost] = REWARD_LOOSE
+        results[lost] = RESULT_LOOSE
+        drawn = playing & ~lost & full
+        rewards[drawn] = REWARD_DRAW
+        results[drawn] = RESULT_DRAW
+
+        return self.states[games], rewards, results != RESULT_NONE, results
+
+    def _place(self, games: np.ndarray, cells: np.ndarray, code: int):
+        self.boards[games, cells] = code
+        self.states[games] += code * WEIGHTS[cells]
+
+    def _random_boards(self, games: np.ndarray):
+        # Random number of moves alternating symbols, starting with a random one, as TicTacToe.random_board
+        moves = self.rng.integers(0, 9, len(games))
+        codes = np.where(self.rng.random(len(games)) < 0.5, BOT_CODE, MODEL_CODE)
+        for move in range(8):
+            playing = games[moves > move]
+            self._place(playing, self.random_legal_actions(playing), codes[moves > move])
+            codes = BOT_CODE + MODEL_CODE - codes
@@ -0,0 +1,303 @@
+import numpy as np
+
+from .batch_env import BatchTicTacToe, RESULT_INVALID
+from .monte_carlo import MonteCarloEsControl
+from .q_learning import QLearning, N_STATES, N_ACTIONS
+from .utils import legal_mask_table, symmetry_tables
+
+# The model can't play more than 5 moves in a game
+MAX_MODEL_MOVES = 5
+
+
+class BatchTrainer:
+    """
+    Base class of the trainers playing a batch of headless games at once against the random bot.
+    The learner tables are held in dense arrays indexed by state code while training, call sync to write them back
+    into the model. With symmetry, the tables are indexed by canonical state codes and actions are chosen in the
+    canonical board frame.
+    """
+
+    def __init__(self, n_games: int, seed: int = None, random_start: bool = False, symmetry: bool = False):
+        """
+        Initializes the batch of games.
+
+        Parameters
+        ----------
+        n_games : int
+            The number of games played at once.
+        seed : int, optional
+            The seed of the random generator.
+        random_start : bool
+            If True, games start from a random board.
+        symmetry : bool
+            If True, states and actions are mapped to the canonical representative of their symmetries.
+        """
+        self.symmetry = symmetry
+        if symmetry:
+            self.canonical_states, self.transforms, self.forward_actions, self.inverse_actions = symmetry_tables()
+        self.rng = np.random.default_rng(seed)
+        self.env = BatchTicTacToe(n_games, self.rng, random_start)
+        self.states = self.env.reset()
+        self.episode_rewards = np.zeros(n_games)
+        # Last step of the games that finished past the episodes of the previous call, learnt on the next one
+        self.pending = None
+
+    def train(self, episodes: int):
+        """
+        Plays games until the given number of episodes finish, learning from every move.
+        Games still in progress at the end continue on the next call, and so do the games finishing on the last step
+        past the given number of episodes: their last step is learnt and recorded on the next call, so every episode
+        learnt from is recorded.
+
+        Parameters
+        ----------
+        episodes : int
+            The number of episodes to finish.
+        """
+        finished = 0
+        if self.pending is not None:
+            finished += self._finish_step(*self.pending, quota=episodes)
+        while finished < episodes:
+            keys, transforms = self._keys(self.states)
+            actions = self._choose_actions(keys, transforms)
+            env_actions = self.inverse_actions[transforms, actions] if self.symmetry else actions
+            next_states, rewards, done, results = self.env.step(env_actions)
+            next_keys, _ = self._keys(next_states)
+            finished += self._finish_step(np.arange(len(actions)), keys, actions, rewards, next_keys, done, results,
+                                          quota=episodes - finished)
+
+    def sync(self):
+        """
+        Writes the dense tables back into the model.
+        """
+
+    def random_state(self) -> dict:
+        """
+        Returns the state of the random generator, to resume training from a checkpoint.
+
+        Returns
+        -------
+        dict
+            The state of the bit generator.
+        """
+        return self.rng.bit_generator.state
+
+    def set_random_state(self, state: dict):
+        """
+        Restores the state of the random generator and starts new games.
+
+        Parameters
+        ----------
+        state : dict
+            The state returned by random_state.
+        """
+        self.rng.bit_generator.state = state
+        self.states = self.env.reset()
+        self.episode_rewards[:] = 0
+        self.pending = None
+
+    def _finish_step(self, games: np.ndarray, keys: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                     next_keys: np.ndarray, done: np.ndarray, results: np.ndarray, quota: int) -> int:
+        # Learns from a step of the given games, then records and restarts the finished ones, up to the quota. The
+        # step of the games finishing past the quota is kept for the next call, without learning from it.
+        self.pending = None
+        late = np.flatnonzero(done)[quota:]
+        if len(late) > 0:
+            step = (games, keys, actions, rewards, next_keys, done, results)
+            self.pending = tuple(array[late] for array in step)
+            kept = np.ones(len(games), dtype=bool)
+            kept[late] = False
+            games, keys, actions, rewards, next_keys, done, results = (array[kept] for array in step)
+        self._learn(games, keys, actions, rewards, next_keys, done)
+        ended = games[done]
+        self._record(ended, results[done])
+        self.episode_rewards[ended] = 0
+        self.states = self.env.reset(ended)
+        return len(ended)
+
+    def _keys(self, states: np.ndarray):
+        # Table keys of the states and the transforms mapping the boards to them
+        if not self.symmetry:
+            return states, None
+        return self.canonical_states[states], self.transforms[states]
+
+    def _random_actions(self, games: np.ndarray, transforms: np.ndarray) -> np.ndarray:
+        # Random legal actions of the given games, in the table frame
+        actions = self.env.random_legal_actions(games)
+        return self.forward_actions[transforms[games], actions] if self.symmetry else actions
+
+    def _choose_actions(self, keys: np.ndarray, transforms: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _learn(self, games: np.ndarray, keys: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+               next_keys: np.ndarray, done: np.ndarray):
+        raise NotImplementedError
+
+    def _record(self, games: np.ndarray, results: np.ndarray):
+        self.model.metrics.record_batch(results, self.episode_rewards[games])
+        # An invalid move ends the game, so every invalid episode has one
+        self.model.metrics.record_invalid_moves(int(np.count_nonzero(results == RESULT_INVALID)))
+
+
+class BatchQLearningTrainer(BatchTrainer):
+    """
+    Batch trainer of a QLearning model. Uses the model Q-values array directly with the numpy backend.
+    Greedy actions and the next state values only consider the empty cells of each board.
+    """
+
+    def __init__(self, model: QLearning, n_games: int = 1024, seed: int = None):
+        """
+        Initializes the trainer.
+
+        Parameters
+        ----------
+        model : QLearning
+            The model to train.
+        n_games : int
+            The number of games played at once.
+        seed : int, optional
+            The seed of the random generator.
+        """
+        super().__init__(n_games, seed, symmetry=model.symmetry)
+        self.model = model
+        self.legal = legal_mask_table()
+        if model.backend == "numpy":
+            self.q_values = model.q_values
+        else:
+            self.q_values = np.zeros((N_STATES, N_ACTIONS), dtype=np.float32)
+            for index, q_values in model.q_values.items():
+                for action, q_value in q_values.items():
+                    self.q_values[index, action] = q_value
+            self.seen = np.zeros(N_STATES, dtype=bool)
+            self.seen[list(model.q_values.keys())] = True
+
+    def sync(self):
+        """
+        Writes the Q-values of the legal actions of the visited states back into the model dict, if the model uses the
+        dict backend.
+        """
+        if self.model.backend == "numpy":
+            return
+        for index in np.flatnonzero(self.seen).tolist():
+            actions = np.flatnonzero(self.legal[index])
+            self.model.q_values[index] = dict(zip(actions.tolist(), self.q_values[index, actions].tolist()))
+
+    def _choose_actions(self, keys: np.ndarray, transforms: np.ndarray) -> np.ndarray:
+        actions = np.where(self.legal[keys], self.q_values[keys], -np.inf).argmax(axis=1)
+        explore = np.flatnonzero(self.rng.random(len(actions)) < self.model.epsilon)
+        actions[explore] = self._random_actions(explore, transforms)
+        if self.model.backend != "numpy":
+            self.seen[keys] = True
+        return actions
+
+    def _learn(self, games: np.ndarray, keys: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+               next_keys: np.ndarray, done: np.ndarray):
+        next_q_values = np.where(self.legal[next_keys], self.q_values[next_keys], -np.inf)
+        max_q_values = np.where(done, 0, next_q_values.max(axis=1))
+        # Games of the batch may share a (state, action) pair, their TD errors are averaged as in QLearning._replay
+        pairs, inverse = np.unique(keys * N_ACTIONS + actions, return_inverse=True)
+        q_values = self.q_values.reshape(-1)
+        td_errors = rewards + self.model.gamma * max_q_values - q_values[pairs][inverse]
+        q_values[pairs] += self.model.alpha * np.bincount(inverse, weights=td_errors) / np.bincount(inverse)
+        self.episode_rewards[games] += rewards
+
+
+class BatchMonteCarloTrainer(BatchTrainer):
+    """
+    Batch trainer of a MonteCarloEsControl model, with exploring starts from random boards.
+    """
+
+    def __init__(self, model: MonteCarloEsControl, n_games: int = 1024, seed: int = None):
+        """
+        Initializes the trainer.
+
+        Parameters
+        ----------
+        model : MonteCarloEsControl
+            The model to train.
+        n_games : int
+            The number of games played at once.
+        seed : int, optional
+            The seed of the random generator.
+        """
+        super().__init__(n_games, seed, random_start=True, symmetry=model.symmetry)
+        self.model = model
+        self.q_values = np.zeros((N_STATES, N_ACTIONS))
+        self.visit_counts = np.zeros((N_STATES, N_ACTIONS), dtype=np.int64)
+        self.policy = np.full(N_STATES, -1, dtype=np.int64)
+        for index, counts in model.visit_counts.items():
+            for action, count in counts.items():
+                self.visit_counts[index, action] = count
+                self.q_values[index, action] = model.q_values[index][action]
+        for index, action in model.policy.items():
+            self.policy[index] = action
+        self.steps = np.zeros(n_games, dtype=np.int64)
+        self.step_states = np.zeros((n_games, MAX_MODEL_MOVES), dtype=np.int64)
+        self.step_actions = np.zeros((n_games, MAX_MODEL_MOVES), dtype=np.int64)
+        self.step_rewards = np.zeros((n_games, MAX_MODEL_MOVES))
+
+    def sync(self):
+        """
+        Writes the Q-values, visit counts and policy of the visited states back into the model dicts.
+        """
+        for index in np.flatnonzero(self.visit_counts.any(axis=1)).tolist():
+            actions = np.flatnonzero(self.visit_counts[index]).tolist()
+            self.model.q_values[index] = {action: float(self.q_values[index, action]) for action in actions}
+            self.model.visit_counts[index] = {action: int(self.visit_counts[index, action]) for action in actions}
+        for index in np.flatnonzero(self.policy >= 0).tolist():
+            self.model.policy[index] = int(self.policy[index])
+
+    def set_random_state(self, state: dict):
+        """
+        Restores the state of the random generator and starts new games, discarding the steps of the current ones.
+
+        Parameters
+        ----------
+        state : dict
+            The state returned by random_state.
+        """
+        super().set_random_state(state)
+        self.steps[:] = 0
+
+    def _choose_actions(self, keys: np.ndarray, transforms: np.ndarray) -> np.ndarray:
+        actions = self.policy[keys]
+        # First movement is random to explore, as well as the movement of states without policy
+        explore = np.flatnonzero((self.steps == 0) | (actions < 0))
+        actions[explore] = self._random_actions(explore, transforms)
+        undefined = self.policy[keys] < 0
+        self.policy[keys[undefined]] = actions[undefined]
+        return actions
+
+    def _learn(self, games: np.ndarray, keys: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+               next_keys: np.ndarray, done: np.ndarray):
+        self.step_states[games, self.steps[games]] = keys
+        self.step_actions[games, self.steps[games]] = actions
+        self.step_rewards[games, self.steps[games]] = rewards
+        self.steps[games] += 1
+        finished = games[done]
+        if len(finished) == 0:
+            return
+        # Returns of every step of the finished games, states can't repeat in a game so every visit is a first visit
+        returns = np.zeros((len(finished), MAX_MODEL_MOVES))
+        cumulative_reward = np.zeros(len(finished))
+        for step in range(MAX_MODEL_MOVES - 1, -1, -1):
+            taken = step < self.steps[finished]
+            cumulative_reward = np.where(taken, self.step_rewards[finished, step] + 0.9 * cumulative_reward, 0)
+            returns[:, step] = cumulative_reward
+        taken = np.arange(MAX_MODEL_MOVES) < self.steps[finished, None]
+        states = self.step_states[finished][taken]
+        actions = self.step_actions[finished][taken]
+        returns = returns[taken]
+        self.episode_rewards[finished] = cumulative_reward
+        # Incremental mean update, equivalent to applying the returns one by one
+        keys, inverse = np.unique(states * N_ACTIONS + actions, return_inverse=True)
+        returns_sum = np.bincount(inverse, weights=returns)
+        returns_count = np.bincount(inverse)
+        q_values = self.q_values.reshape(-1)
+        visit_counts = self.visit_counts.reshape(-1)
+        visit_counts[keys] += returns_count
+        q_values[keys] += (returns_sum - returns_count * q_values[keys]) / visit_counts[keys]
+        # Update the policy of the visited states with their best visited action
+        visited = np.unique(states)
+        self.policy[visited] = np.where(self.visit_counts[visited] > 0, self.q_values[visited], -np.inf).argmax(axis=1)
+        self.steps[finished] = 0
@@ -0,0 +1,50 @@
+import time
+
+from ..bit_board import BitBoard
+from ..board import Board
+from ..utils import board_to_index
+
+BOARD_TYPES = {"list": Board, "bitboard": BitBoard}
+# A mid game position without winner: the queries can't stop at the first cells
+MOVES = [("X", 1, 1), ("O", 0, 0), ("X", 2, 0), ("O", 0, 2), ("X", 0, 1)]
+OPERATIONS = {
+    "is_winner": lambda board: board.is_winner("X"),
+    "is_full": lambda board: board.is_full(),
+    "get_empty_spots": lambda board: board.get_empty_spots(),
+    "board_to_index": board_to_index,
+}
+
+
+def bench_board(board_types: dict = None, repeats: int = 100_000) -> list:
+    """
+    Measures the time of the board queries made on every move of a game, for each board implementation.
+
+    Parameters
+    ----------
+    board_types : dict, optional
+        The board implementations by name, the list and bitboard boards if not given.
+    repeats : int
+        The number of calls measured for each query.
+
+    Returns
+    -------
+    list
+        A list of dicts with the board name, the operation and the mean time per call in microseconds.
+    """
+    results = []
+    for name, board_type in (board_types or BOARD_TYPES).items():
+        board = board_type()
+        for symbol, pos_x, pos_y in MOVES:
+            board.place_symbol(symbol, pos_x, pos_y)
+        for operation, function in OPERATIONS.items():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                function(board)
+            elapsed = time.perf_counter() - start
+            results.append({"board": name, "operation": operation, "call_us": elapsed / repeats * 1e6})
+    return results
+
+
+if __name__ == "__main__":
+    for result in bench_board():
+        print(f"{result['board']:>9} {result['operation']:>16}: {result['call_us']:.3f} us/call")
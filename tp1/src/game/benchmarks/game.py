@@ -0,0 +1,44 @@
+import random
+import time
+
+from ..players import BotPlayer
+from ..tic_tac_toe import TicTacToe
+from .board import BOARD_TYPES
+
+
+def bench_episodes(board_types: dict = None, episodes: int = 10_000, seed: int = 0) -> list:
+    """
+    Measures the throughput of full games between two bots, without observers, for each board implementation.
+
+    Parameters
+    ----------
+    board_types : dict, optional
+        The board implementations by name, the list and bitboard boards if not given.
+    episodes : int
+        The number of games measured for each board.
+    seed : int
+        The seed of the bot moves, so every board plays the same games.
+
+    Returns
+    -------
+    list
+        A list of dicts with the board name, the mean time per episode in microseconds and the episodes per second.
+    """
+    player1, player2 = BotPlayer(), BotPlayer()
+    player1.set_observers([])
+    player2.set_observers([])
+    results = []
+    for name, board_type in (board_types or BOARD_TYPES).items():
+        random.seed(seed)
+        start = time.perf_counter()
+        for _ in range(episodes):
+            TicTacToe(player1, player2, board_type(), observers=[]).start()
+        elapsed = time.perf_counter() - start
+        results.append({"board": name, "episode_us": elapsed / episodes * 1e6, "episodes_per_s": episodes / elapsed})
+    return results
+
+
+if __name__ == "__main__":
+    for result in bench_episodes():
+        print(f"{result['board']:>9}: {result['episode_us']:.2f} us/episode, "
+              f"{result['episodes_per_s']:.0f} episodes/s")
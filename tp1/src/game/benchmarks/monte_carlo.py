@@ -0,0 +1,67 @@
+import random
+import time
+
+from ..board import Board
+from ..monte_carlo import MonteCarloEsControl
+from ..players import BotPlayer
+from ..tic_tac_toe import TicTacToe
+
+# Points of a training run where the time per episode is measured, from 10k to 1M episodes.
+EPISODE_COUNTS = (10_000, 100_000, 1_000_000)
+
+
+def bench_training(episode_counts=EPISODE_COUNTS, repeats: int = 1000, seed: int = 0) -> list:
+    """
+    Measures the time per episode of a MonteCarloEsControl training run against BotPlayer as the run goes on.
+    The model trains as in main.py, from random boards, and the episodes ending at each of the given counts are timed,
+    so the end of episode update is measured with the tables the run has really reached.
+
+    Parameters
+    ----------
+    episode_counts : iterable
+        The increasing numbers of training episodes at which the time per episode is measured.
+    repeats : int
+        The number of episodes timed before each count.
+    seed : int
+        The seed of the moves of the run.
+
+    Returns
+    -------
+    list
+        A list of dicts with the episode count, the mean time per episode in microseconds and the number of states
+        in the Q-values table.
+    """
+    random.seed(seed)
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.set_train(True)
+    monte_carlo.set_observers([])
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    results = []
+    played = 0
+    for episode_count in episode_counts:
+        timed = min(repeats, episode_count - played)
+        _play(monte_carlo, bot_player, episode_count - played - timed)
+        start = time.perf_counter()
+        _play(monte_carlo, bot_player, timed)
+        elapsed = time.perf_counter() - start
+        played = episode_count
+        results.append({"episodes": episode_count, "episode_us": elapsed / timed * 1e6,
+                        "table_states": len(monte_carlo.q_values)})
+    return results
+
+
+def _play(monte_carlo: MonteCarloEsControl, bot_player: BotPlayer, episodes: int):
+    for _ in range(episodes):
+        try:
+            game = TicTacToe(bot_player, monte_carlo, Board(), observers=[])
+            game.random_board()
+            game.start()
+        except RuntimeWarning:
+            pass
+
+
+if __name__ == "__main__":
+    for result in bench_training():
+        print(f"{result['episodes']:>9} episodes: {result['episode_us']:.2f} us/episode, "
+              f"{result['table_states']} states")
@@ -0,0 +1,111 @@
+import random
+import time
+
+from ..board import Board
+from ..players import BotPlayer
+from ..q_learning import QLearning, BACKENDS
+from ..tic_tac_toe import TicTacToe
+
+# Synthetic dict table sizes, far beyond the 3^9 state codes of a 3x3 board, to check the update cost doesn't depend
+# on the number of stored states
+TABLE_SIZES = (10_000, 100_000, 1_000_000)
+# Q-value updates compared by the convergence benchmark: the one-step update, n-step returns and Watkins Q(lambda)
+UPDATES = ({"n_step": 1, "trace_decay": None}, {"n_step": 3, "trace_decay": None}, {"n_step": 1, "trace_decay": 0.5},
+           {"n_step": 1, "trace_decay": 0.9})
+
+
+def bench_update_q_values(table_sizes=TABLE_SIZES, repeats: int = 100_000, backends=BACKENDS) -> list:
+    """
+    Measures the time of a QLearning Q-value update for growing table sizes and each backend.
+    The dict tables are prefilled with the given number of synthetic states, while the numpy table always holds every
+    state, so its sizes are capped by the number of state codes.
+
+    Parameters
+    ----------
+    table_sizes : iterable
+        The number of states stored in the tables before the measured updates.
+    repeats : int
+        The number of updates measured for each table size.
+    backends : iterable
+        The Q-values backends to measure.
+
+    Returns
+    -------
+    list
+        A list of dicts with the backend, the table size and the mean time per update in microseconds.
+    """
+    results = []
+    for backend in backends:
+        for table_size in table_sizes:
+            q_learning = QLearning(backend=backend)
+            if backend == "dict":
+                q_learning.q_values = {index: {action: 0.0 for action in range(9)} for index in range(table_size)}
+            states = min(table_size, len(q_learning.q_values))
+            start = time.perf_counter()
+            for repeat in range(repeats):
+                q_learning._update_q_values(repeat % states, repeat % 9, -0.1, 1.0)
+            elapsed = time.perf_counter() - start
+            results.append({"backend": backend, "table_size": table_size, "update_us": elapsed / repeats * 1e6})
+    return results
+
+
+def bench_convergence(updates=UPDATES, target: float = 0.65, window: int = 500, seeds: int = 5,
+                      max_episodes: int = 20_000, check_episodes: int = 100) -> list:
+    """
+    Measures the number of training episodes against the bot a QLearning model needs to reach a success rate, for
+    each Q-value update. Every update trains the same seeds, and the success rate is checked every few episodes over
+    the last window of episodes, exploratory moves included.
+
+    Parameters
+    ----------
+    updates : iterable
+        The n_step and trace_decay arguments of each update measured.
+    target : float
+        The success rate to reach.
+    window : int
+        The number of latest episodes of the success rate.
+    seeds : int
+        The number of training runs of each update, with seeds 0 to seeds - 1.
+    max_episodes : int
+        The episodes counted for runs not reaching the target.
+    check_episodes : int
+        The number of episodes between checks of the success rate.
+
+    Returns
+    -------
+    list
+        A list of dicts with the update arguments, the target, the mean number of episodes to reach it and the mean
+        time per training episode in microseconds.
+    """
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    results = []
+    for update in updates:
+        total_episodes = 0
+        elapsed = 0.0
+        for seed in range(seeds):
+            random.seed(seed)
+            q_learning = QLearning(backend="numpy", **update)
+            q_learning.set_train(True)
+            q_learning.set_observers([])
+            episodes = 0
+            start = time.perf_counter()
+            while episodes < max_episodes:
+                TicTacToe(bot_player, q_learning, Board(), observers=[]).start()
+                episodes += 1
+                if episodes % check_episodes == 0 and episodes >= window \
+                        and q_learning.metrics.success_rate(window) >= target:
+                    break
+            elapsed += time.perf_counter() - start
+            total_episodes += episodes
+        results.append(dict(update, target=target, mean_episodes=total_episodes / seeds,
+                            episode_us=elapsed / total_episodes * 1e6))
+    return results
+
+
+if __name__ == "__main__":
+    for result in bench_update_q_values():
+        print(f"{result['backend']:>5} {result['table_size']:>9} states: {result['update_us']:.3f} us/update")
+    for result in bench_convergence():
+        print(f"n_step={result['n_step']} trace_decay={result['trace_decay']}: {result['mean_episodes']:.0f} episodes "
+              f"to a {result['target']:.0%} success rate, {result['episode_us']:.1f} us/episode")
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+
+# Folder of main.py, the command line entry point
+MAIN_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Packages slow to import, which short commands such as play must not load
+HEAVY_MODULES = ("matplotlib", "tqdm", "asyncio", "multiprocessing", "cProfile")
+# Import time budget of main.py in milliseconds, several times the expected time so slow machines don't fail it
+STARTUP_BUDGET_MS = 300
+
+
+def import_times(module: str = "main", directory: str = MAIN_DIRECTORY) -> dict:
+    """
+    Imports a module in a new interpreter with -X importtime and returns the import time of every loaded module.
+
+    Parameters
+    ----------
+    module : str
+        The module to import.
+    directory : str
+        The working directory of the interpreter, from where the module is imported.
+
+    Returns
+    -------
+    dict
+        The cumulative import time in microseconds of every module imported, including the module itself.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=directory,
+                               capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def heavy_modules(times: dict) -> list:
+    """
+    Finds the heavy packages among imported modules.
+
+    Parameters
+    ----------
+    times : dict
+        The import times returned by import_times.
+
+    Returns
+    -------
+    list
+        The sorted names of the heavy packages imported.
+    """
+    return sorted({name.split(".")[0] for name in times if name.split(".")[0] in HEAVY_MODULES})
+
+
+def bench_startup(module: str = "main", repeats: int = 5) -> list:
+    """
+    Measures the import time of the command line entry point, the startup cost paid by every command.
+
+    Parameters
+    ----------
+    module : str
+        The module to import.
+    repeats : int
+        The number of measured imports, the fastest one is kept.
+
+    Returns
+    -------
+    list
+        A list with a dict holding the module and its import time in microseconds.
+    """
+    fastest = min(import_times(module)[module] for _ in range(repeats))
+    return [{"module": module, "import_us": fastest}]
+
+
+if __name__ == "__main__":
+    for result in bench_startup():
+        print(f"{result['module']}: {result['import_us'] / 1000:.1f} ms, heavy modules: "
+              f"{', '.join(heavy_modules(import_times(result['module']))) or 'none'}")
@@ -0,0 +1,118 @@
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+from .board import bench_board
+from .game import bench_episodes
+from .monte_carlo import bench_training
+from .q_learning import bench_update_q_values, bench_convergence
+from .startup import bench_startup
+
+# Version of the report layout, increased on incompatible changes
+REPORT_VERSION = 1
+# Table sizes, training episode counts and repetitions of the quick run, for smoke checks
+QUICK_TABLE_SIZES = (1_000, 10_000)
+QUICK_EPISODE_COUNTS = (1_000, 10_000)
+
+
+def run_suite(quick: bool = False) -> dict:
+    """
+    Runs every benchmark and gathers the results in a report.
+
+    Parameters
+    ----------
+    quick : bool
+        If True, runs fewer repetitions on smaller tables. Quick results are noisier and shouldn't be compared with
+        full runs.
+
+    Returns
+    -------
+    dict
+        The report: its version, the run date, the Python and platform versions, whether the run was quick, and the
+        results of each benchmark.
+    """
+    scale = 10 if quick else 1
+    table_sizes = QUICK_TABLE_SIZES if quick else None
+    table_sizes_args = {} if table_sizes is None else {"table_sizes": table_sizes}
+    episode_counts_args = {"episode_counts": QUICK_EPISODE_COUNTS} if quick else {}
+    return {
+        "version": REPORT_VERSION,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "benchmarks": {
+            "board": bench_board(repeats=100_000 // scale),
+            "game": bench_episodes(episodes=10_000 // scale),
+            "q_learning": bench_update_q_values(repeats=100_000 // scale, **table_sizes_args),
+            "monte_carlo": bench_training(repeats=1000 // scale, **episode_counts_args),
+            "startup": bench_startup(repeats=5 if quick else 20),
+            "q_learning_convergence": bench_convergence(seeds=1 if quick else 5),
+        },
+    }
+
+
+def compare_reports(baseline: dict, report: dict, tolerance: float = 0.2) -> list:
+    """
+    Finds the measures of a report slower than in a baseline report by more than the tolerance.
+    Measures are matched by benchmark and parameters, and only times (the fields ending with "_us") are compared.
+    Episode and state counts (the fields ending with "_episodes" or "_states") are measures too, but not compared.
+
+    Parameters
+    ----------
+    baseline : dict
+        The reference report.
+    report : dict
+        The report to check.
+    tolerance : float
+        The allowed relative slowdown.
+
+    Returns
+    -------
+    list
+        A list of dicts with the benchmark, the parameters, the measure, the baseline and current times, and the
+        relative change.
+    """
+    regressions = []
+    for benchmark, results in report["benchmarks"].items():
+        baseline_results = {_params(result): result for result in baseline["benchmarks"].get(benchmark, [])}
+        for result in results:
+            reference = baseline_results.get(_params(result))
+            if reference is None:
+                continue
+            for measure, value in result.items():
+                if measure.endswith("_us") and measure in reference and value > reference[measure] * (1 + tolerance):
+                    regressions.append({"benchmark": benchmark, "params": dict(_params(result)), "measure": measure,
+                                        "baseline": reference[measure], "current": value,
+                                        "change": value / reference[measure] - 1})
+    return regressions
+
+
+def write_report(report: dict, output: str = None):
+    """
+    Writes a report as JSON.
+
+    Parameters
+    ----------
+    report : dict
+        The report returned by run_suite.
+    output : str, optional
+        The path of the JSON file, the standard output if not given.
+    """
+    if output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+def _params(result: dict) -> tuple:
+    # The fields identifying a measure, everything but the measured values
+    return tuple(sorted((key, value) for key, value in result.items()
+                        if not key.endswith(("_us", "_per_s", "_episodes", "_states"))))
+
+
+if __name__ == "__main__":
+    write_report(run_suite())
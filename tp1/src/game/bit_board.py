@@ -0,0 +1,149 @@
+from .board import Board, SYMBOL_CODES, CELL_WEIGHTS
+
+# Bit masks of the eight winning lines. Bit (x + y * 3) represents the cell at column x, row y.
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100  # Diagonals
+)
+FULL_MASK = 0b111111111
+
+# Lookup tables indexed by a 9-bit mask, precomputed once at import time.
+WINNING = tuple(any(mask & line == line for line in WIN_MASKS) for mask in range(FULL_MASK + 1))
+EMPTY_SPOTS = tuple(
+    tuple((pos % 3, pos // 3) for pos in range(9) if not occupied & (1 << pos))
+    for occupied in range(FULL_MASK + 1)
+)
+
+
+class BitBoard(Board):
+    """
+    Tic Tac Toe board backed by one integer bitmask per symbol.
+    It keeps the Board API but answers winner, full and empty spots queries with precomputed tables.
+    """
+
+    def __init__(self, width: int = 3, height: int = 3, k: int = 3):
+        """
+        Initializes the board with no symbols placed.
+
+        Parameters
+        ----------
+        width : int
+            The number of columns, only 3 is supported.
+        height : int
+            The number of rows, only 3 is supported.
+        k : int
+            The number of symbols in a row needed to win, only 3 is supported.
+        """
+        if (width, height, k) != (3, 3, 3):
+            raise ValueError(f"The bitboard only supports 3x3x3 boards, not {width}x{height}x{k}")
+        self.width = width
+        self.height = height
+        self.k = k
+        self.masks = {}
+        self.occupied = 0
+        self.state = 0
+
+    @property
+    def grid(self):
+        """
+        3x3 grid representation of the board, built from the bitmasks.
+
+        Returns
+        -------
+        list
+            A list of rows, each a list of symbols (" " for empty cells).
+        """
+        grid = [[" ", " ", " "],
+                [" ", " ", " "],
+                [" ", " ", " "]]
+        for symbol, mask in self.masks.items():
+            for pos in range(9):
+                if mask & (1 << pos):
+                    grid[pos // 3][pos % 3] = symbol
+        return grid
+
+    @grid.setter
+    def grid(self, grid):
+        """
+        Rebuilds the bitmasks from a 3x3 grid representation.
+
+        Parameters
+        ----------
+        grid : list
+            A list of rows, each a list of symbols (" " for empty cells).
+        """
+        self.masks = {}
+        self.occupied = 0
+        self.state = 0
+        for y in range(3):
+            for x in range(3):
+                if grid[y][x] != " ":
+                    self.place_symbol(grid[y][x], x, y)
+
+    def place_symbol(self, symbol, x, y):
+        """
+        Places a symbol at the specified (x, y) coordinates on the board.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol to place on the board.
+        x : int
+            The x-coordinate (column) where the symbol should be placed.
+        y : int
+            The y-coordinate (row) where the symbol should be placed.
+
+        Returns
+        -------
+        bool
+            True if the symbol was successfully placed, False otherwise.
+        """
+        if x > 2 or x < 0 or y > 2 or y < 0:
+            return False
+        pos = x + y * 3
+        bit = 1 << pos
+        if self.occupied & bit:
+            return False
+        self.masks[symbol] = self.masks.get(symbol, 0) | bit
+        self.occupied |= bit
+        self.state += SYMBOL_CODES[symbol] * CELL_WEIGHTS[pos]
+        return True
+
+    def get_empty_spots(self):
+        """
+        Returns a list of tuples representing the coordinates of empty spots on the board.
+
+        Returns
+        -------
+        list
+            A list of tuples (x, y) representing the coordinates of empty spots.
+        """
+        return list(EMPTY_SPOTS[self.occupied])
+
+    def is_winner(self, symbol):
+        """
+        Checks if the specified symbol has won the game.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol to check for a winning condition.
+
+        Returns
+        -------
+        bool
+            True if the symbol has won, False otherwise.
+        """
+        return WINNING[self.masks.get(symbol, 0)]
+
+    def is_full(self):
+        """
+        Checks if the board is full (i.e., no empty spots left).
+
+        Returns
+        -------
+        bool
+            True if the board is full, False otherwise.
+        """
+        return self.occupied == FULL_MASK
@@ -1,15 +1,75 @@
+# Base-3 digit of each symbol in the integer state code of a board. Empty cells have digit 0.
+SYMBOL_CODES = {"X": 1, "O": 2}
+CELL_WEIGHTS = tuple(3 ** pos for pos in range(9))
+
+
+# Directions of the lines through a cell: row, column, diagonal and anti-diagonal
+LINE_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
 class Board:
     """
-    Tic Tac Toe board class.
+    Tic Tac Toe board class, generalized to width x height boards won with k symbols in a row.
+    Every placed symbol is checked against the lines through its cell only, so a move costs O(k) whatever the board
+    size and the winner and full queries are answered from the recorded results.
     """
 
-    def __init__(self):
+    def __init__(self, width: int = 3, height: int = 3, k: int = 3):
         """
-        Initializes the board with an empty 3x3 grid.
+        Initializes the board with an empty grid.
+        The state attribute holds the base-3 integer code of the board, updated as symbols are placed or when the grid
+        is assigned.
+
+        Parameters
+        ----------
+        width : int
+            The number of columns.
+        height : int
+            The number of rows.
+        k : int
+            The number of symbols in a row needed to win.
+        """
+        if width < 1 or height < 1 or not 1 <= k <= max(width, height):
+            raise ValueError(f"Invalid board size: {width}x{height}x{k}")
+        self.width = width
+        self.height = height
+        self.k = k
+        self._grid = [[" "] * width for _ in range(height)]
+        self.state = 0
+        self.weights = CELL_WEIGHTS if width * height == 9 else tuple(3 ** pos for pos in range(width * height))
+        self.placed = 0
+        self.winners = set()
+
+    @property
+    def grid(self):
         """
-        self.grid = [[" ", " ", " "],
-                     [" ", " ", " "],
-                     [" ", " ", " "]]
+        Grid representation of the board.
+
+        Returns
+        -------
+        list
+            A list of rows, each a list of symbols (" " for empty cells).
+        """
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        """
+        Rebuilds the board from a grid representation, recomputing its state code, filled cells and winners.
+
+        Parameters
+        ----------
+        grid : list
+            A list of height rows, each a list of width symbols (" " for empty cells).
+        """
+        self._grid = [[" "] * self.width for _ in range(self.height)]
+        self.state = 0
+        self.placed = 0
+        self.winners = set()
+        for y in range(self.height):
+            for x in range(self.width):
+                if grid[y][x] != " ":
+                    self.place_symbol(grid[y][x], x, y)
 
     def place_symbol(self, symbol, x, y):
         """
@@ -29,11 +89,15 @@ class Board:
         bool
             True if the symbol was successfully placed, False otherwise.
         """
-        if x > 2 or x < 0 or y > 2 or y < 0:
+        if x >= self.width or x < 0 or y >= self.height or y < 0:
             return False
-        if self.grid[y][x] != " ":
+        if self._grid[y][x] != " ":
             return False
-        self.grid[y][x] = symbol
+        self._grid[y][x] = symbol
+        self.state += SYMBOL_CODES[symbol] * self.weights[x + y * self.width]
+        self.placed += 1
+        if symbol not in self.winners and self._completes_line(symbol, x, y):
+            self.winners.add(symbol)
         return True
 
     def get_empty_spots(self):
@@ -46,9 +110,9 @@ class Board:
             A list of tuples (x, y) representing the coordinates of empty spots.
         """
         places = []
-        for r in range(len(self.grid)):
-            for c in range(3):
-                if self.grid[r][c] == " ":
+        for r in range(self.height):
+            for c in range(self.width):
+                if self._grid[r][c] == " ":
                     places.append((c, r))
         return places
 
@@ -66,18 +130,7 @@ class Board:
         bool
             True if the symbol has won, False otherwise.
         """
-        winner = False
-        for row in range(0, 3):
-            if self.grid[row][0] == self.grid[row][1] == self.grid[row][2] == symbol:
-                winner = True
-        for col in range(0, 3):
-            if self.grid[0][col] == self.grid[1][col] == self.grid[2][col] == symbol:
-                winner = True
-        if self.grid[0][0] == self.grid[1][1] == self.grid[2][2] == symbol:
-            winner = True
-        if self.grid[0][2] == self.grid[1][1] == self.grid[2][0] == symbol:
-            winner = True
-        return winner
+        return symbol in self.winners
 
     def is_full(self):
         """
@@ -88,14 +141,28 @@ class Board:
         bool
             True if the board is full, False otherwise.
         """
-        return " " not in (set([rowcol for row in self.grid for rowcol in row]))
+        return self.placed == self.width * self.height
 
     def print(self):
         """
         Prints the current state of the board.
         """
-        rows = len(self.grid)
-        print("---+---+---")
-        for r in range(rows):
-            print(self.grid[r][0], " |", self.grid[r][1], "|", self.grid[r][2])
-            print("---+---+---")
+        separator = "+".join(["---"] * self.width)
+        print(separator)
+        for row in self.grid:
+            print(" | ".join([row[0] + " "] + row[1:]))
+            print(separator)
+
+    def _completes_line(self, symbol, x, y) -> bool:
+        # Count the symbols in a row through the cell in each direction, looking at most k - 1 cells each way
+        for step_x, step_y in LINE_DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                pos_x, pos_y = x + sign * step_x, y + sign * step_y
+                while count < self.k and 0 <= pos_x < self.width and 0 <= pos_y < self.height \
+                        and self._grid[pos_y][pos_x] == symbol:
+                    count += 1
+                    pos_x, pos_y = pos_x + sign * step_x, pos_y + sign * step_y
+            if count >= self.k:
+                return True
+        return False
@@ -0,0 +1,200 @@
+import os
+import pickle
+import struct
+import time
+import zlib
+
+import numpy as np
+
+# Learner tables saved incrementally, keyed by board state code
+CHECKPOINT_TABLES = ("q_values", "policy", "visit_counts")
+# Every record is framed with its length and CRC32, so a record torn by a crash is detected and dropped
+FRAME_HEADER = struct.Struct("<QI")
+
+
+class Checkpointer:
+    """
+    Writes periodic checkpoints of a training run to a single file.
+    The first record holds the whole model, and the next ones only the table entries changed since the previous
+    checkpoint, the new training metrics and the other attributes of the model, such as its replay buffer. Records
+    are appended and synced one by one, and when the changes add up to more than the whole model the file is rewritten
+    with a single record, to a temporary file renamed over the checkpoint. So the file always holds a complete
+    checkpoint, even if the run is killed while writing.
+    """
+
+    def __init__(self, path: str, model, every_episodes: int = None, every_minutes: float = None,
+                 options: dict = None):
+        """
+        Initializes the checkpointer. Nothing is written until write is called.
+
+        Parameters
+        ----------
+        path : str
+            The path of the checkpoint file.
+        model : Player
+            The MonteCarloEsControl or QLearning model being trained.
+        every_episodes : int, optional
+            The number of episodes between checkpoints.
+        every_minutes : float, optional
+            The number of minutes between checkpoints.
+        options : dict, optional
+            The options of the run, saved with every checkpoint so the run can be resumed with them.
+        """
+        self.path = path
+        self.model = model
+        self.every_episodes = every_episodes
+        self.every_minutes = every_minutes
+        self.options = options or {}
+        self.last_episodes = 0
+        self.last_time = time.monotonic()
+        self.shadow = None
+        self.full_size = 0
+        self.log_size = 0
+
+    def due(self, episodes: int) -> bool:
+        """
+        Checks if a checkpoint is due.
+
+        Parameters
+        ----------
+        episodes : int
+            The number of episodes played so far.
+
+        Returns
+        -------
+        bool
+            True if the episodes or minutes since the last checkpoint reached their limit.
+        """
+        if self.every_episodes is not None and episodes - self.last_episodes >= self.every_episodes:
+            return True
+        return self.every_minutes is not None and time.monotonic() - self.last_time >= self.every_minutes * 60
+
+    def write(self, state: dict):
+        """
+        Writes a checkpoint of the model and the training state.
+
+        Parameters
+        ----------
+        state : dict
+            The training state: at least the number of episodes played, under "episodes".
+        """
+        state = dict(state, options=self.options)
+        if self.shadow is None or self.log_size > self.full_size:
+            self._write_full(state)
+        else:
+            self._write_delta(state)
+        self.last_episodes = state["episodes"]
+        self.last_time = time.monotonic()
+
+    def _write_full(self, state: dict):
+        record = pickle.dumps({"model_type": type(self.model), "model": _attributes(self.model), "state": state})
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            _write_frame(file, record)
+        os.replace(temporary_path, self.path)
+        self.shadow = _snapshot(self.model)
+        self.full_size = len(record)
+        self.log_size = 0
+
+    def _write_delta(self, state: dict):
+        tables = {}
+        for name in CHECKPOINT_TABLES:
+            table = getattr(self.model, name, None)
+            if isinstance(table, np.ndarray):
+                rows = np.flatnonzero((table != self.shadow[name]).any(axis=1))
+                tables[name] = (rows, table[rows])
+            elif table is not None:
+                shadow = self.shadow[name]
+                tables[name] = {key: value for key, value in table.items() if shadow.get(key) != value}
+        metrics = self.model.metrics
+        start = self.shadow["episodes"]
+        record = pickle.dumps({"tables": tables, "results": metrics.results[start:].copy(),
+                               "rewards": metrics.rewards[start:].copy(), "invalid_moves": metrics.invalid_moves,
+                               "episodes": metrics.episodes, "truncated_episodes": metrics.truncated_episodes,
+                               "attributes": _attributes(self.model, exclude=CHECKPOINT_TABLES + ("metrics",)),
+                               "state": state})
+        with open(self.path, "ab") as file:
+            _write_frame(file, record)
+        self.shadow = _snapshot(self.model)
+        self.log_size += len(record)
+
+
+def load_checkpoint(path: str) -> tuple:
+    """
+    Loads the model and training state of the last complete checkpoint of a file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+
+    Returns
+    -------
+    tuple
+        The model and the training state.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    records = _read_frames(data)
+    if not records:
+        raise ValueError(f"No complete checkpoint in {path}")
+    first = pickle.loads(records[0])
+    model = first["model_type"].__new__(first["model_type"])
+    vars(model).update(first["model"])
+    state = first["state"]
+    for record in records[1:]:
+        delta = pickle.loads(record)
+        for name, changes in delta["tables"].items():
+            table = getattr(model, name)
+            if isinstance(table, np.ndarray):
+                rows, values = changes
+                table[rows] = values
+            else:
+                table.update(changes)
+        # The other attributes, such as the replay buffer and its random generator, are saved whole
+        vars(model).update(delta["attributes"])
+        model.metrics.record_batch(delta["results"], delta["rewards"])
+        model.metrics.invalid_moves = delta["invalid_moves"]
+        # Metrics without history only count the episodes
+        model.metrics.episodes = delta["episodes"]
+        model.metrics.truncated_episodes = delta["truncated_episodes"]
+        state = delta["state"]
+    return model, state
+
+
+def _attributes(model, exclude: tuple = ()) -> dict:
+    # Instance attributes holding functions, such as timed methods, aren't saved
+    return {name: value for name, value in vars(model).items() if not callable(value) and name not in exclude}
+
+
+def _snapshot(model) -> dict:
+    # Copies of the tables and the number of recorded episodes, to find the changes of the next checkpoint
+    shadow = {"episodes": len(model.metrics)}
+    for name in CHECKPOINT_TABLES:
+        table = getattr(model, name, None)
+        if isinstance(table, np.ndarray):
+            shadow[name] = table.copy()
+        elif table is not None:
+            shadow[name] = {key: value.copy() if isinstance(value, dict) else value for key, value in table.items()}
+    return shadow
+
+
+def _write_frame(file, record: bytes):
+    file.write(FRAME_HEADER.pack(len(record), zlib.crc32(record)))
+    file.write(record)
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def _read_frames(data: bytes) -> list:
+    # The complete records, up to the first torn or corrupted one
+    records = []
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        size, crc = FRAME_HEADER.unpack_from(data, offset)
+        record = data[offset + FRAME_HEADER.size:offset + FRAME_HEADER.size + size]
+        if len(record) < size or zlib.crc32(record) != crc:
+            break
+        records.append(record)
+        offset += FRAME_HEADER.size + size
+    return records
@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .batch_env import LINES, WEIGHTS
+from .board import SYMBOL_CODES
+from .solver import N_STATES
+from .tic_tac_toe import TicTacToe
+from .utils import legal_mask_table
+
+# Columns of the outcome probabilities, from the model side
+OUTCOMES = ("win", "draw", "loss")
+WIN, DRAW, LOSS = range(3)
+
+
+def exact_outcomes(model, symbol: str = TicTacToe.SYMBOL_PLAYER2) -> dict:
+    """
+    Computes the exact probabilities of winning, drawing and losing of the greedy moves of a trained model against the
+    random bot, without playing games.
+    The bot moves uniformly at random among the empty cells, so the outcome probabilities of every position follow
+    from the ones of the positions it leads to, and are computed in one pass from the full boards back to the empty
+    one. As when the model plays, positions without a known action, or with an invalid one, get a random legal move.
+
+    Parameters
+    ----------
+    model : Player
+        A trained model with a predict_batch method, such as MonteCarloEsControl, QLearning or ModelFilePlayer.
+    symbol : str
+        The symbol the model plays with, the bot plays with the other one.
+
+    Returns
+    -------
+    dict
+        The "win", "draw" and "loss" probabilities of the model when it starts ("model_first"), when the bot starts
+        ("bot_first") and when the first player is chosen randomly as in the games ("average").
+    """
+    model_outcomes, bot_outcomes = outcome_tables(model, symbol)
+    average = (model_outcomes[0] + bot_outcomes[0]) / 2
+    return {name: dict(zip(OUTCOMES, outcomes.tolist()))
+            for name, outcomes in (("model_first", model_outcomes[0]), ("bot_first", bot_outcomes[0]),
+                                   ("average", average))}
+
+
+def outcome_tables(model, symbol: str = TicTacToe.SYMBOL_PLAYER2) -> tuple:
+    """
+    Computes the outcome probabilities of every position against the random bot.
+
+    Parameters
+    ----------
+    model : Player
+        A trained model with a predict_batch method.
+    symbol : str
+        The symbol the model plays with.
+
+    Returns
+    -------
+    tuple
+        Two (3^9, 3) arrays with the win, draw and loss probabilities of the model from every state code, when the
+        model has to move and when the bot has to move.
+    """
+    mover = SYMBOL_CODES[symbol]
+    bot = 3 - mover
+    _, filled, winners = game_tables()
+    legal = legal_mask_table()
+    states = np.arange(N_STATES)
+    actions = np.asarray(model.predict_batch(states), dtype=np.int64)
+    known = (actions >= 0) & (actions < 9)
+    known[known] = legal[states[known], actions[known]]
+    terminal = (winners != 0) | (filled == 9)
+    model_outcomes = np.zeros((N_STATES, 3))
+    model_outcomes[terminal, DRAW] = 1
+    model_outcomes[winners == mover] = np.eye(3)[WIN]
+    model_outcomes[winners == bot] = np.eye(3)[LOSS]
+    bot_outcomes = model_outcomes.copy()
+    # Positions lead to positions with one more filled cell, whose outcomes are known when a level is computed
+    for level in range(8, -1, -1):
+        level_states = np.flatnonzero((filled == level) & ~terminal)
+        cells = legal[level_states]
+        bot_outcomes[level_states] = _mean_outcomes(model_outcomes, level_states, cells, bot)
+        model_outcomes[level_states] = _mean_outcomes(bot_outcomes, level_states, cells, mover)
+        chosen = level_states[known[level_states]]
+        model_outcomes[chosen] = bot_outcomes[chosen + mover * WEIGHTS[actions[chosen]]]
+    return model_outcomes, bot_outcomes
+
+
+def format_outcomes(outcomes: dict) -> str:
+    """
+    Formats the outcome probabilities of the random first player order.
+
+    Parameters
+    ----------
+    outcomes : dict
+        The probabilities returned by exact_outcomes.
+
+    Returns
+    -------
+    str
+        The win, draw and loss probabilities.
+    """
+    average = outcomes["average"]
+    return f"win {average['win']:.3f}, draw {average['draw']:.3f}, loss {average['loss']:.3f}"
+
+
+@lru_cache(maxsize=1)
+def game_tables() -> tuple:
+    """
+    Returns the cells, the number of filled cells and the winner of every board state code.
+
+    Returns
+    -------
+    tuple
+        The (3^9, 9) symbol codes of the cells, the filled cells and the winner symbol code of each state code, 0 if
+        nobody won.
+    """
+    digits = (np.arange(N_STATES)[:, None] // WEIGHTS) % 3
+    winners = np.zeros(N_STATES, dtype=np.int64)
+    for code in (1, 2):
+        winners[(digits[:, LINES] == code).all(axis=2).any(axis=1)] = code
+    return digits, (digits != 0).sum(axis=1), winners
+
+
+def _mean_outcomes(outcomes: np.ndarray, states: np.ndarray, cells: np.ndarray, symbol_code: int) -> np.ndarray:
+    # Outcomes of a uniformly random move among the empty cells
+    children = np.where(cells, states[:, None] + symbol_code * WEIGHTS, 0)
+    return (outcomes[children] * cells[:, :, None]).sum(axis=1) / cells.sum(axis=1)[:, None]
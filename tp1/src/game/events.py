@@ -0,0 +1,59 @@
+from .board import Board
+
+
+class GameObserver:
+    """
+    Base class of the observers of game events. Events are ignored unless a subclass handles them.
+    """
+
+    def on_message(self, message: str):
+        """
+        Method called whenever the game or a player sends a message.
+
+        Parameters
+        ----------
+        message : str
+            The message text.
+        """
+
+    def on_board(self, board: Board):
+        """
+        Method called whenever the board changes after a move.
+
+        Parameters
+        ----------
+        board : Board
+            The current state of the game board.
+        """
+
+
+class ConsoleObserver(GameObserver):
+    """
+    Observer printing the messages and the board to the console.
+    """
+
+    def on_message(self, message: str):
+        """
+        Prints the message.
+
+        Parameters
+        ----------
+        message : str
+            The message text.
+        """
+        print(message)
+
+    def on_board(self, board: Board):
+        """
+        Prints the board.
+
+        Parameters
+        ----------
+        board : Board
+            The current state of the game board.
+        """
+        board.print()
+
+
+# Observers of games and players unless others are set, the console output of the interactive game
+DEFAULT_OBSERVERS = (ConsoleObserver(),)
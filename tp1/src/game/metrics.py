@@ -0,0 +1,260 @@
+import numpy as np
+
+# Episode results, the index of each result is its code in the history arrays
+RESULTS = ('W', 'L', 'D', 'I')
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+WIN_CODE = RESULT_CODES['W']
+# Episodes cut by an invalid move or by the turn limit
+TRUNCATED_CODE = RESULT_CODES['I']
+
+
+class TrainingMetrics:
+    """
+    Training statistics of a learner: the result and total reward of every episode.
+    The last episodes are kept in NumPy ring arrays with running sums, so the rolling average reward and success rate
+    are updated and read in constant time. The full history is kept in compact typed arrays (int8 result codes and
+    float32 rewards) growing geometrically, or dropped when keep_history is False so memory stays bounded. The invalid
+    moves and the truncated episodes, which teach nothing, are counted over the whole run.
+    """
+
+    def __init__(self, window: int = 100, keep_history: bool = True):
+        """
+        Initializes empty statistics.
+
+        Parameters
+        ----------
+        window : int
+            The number of episodes of the rolling window.
+        keep_history : bool
+            If True, the result and reward of every episode are kept.
+        """
+        self.keep_history = keep_history
+        self.episodes = 0
+        self.invalid_moves = 0
+        self.truncated_episodes = 0
+        self._results = np.zeros(0, dtype=np.int8)
+        self._rewards = np.zeros(0, dtype=np.float32)
+        self.set_window(window)
+
+    def __len__(self) -> int:
+        return self.episodes
+
+    @property
+    def results(self) -> np.ndarray:
+        """
+        Result codes of every episode, the index in RESULTS gives the result.
+
+        Returns
+        -------
+        np.ndarray
+            int8 array with one code per episode.
+        """
+        return self._results[:self.episodes]
+
+    @property
+    def rewards(self) -> np.ndarray:
+        """
+        Total reward of every episode.
+
+        Returns
+        -------
+        np.ndarray
+            float32 array with one reward per episode.
+        """
+        return self._rewards[:self.episodes]
+
+    def set_window(self, window: int):
+        """
+        Changes the size of the rolling window. With history, the window is filled again with the last episodes.
+
+        Parameters
+        ----------
+        window : int
+            The number of episodes of the rolling window.
+        """
+        self.window = window
+        self._window_wins = np.zeros(window, dtype=bool)
+        self._window_rewards = np.zeros(window, dtype=np.float64)
+        self._window_size = 0
+        self._window_position = 0
+        self._wins_sum = 0
+        self._rewards_sum = 0.0
+        if self.keep_history and self.episodes:
+            self._add_to_window(self.results[-window:] == WIN_CODE, self.rewards[-window:])
+
+    def record(self, result: str, reward: float):
+        """
+        Records the result and total reward of an episode.
+
+        Parameters
+        ----------
+        result : str
+            The episode result: 'W', 'L', 'D' or 'I'.
+        reward : float
+            The total reward of the episode.
+        """
+        self._push(result == 'W', reward)
+        self.truncated_episodes += result == 'I'
+        if self.keep_history:
+            self._reserve(1)
+            self._results[self.episodes] = RESULT_CODES[result]
+            self._rewards[self.episodes] = reward
+        self.episodes += 1
+
+    def record_batch(self, results: np.ndarray, rewards: np.ndarray):
+        """
+        Records the results and total rewards of several episodes, in order.
+
+        Parameters
+        ----------
+        results : np.ndarray
+            The result codes of the episodes.
+        rewards : np.ndarray
+            The total rewards of the episodes.
+        """
+        results = np.asarray(results, dtype=np.int8)
+        rewards = np.asarray(rewards, dtype=np.float64)
+        if self.keep_history:
+            self._reserve(len(results))
+            self._results[self.episodes:self.episodes + len(results)] = results
+            self._rewards[self.episodes:self.episodes + len(results)] = rewards
+        self.episodes += len(results)
+        self.truncated_episodes += int(np.count_nonzero(results == TRUNCATED_CODE))
+        self._add_to_window(results[-self.window:] == WIN_CODE, rewards[-self.window:])
+
+    def record_invalid_moves(self, moves: int = 1):
+        """
+        Records invalid moves chosen by the learner.
+
+        Parameters
+        ----------
+        moves : int
+            The number of invalid moves.
+        """
+        self.invalid_moves += moves
+
+    def merge(self, other: "TrainingMetrics"):
+        """
+        Records the history and the invalid moves of other statistics after the episodes of these ones.
+
+        Parameters
+        ----------
+        other : TrainingMetrics
+            The statistics to merge, with history.
+        """
+        self.record_batch(other.results, other.rewards)
+        self.invalid_moves += other.invalid_moves
+
+    def save(self, path: str):
+        """
+        Saves the history of the metrics to a .npz file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the metrics file.
+        """
+        np.savez_compressed(path, results=self.results, rewards=self.rewards, window=self.window,
+                            invalid_moves=self.invalid_moves)
+
+    @classmethod
+    def load(cls, path: str) -> "TrainingMetrics":
+        """
+        Loads metrics saved with save.
+
+        Parameters
+        ----------
+        path : str
+            The path of the metrics file.
+
+        Returns
+        -------
+        TrainingMetrics
+            The metrics with the saved history.
+        """
+        with np.load(path) as data:
+            metrics = cls(window=int(data["window"]))
+            metrics.record_batch(data["results"], data["rewards"])
+            metrics.invalid_moves = int(data["invalid_moves"])
+        return metrics
+
+    def average_reward(self, episodes: int = None) -> float:
+        """
+        Returns the average reward over the last episodes.
+
+        Parameters
+        ----------
+        episodes : int, optional
+            The number of episodes, the rolling window if not given. Other sizes need the history.
+
+        Returns
+        -------
+        float
+            The average reward, 0 if there are no episodes.
+        """
+        if episodes is None or episodes == self.window:
+            return self._rewards_sum / self._window_size if self._window_size else 0.0
+        rewards = self._history_tail(episodes)[1]
+        return float(rewards.sum(dtype=np.float64)) / len(rewards) if len(rewards) else 0.0
+
+    def success_rate(self, episodes: int = None) -> float:
+        """
+        Returns the rate of won episodes over the last episodes.
+
+        Parameters
+        ----------
+        episodes : int, optional
+            The number of episodes, the rolling window if not given. Other sizes need the history.
+
+        Returns
+        -------
+        float
+            The success rate, 0 if there are no episodes.
+        """
+        if episodes is None or episodes == self.window:
+            return self._wins_sum / self._window_size if self._window_size else 0.0
+        results = self._history_tail(episodes)[0]
+        return int(np.count_nonzero(results == WIN_CODE)) / len(results) if len(results) else 0.0
+
+    def _history_tail(self, episodes: int):
+        if not self.keep_history:
+            raise ValueError(f"Only the rolling window of {self.window} episodes is kept")
+        start = max(0, self.episodes - episodes)
+        return self._results[start:self.episodes], self._rewards[start:self.episodes]
+
+    def _add_to_window(self, wins: np.ndarray, rewards: np.ndarray):
+        # Wins and rewards have at most window elements. The filled slots are the first ones until the window is full,
+        # so the replaced episodes are the ones at positions below the window size.
+        rewards = np.asarray(rewards, dtype=np.float64)
+        positions = (self._window_position + np.arange(len(wins))) % self.window
+        replaced = positions[positions < self._window_size]
+        self._wins_sum += int(np.count_nonzero(wins)) - int(np.count_nonzero(self._window_wins[replaced]))
+        self._rewards_sum += float(rewards.sum(dtype=np.float64)) \
+            - float(self._window_rewards[replaced].sum(dtype=np.float64))
+        self._window_wins[positions] = wins
+        self._window_rewards[positions] = rewards
+        self._window_size = min(self._window_size + len(wins), self.window)
+        self._window_position = (self._window_position + len(wins)) % self.window
+
+    def _push(self, win: bool, reward: float):
+        # Replace the oldest episode of the window, updating the running sums
+        position = self._window_position
+        if self._window_size == self.window:
+            self._wins_sum -= bool(self._window_wins[position])
+            self._rewards_sum -= float(self._window_rewards[position])
+        else:
+            self._window_size += 1
+        self._window_wins[position] = win
+        self._window_rewards[position] = reward
+        self._wins_sum += bool(win)
+        self._rewards_sum += reward
+        self._window_position = (position + 1) % self.window
+
+    def _reserve(self, episodes: int):
+        # Grow the history arrays geometrically, so appending is amortized constant time
+        needed = self.episodes + episodes
+        if needed <= len(self._results):
+            return
+        capacity = max(needed, 2 * len(self._results), 1024)
+        self._results = np.resize(self._results, capacity)
+        self._rewards = np.resize(self._rewards, capacity)
@@ -1,46 +1,57 @@
 import random
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from .board import Board
+from .metrics import TrainingMetrics
 from .players import Player
-from .utils import pos_to_xy, xy_to_pos, board_to_index
+from .plots import plot_curve, learning_curves
+from .utils import (pos_to_xy, board_to_index, canonicalize, inverse_transform_action, legal_actions,
+                    predict_from_tables, q_values_array)
 
 class MonteCarloEsControl(Player):
     """
     Monte Carlo Es Control player for Tic Tac Toe.
-    This player uses Monte Carlo methods to learn and improve its strategy over time.
+    This player uses Monte Carlo methods to learn and improve its strategy over time. Exploring starts and undefined
+    policy moves are drawn among the empty cells of the board only, so the learner never picks an occupied cell.
     """
 
-    def __init__(self):
+    def __init__(self, symmetry: bool = False):
         """
         Initializes the Monte Carlo Es Control player.
+
+        Parameters
+        ----------
+        symmetry : bool
+            If True, the tables are keyed by the canonical representative of each board among its rotations and
+            reflections, so experience from one orientation applies to all of them.
         """
+        self.symmetry = symmetry
         self.q_values = {}
         self.policy = {}
-        self.returns_sum = {}
-        self.return_count = {}
+        self.visit_counts = {}
         self.episode_steps = []
         self.episode_rewards = []
-        self.train_results = []
-        self.train_rewards = []
+        self.metrics = TrainingMetrics()
         self.train = False
+        # Callable receiving the first visit returns of every episode instead of learning from them
+        self.returns_sink = None
 
     def new_game(self):
         """
-        Prints a message indicating monte carlo is participating in a new game.
+        Notifies a message indicating monte carlo is participating in a new game.
         If the mode is training, it initializes the episode steps and rewards.
         """
-        print("Monte Carlo participates in a new game")
+        self.notify("Monte Carlo participates in a new game")
         if self.train:
             self.episode_steps = []
             self.episode_rewards = []
 
     def start(self):
         """
-        Prints a message indicating monte carlo starts the game.
+        Notifies a message indicating monte carlo starts the game.
         """
-        print("Monte Carlo starts")
+        self.notify("Monte Carlo starts")
 
     def turn(self, board: Board) -> (int, int):
         """
@@ -57,72 +68,77 @@ class MonteCarloEsControl(Player):
             The (x, y) coordinates of the chosen position.
         """
         index = board_to_index(board)
+        transform = 0
+        if self.symmetry:
+            index, transform = canonicalize(index)
+        actions = legal_actions(index, board.width * board.height)
         if not self.train:
-            next_step = self.policy[index]
+            # States without a legal policy move, never visited while training, get a random legal move
+            next_step = self.policy.get(index)
+            if next_step not in actions:
+                next_step = random.choice(actions)
         else:
             # Check if we are over the limit of turns
             if len(self.episode_steps) >= 20:
                 self.episode_rewards.append(-50)
-                self.train_results.append('I')
-                self._update_q_values_and_policy()
+                self._update_q_values_and_policy('I')
                 raise RuntimeWarning("No more moves left")
             elif len(self.episode_steps) > 0:
                 # Update rewards for the last step
                 self.episode_rewards.append(-0.1)
 
             if len(self.episode_steps) == 0:
-                # First movement is random to explore
-                next_step = random.randint(0, 9)
-            elif index not in self.policy:
+                # First movement is a random legal one to explore
+                next_step = random.choice(actions)
+            elif self.policy.get(index) not in actions:
                 # If movement is not defined we define one
-                empty_spot = board.get_empty_spots()
-                next_step_x, next_step_y = empty_spot.pop(random.randrange(len(empty_spot)))
-                next_step = xy_to_pos(next_step_x, next_step_y)
+                next_step = random.choice(actions)
                 self.policy[index] = next_step
             else:
                 next_step = self.policy[index]
             self.episode_steps.append((index, next_step))
 
-        return pos_to_xy(next_step)
+        if self.symmetry:
+            next_step = inverse_transform_action(next_step, transform)
+        return pos_to_xy(next_step, board.width)
 
     def invalid_position(self):
         """
-        Prints a message indicating monte carlo has chosen an invalid position.
+        Notifies a message indicating monte carlo has chosen an invalid position, and counts it if in training mode.
         """
-        print("MonteCarlo choose an invalid position")
+        self.notify("MonteCarlo choose an invalid position")
+        if self.train:
+            self.metrics.record_invalid_moves()
 
     def win(self):
         """
-        Prints a message indicating monte carlo has won.
+        Notifies a message indicating monte carlo has won.
         Updates the rewards and Q-values if in training mode.
         """
-        print("MonteCarlo Wins")
+        self.notify("MonteCarlo Wins")
         if self.train:
             self.episode_rewards.append(10)
-            self.train_results.append('W')
-            self._update_q_values_and_policy()
+            self._update_q_values_and_policy('W')
 
     def loose(self):
         """
-        Prints a message indicating monte carlo has lost.
+        Notifies a message indicating monte carlo has lost.
         Updates the rewards and Q-values if in training mode.
         """
-        print("MonteCarlo Loose")
+        self.notify("MonteCarlo Loose")
         if self.train:
             self.episode_rewards.append(-10)
-            self.train_results.append('L')
-            self._update_q_values_and_policy()
+            self._update_q_values_and_policy('L')
 
     def draw(self):
         """
-        Prints a message indicating monte carlo has drawn.
+        Notifies a message indicating monte carlo has drawn.
         Updates the rewards and Q-values if in training mode.
         """
-        print("MonteCarlo Draw")
+        self.notify("MonteCarlo Draw")
         if self.train:
             self.episode_rewards.append(-2)
-            self.train_results.append('D')
-            self._update_q_values_and_policy()
+            self._update_q_values_and_policy('D')
 
     def set_train(self, train: bool):
         """
@@ -144,12 +160,9 @@ class MonteCarloEsControl(Player):
         float
             The average reward.
         """
-        if len(self.train_rewards) < episodes:
-            return sum(self.train_rewards) / len(self.train_rewards)
-        else:
-            return sum(self.train_rewards[-episodes:]) / episodes
+        return self.metrics.average_reward(episodes)
 
-    def plot_rewards(self, episodes: int = 100) -> None:
+    def plot_rewards(self, episodes: int = 100, output: str = None) -> None:
         """
         Plot a moving average (over n episodes) of the rewards.
 
@@ -157,21 +170,12 @@ class MonteCarloEsControl(Player):
         ----------
         episodes : int
             The moving average window size.
+        output : str, optional
+            The image file to save the plot to, instead of showing it.
         """
-        moving_avg = [
-            sum(self.train_rewards[max(0, i - episodes + 1):i + 1]) / min(i + 1, episodes)
-            for i in range(len(self.train_rewards))
-        ]
-        plt.figure(figsize=(10, 5))
-        plt.plot(moving_avg, label=f"Moving Average ({episodes} episodes)", color="red")
-        plt.xlabel("Episodes")
-        plt.ylabel("Reward")
-        plt.title("Episode Rewards")
-        plt.legend()
-        plt.grid()
-        plt.show()
-
-    def plot_success_rate(self, episodes: int = 100) -> None:
+        plot_curve(learning_curves(self.metrics, episodes)["rewards"], "rewards", episodes, output)
+
+    def plot_success_rate(self, episodes: int = 100, output: str = None) -> None:
         """
         Plot the success rate with a moving average over n episodes.
 
@@ -179,19 +183,10 @@ class MonteCarloEsControl(Player):
         ----------
         episodes : int
             The moving average window size.
+        output : str, optional
+            The image file to save the plot to, instead of showing it.
         """
-        moving_avg = [
-            sum([1 for r in self.train_results[max(0, i - episodes + 1):i + 1] if r == 'W']) / min(i + 1, episodes)
-            for i in range(len(self.train_results))
-        ]
-        plt.figure(figsize=(10, 5))
-        plt.plot(moving_avg, label=f"Success Rate ({episodes} episodes)", color="green")
-        plt.xlabel("Episodes")
-        plt.ylabel("Success Rate")
-        plt.title("Success Rate")
-        plt.legend()
-        plt.grid()
-        plt.show()
+        plot_curve(learning_curves(self.metrics, episodes)["success_rate"], "success_rate", episodes, output)
 
     def get_success_rate(self, episodes: int = 100) -> float:
         """
@@ -207,28 +202,91 @@ class MonteCarloEsControl(Player):
         float
             The success rate.
         """
-        if len(self.train_results) < episodes:
-            return sum([1 for result in self.train_results if result == 'W']) / len(self.train_results)
-        else:
-            return sum([1 for result in self.train_results[-episodes:] if result == 'W']) / episodes
+        return self.metrics.success_rate(episodes)
 
-    def _update_q_values_and_policy(self):
-        # Update the Q-values with the rewards of the episode
-        cumulative_reward = 0
-        while len(self.episode_steps) > 0:
-            index, action = self.episode_steps.pop()
-            cumulative_reward = self.episode_rewards.pop() + 0.9 * cumulative_reward
-            if (index, action) not in self.episode_steps:
-                if (index, action) not in self.returns_sum:
-                    self.returns_sum[(index, action)] = 0
-                    self.return_count[(index, action)] = 0
-                self.returns_sum[(index, action)] += cumulative_reward
-                self.return_count[(index, action)] += 1
-                if index not in self.q_values:
-                    self.q_values[index] = {}
-                self.q_values[index][action] = self.returns_sum[(index, action)] / self.return_count[(index, action)]
-        self.train_rewards.append(cumulative_reward)
-        # Update the policy with the new best action
-        for index in self.q_values.keys():
+    def greedy_action(self, index: int):
+        """
+        Returns the action of the policy for a board state code.
+
+        Parameters
+        ----------
+        index : int
+            The board state code.
+
+        Returns
+        -------
+        int
+            The position of the policy action, None if the state has no policy.
+        """
+        if not self.symmetry:
+            return self.policy.get(index)
+        index, transform = canonicalize(index)
+        action = self.policy.get(index)
+        return None if action is None else inverse_transform_action(action, transform)
+
+    def predict_batch(self, states, return_q_values: bool = False):
+        """
+        Returns the policy actions for a batch of board state codes in one vectorized call.
+
+        Parameters
+        ----------
+        states : array_like
+            The board state codes.
+        return_q_values : bool
+            If True, the Q-values of the states are returned too.
+
+        Returns
+        -------
+        np.ndarray or tuple
+            The policy action of each state, -1 for states without policy, and if asked the (n, 9) Q-values of each
+            state, NaN for the unvisited actions.
+        """
+        q_values = q_values_array(self.q_values)
+        actions = np.full(len(q_values), -1)
+        actions[list(self.policy.keys())] = list(self.policy.values())
+        return predict_from_tables(states, lambda keys: (actions[keys], q_values[keys]), self.symmetry,
+                                   return_q_values)
+
+    def apply_returns(self, returns: list):
+        """
+        Updates the Q-values with the incremental mean of the given first visit returns, and the policy of the
+        updated states with their new best action.
+
+        Parameters
+        ----------
+        returns : list
+            A list of (state, action, return) tuples.
+        """
+        visited_states = set()
+        for index, action, cumulative_reward in returns:
+            counts = self.visit_counts.setdefault(index, {})
+            q_values = self.q_values.setdefault(index, {})
+            counts[action] = counts.get(action, 0) + 1
+            q_value = q_values.get(action, 0)
+            q_values[action] = q_value + (cumulative_reward - q_value) / counts[action]
+            visited_states.add(index)
+        # Only the updated states may have a new best action
+        for index in visited_states:
             best_action = max(self.q_values[index], key=self.q_values[index].get)
             self.policy[index] = best_action
+
+    def _update_q_values_and_policy(self, result: str):
+        # Find the step of the first visit of each (state, action) pair of the episode
+        first_visits = {}
+        for step, state_action in enumerate(self.episode_steps):
+            first_visits.setdefault(state_action, step)
+        # Compute the first visit returns, walking the episode backwards
+        cumulative_reward = 0
+        returns = []
+        for step in range(len(self.episode_steps) - 1, -1, -1):
+            index, action = self.episode_steps[step]
+            cumulative_reward = self.episode_rewards[step] + 0.9 * cumulative_reward
+            if first_visits[(index, action)] == step:
+                returns.append((index, action, cumulative_reward))
+        self.episode_steps = []
+        self.episode_rewards = []
+        self.metrics.record(result, cumulative_reward)
+        if self.returns_sink is not None:
+            self.returns_sink(returns)
+        else:
+            self.apply_returns(returns)
@@ -0,0 +1,134 @@
+import pickle
+import random
+from multiprocessing import Pool
+
+from .board import Board
+from .metrics import TrainingMetrics
+from .monte_carlo import MonteCarloEsControl
+from .players import BotPlayer
+from .tic_tac_toe import TicTacToe
+
+
+class ParallelTrainer:
+    """
+    Trains a model collecting episodes in a pool of worker processes.
+    On each round every worker plays against BotPlayer with its own seed and a snapshot of the model, and sends back
+    its experience: first visit returns for MonteCarloEsControl or transitions for QLearning. The experience is then
+    merged into the model in worker order, so results are reproducible for a fixed seed and number of workers.
+    """
+
+    def __init__(self, model, workers: int, seed: int = 0, round_episodes: int = 1000, board_type=Board,
+                 random_start: bool = False):
+        """
+        Initializes the trainer and starts the worker processes.
+
+        Parameters
+        ----------
+        model : Player
+            The MonteCarloEsControl or QLearning model to train, in training mode.
+        workers : int
+            The number of worker processes.
+        seed : int
+            The base seed of the workers random generators.
+        round_episodes : int
+            The number of episodes each worker plays with the same model snapshot.
+        board_type : type
+            The board implementation of the games.
+        random_start : bool
+            If True, games start from a random board.
+        """
+        self.model = model
+        self.workers = workers
+        self.seed = seed
+        self.round_episodes = round_episodes
+        self.board_type = board_type
+        self.random_start = random_start
+        self.rounds = 0
+        self.pool = Pool(workers)
+
+    def train(self, episodes: int):
+        """
+        Plays the given number of episodes, split in rounds among the workers.
+
+        Parameters
+        ----------
+        episodes : int
+            The number of episodes to play.
+        """
+        while episodes > 0:
+            round_episodes = min(episodes, self.round_episodes * self.workers)
+            self._train_round(round_episodes)
+            episodes -= round_episodes
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+        self.pool.close()
+        self.pool.join()
+
+    def _train_round(self, episodes: int):
+        snapshot = self._snapshot()
+        tasks = []
+        for worker in range(self.workers):
+            worker_episodes = episodes // self.workers + (1 if worker < episodes % self.workers else 0)
+            worker_seed = f"{self.seed}:{self.rounds}:{worker}"
+            tasks.append((snapshot, worker_episodes, worker_seed, self.board_type, self.random_start))
+        self.rounds += 1
+        for experience, metrics in self.pool.map(play_episodes, tasks):
+            if isinstance(self.model, MonteCarloEsControl):
+                self.model.apply_returns(experience)
+            else:
+                self.model.apply_transitions(experience)
+            self.model.metrics.merge(metrics)
+
+    def _snapshot(self) -> bytes:
+        # The training history and the replay buffer aren't needed by the workers
+        metrics = self.model.metrics
+        replay = getattr(self.model, "replay", None)
+        self.model.metrics = TrainingMetrics()
+        if replay is not None:
+            self.model.replay = None
+        try:
+            return pickle.dumps(self.model)
+        finally:
+            self.model.metrics = metrics
+            if replay is not None:
+                self.model.replay = replay
+
+
+def play_episodes(task: tuple) -> tuple:
+    """
+    Worker function playing episodes against BotPlayer with a model snapshot, recording the experience instead of
+    learning from it.
+
+    Parameters
+    ----------
+    task : tuple
+        The pickled model snapshot, the number of episodes, the seed, the board type and the random start flag.
+
+    Returns
+    -------
+    tuple
+        The experience and the training metrics of the episodes.
+    """
+    snapshot, episodes, seed, board_type, random_start = task
+    random.seed(seed)
+    model = pickle.loads(snapshot)
+    experience = []
+    if isinstance(model, MonteCarloEsControl):
+        model.returns_sink = experience.extend
+    else:
+        model.transition_sink = experience.append
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    model.set_observers([])
+    for _ in range(episodes):
+        try:
+            game = TicTacToe(bot_player, model, board_type(), observers=[])
+            if random_start:
+                game.random_board()
+            game.start()
+        except RuntimeWarning:
+            pass
+    return experience, model.metrics
@@ -0,0 +1,359 @@
+import mmap
+import pickle
+import random
+import struct
+
+import numpy as np
+
+from .board import Board
+from .metrics import TrainingMetrics, RESULT_CODES
+from .monte_carlo import MonteCarloEsControl
+from .players import Player
+from .q_learning import QLearning, N_ACTIONS
+from .utils import (legacy_index_to_state, board_to_index, canonicalize, inverse_transform_action, legal_actions,
+                    legal_mask_table, pos_to_xy, predict_from_tables)
+
+# Learner attributes holding tables keyed by board index, or by (board index, action) tuples.
+STATE_TABLES = ("q_values", "policy", "returns_sum", "return_count")
+
+# Binary model file: a header followed by the sorted state codes (int32), the Q-values (float32, one row of N_ACTIONS
+# per state, NaN for unknown values) and the policy actions (int8, -1 for none). Every array starts at an offset
+# multiple of 8, so they can be mapped without copies.
+MODEL_MAGIC = b"TTTM"
+MODEL_VERSION = 1
+MODEL_HEADER = struct.Struct("<4sHBBI4x")
+MODEL_KINDS = {MonteCarloEsControl: 1, QLearning: 2}
+FLAG_SYMMETRY = 1
+
+
+def load_model(path: str):
+    """
+    Loads a trained model. Binary model files are loaded as a play-only ModelFilePlayer, while pickled models are
+    unpickled, converting tables saved with the legacy string board indexes to integer state codes.
+
+    Parameters
+    ----------
+    path : str
+        The path of the model file.
+
+    Returns
+    -------
+    Player
+        The trained model player.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MODEL_MAGIC)) == MODEL_MAGIC:
+            return ModelFilePlayer(ModelFile(path))
+        file.seek(0)
+        # noinspection PyTypeChecker
+        model = pickle.load(file)
+    convert_legacy_model(model)
+    return model
+
+
+def convert_legacy_model(model) -> None:
+    """
+    Converts in place a model pickled by the original learners to the current layout.
+    The string board indexes of the tables become integer state codes, the Monte Carlo returns sum and count tables
+    are replaced by the visit counts table, and the training history lists by training metrics. The attributes added
+    since then get the defaults of a new model. Current models are left unchanged.
+
+    Parameters
+    ----------
+    model : Player
+        The trained model player.
+    """
+    if hasattr(model, "train_results"):
+        # The training history used to be kept in lists
+        model.metrics = TrainingMetrics()
+        model.metrics.record_batch([RESULT_CODES[result] for result in model.train_results], model.train_rewards)
+        del model.train_results
+        del model.train_rewards
+    for name in STATE_TABLES:
+        table = getattr(model, name, None)
+        if isinstance(table, dict) and table:
+            setattr(model, name, {_convert_key(key): value for key, value in table.items()})
+    if isinstance(getattr(model, "last_state", None), str):
+        model.last_state = legacy_index_to_state(model.last_state)
+    if getattr(model, "episode_steps", None):
+        model.episode_steps = [_convert_key(step) for step in model.episode_steps]
+    if hasattr(model, "return_count"):
+        # Monte Carlo models used to keep the returns sum and count, the Q-values already hold their mean
+        model.visit_counts = {}
+        for (index, action), count in model.return_count.items():
+            model.visit_counts.setdefault(index, {})[action] = count
+        del model.returns_sum
+        del model.return_count
+    if isinstance(model, (MonteCarloEsControl, QLearning)):
+        for name, value in vars(type(model)()).items():
+            if not hasattr(model, name):
+                setattr(model, name, value)
+
+
+def _convert_key(key):
+    if isinstance(key, str):
+        return legacy_index_to_state(key)
+    if isinstance(key, tuple) and isinstance(key[0], str):
+        return (legacy_index_to_state(key[0]),) + key[1:]
+    return key
+
+
+def export_model(model, path: str):
+    """
+    Saves the tables a trained model needs to play in the binary model file format, without the training history.
+
+    Parameters
+    ----------
+    model : Player
+        The trained MonteCarloEsControl or QLearning model.
+    path : str
+        The path of the model file.
+    """
+    if isinstance(model, QLearning) and model.backend == "numpy":
+        states = np.flatnonzero(model.q_values.any(axis=1))
+        # Occupied cells are no actions, their Q-values are left unknown
+        q_values = np.where(legal_mask_table()[states], model.q_values[states], np.nan)
+        policy = np.where(np.isnan(q_values), -np.inf, q_values).argmax(axis=1)
+    else:
+        states = np.array(sorted(set(model.q_values) | set(getattr(model, "policy", {}))), dtype=np.int64)
+        q_values = np.full((len(states), N_ACTIONS), np.nan, dtype=np.float32)
+        policy = np.full(len(states), -1)
+        for row, index in enumerate(states.tolist()):
+            for action, q_value in model.q_values.get(index, {}).items():
+                # Monte Carlo exploring starts may try the position 9, outside the board
+                if action < N_ACTIONS:
+                    q_values[row, action] = q_value
+            if isinstance(model, MonteCarloEsControl):
+                policy[row] = model.policy.get(index, -1)
+            elif index in model.q_values and legal_actions(index):
+                policy[row] = model._best_action(index, legal_actions(index))
+    flags = FLAG_SYMMETRY if model.symmetry else 0
+    with open(path, 'wb') as file:
+        file.write(MODEL_HEADER.pack(MODEL_MAGIC, MODEL_VERSION, MODEL_KINDS[type(model)], flags, len(states)))
+        for array in (states.astype("<i4"), q_values.astype("<f4"), policy.astype(np.int8)):
+            file.write(array.tobytes())
+            file.write(bytes(-array.nbytes % 8))
+
+
+class ModelFile:
+    """
+    Read-only view of a binary model file. The file is memory mapped, so processes loading the same file share its
+    pages and only the looked up states are read from disk.
+    """
+
+    def __init__(self, path: str):
+        """
+        Maps the model file and checks its header.
+
+        Parameters
+        ----------
+        path : str
+            The path of the model file.
+        """
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.kind, flags, n_states = MODEL_HEADER.unpack_from(self.buffer)
+        if magic != MODEL_MAGIC:
+            raise ValueError(f"Not a model file: {path}")
+        if version != MODEL_VERSION:
+            raise ValueError(f"Unsupported model file version: {version}")
+        self.symmetry = bool(flags & FLAG_SYMMETRY)
+        offset = MODEL_HEADER.size
+        self.states = np.frombuffer(self.buffer, dtype="<i4", count=n_states, offset=offset)
+        offset += _aligned(self.states.nbytes)
+        self.q_values = np.frombuffer(self.buffer, dtype="<f4", count=n_states * N_ACTIONS,
+                                      offset=offset).reshape(n_states, N_ACTIONS)
+        offset += _aligned(self.q_values.nbytes)
+        self.policy = np.frombuffer(self.buffer, dtype=np.int8, count=n_states, offset=offset)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def row(self, index: int):
+        """
+        Returns the row of a state code in the tables.
+
+        Parameters
+        ----------
+        index : int
+            The board state code, canonical if the model uses symmetry.
+
+        Returns
+        -------
+        int
+            The row of the state, None if the state isn't in the file.
+        """
+        row = int(np.searchsorted(self.states, index))
+        if row < len(self.states) and self.states[row] == index:
+            return row
+        return None
+
+    def greedy_action(self, index: int):
+        """
+        Returns the policy action for a board state code.
+
+        Parameters
+        ----------
+        index : int
+            The board state code.
+
+        Returns
+        -------
+        int
+            The position of the policy action, None if the state has no policy.
+        """
+        transform = 0
+        if self.symmetry:
+            index, transform = canonicalize(index)
+        row = self.row(index)
+        if row is None or self.policy[row] < 0:
+            return None
+        return inverse_transform_action(int(self.policy[row]), transform)
+
+    def predict_batch(self, states, return_q_values: bool = False):
+        """
+        Returns the policy actions for a batch of board state codes in one vectorized call.
+
+        Parameters
+        ----------
+        states : array_like
+            The board state codes.
+        return_q_values : bool
+            If True, the Q-values of the states are returned too.
+
+        Returns
+        -------
+        np.ndarray or tuple
+            The policy action of each state, -1 for states not in the file, and if asked the (n, 9) Q-values of each
+            state, NaN for the unknown ones.
+        """
+        return predict_from_tables(states, self._lookup, self.symmetry, return_q_values)
+
+    def close(self):
+        """
+        Releases the mapped file. The arrays of the model file can't be used after closing it.
+        """
+        self.states = self.q_values = self.policy = None
+        self.buffer.close()
+
+    def _lookup(self, keys: np.ndarray) -> tuple:
+        rows = np.minimum(np.searchsorted(self.states, keys), max(len(self.states) - 1, 0))
+        found = self.states[rows] == keys if len(self.states) else np.zeros(len(keys), dtype=bool)
+        actions = np.full(len(keys), -1)
+        actions[found] = self.policy[rows[found]]
+        q_values = np.full((len(keys), N_ACTIONS), np.nan)
+        q_values[found] = self.q_values[rows[found]]
+        return actions, q_values
+
+
+class ModelFilePlayer(Player):
+    """
+    A play-only player making the policy moves of a binary model file.
+    On states missing from the file, or whose move isn't valid, it plays a random empty position.
+    """
+
+    def __init__(self, model_file: ModelFile):
+        """
+        Initializes the player.
+
+        Parameters
+        ----------
+        model_file : ModelFile
+            The loaded model file.
+        """
+        self.model_file = model_file
+
+    def new_game(self):
+        """
+        Notifies a message indicating the model participates in a new game.
+        """
+        self.notify("Model participates in a new game")
+
+    def start(self):
+        """
+        Notifies a message indicating the model starts the game.
+        """
+        self.notify("Model starts")
+
+    def turn(self, board: Board) -> (int, int):
+        """
+        Returns the policy move for the current board state.
+
+        Parameters
+        ----------
+        board : Board
+            The current state of the game board.
+
+        Returns
+        -------
+        tuple
+            The (x, y) coordinates of the chosen position.
+        """
+        action = self.model_file.greedy_action(board_to_index(board))
+        empty_spots = board.get_empty_spots()
+        if action is None or pos_to_xy(action) not in empty_spots:
+            return random.choice(empty_spots)
+        return pos_to_xy(action)
+
+    def greedy_action(self, index: int):
+        """
+        Returns the policy action for a board state code.
+
+        Parameters
+        ----------
+        index : int
+            The board state code.
+
+        Returns
+        -------
+        int
+            The position of the policy action, None if the state has no policy.
+        """
+        return self.model_file.greedy_action(index)
+
+    def predict_batch(self, states, return_q_values: bool = False):
+        """
+        Returns the policy actions for a batch of board state codes in one vectorized call.
+
+        Parameters
+        ----------
+        states : array_like
+            The board state codes.
+        return_q_values : bool
+            If True, the Q-values of the states are returned too.
+
+        Returns
+        -------
+        np.ndarray or tuple
+            The policy action of each state, -1 for states not in the file, and if asked the (n, 9) Q-values of each
+            state, NaN for the unknown ones.
+        """
+        return self.model_file.predict_batch(states, return_q_values)
+
+    def invalid_position(self):
+        """
+        Notifies a message indicating the model has chosen an invalid position.
+        """
+        self.notify("Model choose an invalid position")
+
+    def win(self):
+        """
+        Notifies a message indicating the model has won.
+        """
+        self.notify("Model Wins")
+
+    def loose(self):
+        """
+        Notifies a message indicating the model has lost.
+        """
+        self.notify("Model Loose")
+
+    def draw(self):
+        """
+        Notifies a message indicating the model has drawn.
+        """
+        self.notify("Model Draw")
+
+
+def _aligned(size: int) -> int:
+    return size + -size % 8
@@ -0,0 +1,116 @@
+import numpy as np
+
+from .batch_env import BOT_CODE, MODEL_CODE, REWARD_WIN, REWARD_LOOSE, REWARD_DRAW, REWARD_STEP, WEIGHTS
+from .evaluation import game_tables
+from .monte_carlo import MonteCarloEsControl
+from .solver import N_STATES
+from .utils import legal_mask_table
+
+
+class ValueIterationPlanner:
+    """
+    Value iteration over the exact model of the game the learners face against the random bot.
+    The states are the positions where the model has to move. An action leads to an afterstate, final if the model
+    won or filled the board, and otherwise to the positions reached by the uniformly random replies of the bot. The
+    rewards and discount are the ones of the learners, so the planned policy is the optimal one they converge to.
+    """
+
+    def __init__(self, gamma: float = 0.9):
+        """
+        Builds the transition model.
+
+        Parameters
+        ----------
+        gamma : float
+            The discount of the values of the next positions.
+        """
+        self.gamma = gamma
+        digits, filled, winners = game_tables()
+        terminal = (winners != 0) | (filled == 9)
+        lead = (digits == BOT_CODE).sum(axis=1) - (digits == MODEL_CODE).sum(axis=1)
+        # The bot starts or not, so it has as many symbols as the model or one more
+        self.states = np.flatnonzero(~terminal & ((lead == 0) | (lead == 1)))
+        index = np.full(N_STATES, -1)
+        index[self.states] = np.arange(len(self.states))
+        self.legal = legal_mask_table()[self.states]
+        afterstates = np.where(self.legal, self.states[:, None] + MODEL_CODE * WEIGHTS, 0)
+        won = winners[afterstates] == MODEL_CODE
+        self.final = self.legal & (won | (filled[afterstates] == 9))
+        self.final_rewards = np.where(won, REWARD_WIN, REWARD_DRAW)
+        # Replies of the bot to every action that doesn't end the game, shape (states, actions, replies)
+        replies = legal_mask_table()[afterstates] & (self.legal & ~self.final)[:, :, None]
+        next_states = np.where(replies, afterstates[:, :, None] + BOT_CODE * WEIGHTS, 0)
+        lost = winners[next_states] == BOT_CODE
+        drawn = ~lost & (filled[next_states] == 9)
+        self.reply_rewards = np.where(lost, REWARD_LOOSE, np.where(drawn, REWARD_DRAW, REWARD_STEP))
+        self.next_index = np.where(replies & ~lost & ~drawn, index[next_states], -1)
+        self.probabilities = replies / np.maximum(replies.sum(axis=2, keepdims=True), 1)
+        self.values = np.zeros(len(self.states))
+        self.sweeps = 0
+
+    def q_values(self) -> np.ndarray:
+        """
+        Computes the expected discounted return of every action from the current values.
+
+        Returns
+        -------
+        np.ndarray
+            The (states, 9) action values, -inf for the occupied cells.
+        """
+        continues = self.next_index >= 0
+        next_values = np.where(continues, self.values[self.next_index], 0)
+        expected = (self.probabilities * (self.reply_rewards + self.gamma * next_values)).sum(axis=2)
+        return np.where(self.legal, np.where(self.final, self.final_rewards, expected), -np.inf)
+
+    def solve(self, tolerance: float = 1e-9, max_sweeps: int = 100) -> int:
+        """
+        Updates the values of all the states at once until they change less than the tolerance.
+        Games last at most five moves of the model, so the values converge in a few sweeps.
+
+        Parameters
+        ----------
+        tolerance : float
+            The largest change of a value to stop.
+        max_sweeps : int
+            The maximum number of sweeps.
+
+        Returns
+        -------
+        int
+            The number of sweeps done.
+        """
+        for _ in range(max_sweeps):
+            values = self.q_values().max(axis=1)
+            change = np.abs(values - self.values).max()
+            self.values = values
+            self.sweeps += 1
+            if change < tolerance:
+                break
+        return self.sweeps
+
+    def policy(self) -> dict:
+        """
+        Returns the greedy actions of the current values, in the form of MonteCarloEsControl.policy.
+
+        Returns
+        -------
+        dict
+            The best action of every state code where the model has to move, the first one on ties.
+        """
+        return dict(zip(self.states.tolist(), self.q_values().argmax(axis=1).tolist()))
+
+    def to_model(self) -> MonteCarloEsControl:
+        """
+        Builds a play-ready model with the planned policy and the action values of the legal actions.
+
+        Returns
+        -------
+        MonteCarloEsControl
+            The model, not in training mode.
+        """
+        model = MonteCarloEsControl()
+        q_values = self.q_values()
+        model.policy = self.policy()
+        model.q_values = {state: {action: float(q_values[row, action]) for action in np.flatnonzero(legal).tolist()}
+                          for row, (state, legal) in enumerate(zip(self.states.tolist(), self.legal))}
+        return model
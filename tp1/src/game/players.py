@@ -2,14 +2,41 @@ import random
 from abc import ABC, abstractmethod
 
 from .board import Board
-from .utils import pos_to_xy
+from .events import DEFAULT_OBSERVERS
+from .utils import pos_to_xy, state_to_board, xy_to_pos
 
 
 class Player(ABC):
     """
     An abstract base class to represent a player in the Tic Tac Toe game.
+    Player messages are sent to its observers, which print them to the console by default.
     """
 
+    observers = DEFAULT_OBSERVERS
+
+    def set_observers(self, observers: list = None):
+        """
+        Set the observers of the player messages. An empty list makes the player quiet.
+
+        Parameters
+        ----------
+        observers : list, optional
+            The GameObserver instances. The default console output is restored if not given.
+        """
+        self.observers = DEFAULT_OBSERVERS if observers is None else tuple(observers)
+
+    def notify(self, message: str):
+        """
+        Sends a message to the player observers.
+
+        Parameters
+        ----------
+        message : str
+            The message text.
+        """
+        for observer in self.observers:
+            observer.on_message(message)
+
     @abstractmethod
     def new_game(self):
         """
@@ -66,19 +93,20 @@ class Player(ABC):
 class UserPlayer(Player):
     """
     A class to represent a human player in the Tic Tac Toe game.
+    The positions are read from the console, and play_remote sends them to a game server instead of a local game.
     """
 
     def new_game(self):
         """
-        Prints a message indicating the user starts a new game.
+        Notifies a message indicating the user starts a new game.
         """
-        print("User participates in a new game")
+        self.notify("User participates in a new game")
 
     def start(self):
         """
-        Prints a message indicating the user starts the game.
+        Notifies a message indicating the user starts the game.
         """
-        print("User starts")
+        self.notify("User starts")
 
     def turn(self, board: Board) -> (int, int):
         """
@@ -95,31 +123,62 @@ class UserPlayer(Player):
             The (x, y) coordinates of the chosen position.
         """
         place = int(input("Pick a position:"))
-        return pos_to_xy(place)
+        return pos_to_xy(place, board.width)
 
     def invalid_position(self):
         """
-        Prints a message indicating the user has chosen an invalid position.
+        Notifies a message indicating the user has chosen an invalid position.
         """
-        print("Invalid position")
+        self.notify("Invalid position")
 
     def win(self):
         """
-        Prints a message indicating the user has won.
+        Notifies a message indicating the user has won.
         """
-        print("User won")
+        self.notify("User won")
 
     def loose(self):
         """
-        Prints a message indicating the user has lost.
+        Notifies a message indicating the user has lost.
         """
-        print("User loose")
+        self.notify("User loose")
 
     def draw(self):
         """
-        Prints a message indicating the game is a draw.
+        Notifies a message indicating the game is a draw.
         """
-        print("User Draw")
+        self.notify("User Draw")
+
+    def play_remote(self, client) -> str:
+        """
+        Plays a game against the model of a game server. The server keeps the board and plays the model moves, the
+        user only picks positions.
+
+        Parameters
+        ----------
+        client : GameClient
+            The connection to the server.
+
+        Returns
+        -------
+        str
+            The game result from the user side: "won", "lost" or "draw".
+        """
+        response = client.new_game()
+        self.new_game()
+        if response["first"] == "user":
+            self.start()
+        while True:
+            board = state_to_board(response["board"])
+            for observer in self.observers:
+                observer.on_board(board)
+            if response["status"] != "playing":
+                break
+            response = client.move(xy_to_pos(*self.turn(board)))
+            if "error" in response:
+                self.invalid_position()
+        {"won": self.win, "lost": self.loose, "draw": self.draw}[response["status"]]()
+        return response["status"]
 
 
 class BotPlayer(Player):
@@ -129,15 +188,15 @@ class BotPlayer(Player):
 
     def new_game(self):
         """
-        Prints a message indicating the random bot starts a new game.
+        Notifies a message indicating the random bot starts a new game.
         """
-        print("Bot participates in a new game")
+        self.notify("Bot participates in a new game")
 
     def start(self):
         """
-        Prints a message indicating the bot starts the game.
+        Notifies a message indicating the bot starts the game.
         """
-        print("Bot starts")
+        self.notify("Bot starts")
 
     def turn(self, board: Board) -> (int, int):
         """
@@ -165,18 +224,18 @@ class BotPlayer(Player):
 
     def win(self):
         """
-        Prints a message indicating the bot has won.
+        Notifies a message indicating the bot has won.
         """
-        print("Bot won")
+        self.notify("Bot won")
 
     def loose(self):
         """
-        Prints a message indicating the bot has lost.
+        Notifies a message indicating the bot has lost.
         """
-        print("Bot loose")
+        self.notify("Bot loose")
 
     def draw(self):
         """
-        Prints a message indicating the game is a draw.
+        Notifies a message indicating the game is a draw.
         """
-        print("Bot Draw")
+        self.notify("Bot Draw")
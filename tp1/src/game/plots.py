@@ -0,0 +1,150 @@
+import csv
+
+import numpy as np
+
+from .metrics import TrainingMetrics, WIN_CODE
+
+PLOT_FORMATS = ("png", "svg", "csv")
+
+# Label, y axis label, title and color of each learning curve
+CURVES = {
+    "rewards": ("Moving Average", "Reward", "Episode Rewards", "red"),
+    "success_rate": ("Success Rate", "Success Rate", "Success Rate", "green"),
+}
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Computes the moving average of a series in linear time with a cumulative sum.
+    The first values are averaged over the available ones.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The series.
+    window : int
+        The moving average window size.
+
+    Returns
+    -------
+    np.ndarray
+        The moving average at every index of the series.
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(0, ends - window)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def learning_curves(metrics: TrainingMetrics, episodes: int = 100) -> dict:
+    """
+    Computes the moving averages of the rewards and the success rate.
+
+    Parameters
+    ----------
+    metrics : TrainingMetrics
+        The training metrics, with history.
+    episodes : int
+        The moving average window size.
+
+    Returns
+    -------
+    dict
+        The "rewards" and "success_rate" curves.
+    """
+    return {
+        "rewards": moving_average(metrics.rewards, episodes),
+        "success_rate": moving_average(metrics.results == WIN_CODE, episodes),
+    }
+
+
+def plot_curve(values: np.ndarray, curve: str, episodes: int = 100, output: str = None) -> None:
+    """
+    Plots a learning curve. Without output the plot is shown in a window, otherwise it is saved with the
+    non-interactive Agg backend, in the format given by the file extension.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The curve values.
+    curve : str
+        The name of the curve: "rewards" or "success_rate".
+    episodes : int
+        The moving average window size, for the legend.
+    output : str, optional
+        The path of the image file.
+    """
+    # matplotlib takes long to import, so it is only imported when plotting
+    label, y_label, title, color = CURVES[curve]
+    if output is None:
+        import matplotlib.pyplot as plt
+        figure = plt.figure(figsize=(10, 5))
+    else:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(10, 5))
+        FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.plot(values, label=f"{label} ({episodes} episodes)", color=color)
+    axes.set_xlabel("Episodes")
+    axes.set_ylabel(y_label)
+    axes.set_title(title)
+    axes.legend()
+    axes.grid()
+    if output is None:
+        plt.show()
+    else:
+        figure.savefig(output)
+
+
+def save_curves_csv(metrics: TrainingMetrics, output: str, episodes: int = 100) -> None:
+    """
+    Writes the result, reward and learning curves of every episode to a CSV file.
+
+    Parameters
+    ----------
+    metrics : TrainingMetrics
+        The training metrics, with history.
+    output : str
+        The path of the CSV file.
+    episodes : int
+        The moving average window size.
+    """
+    curves = learning_curves(metrics, episodes)
+    with open(output, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["episode", "result", "reward", "rewards", "success_rate"])
+        writer.writerows(zip(range(1, len(metrics) + 1), metrics.results.tolist(), metrics.rewards.tolist(),
+                             curves["rewards"].tolist(), curves["success_rate"].tolist()))
+
+
+def save_plots(metrics: TrainingMetrics, prefix: str, plot_format: str, episodes: int = 100) -> list:
+    """
+    Saves the learning curves of the training metrics, without showing any window.
+
+    Parameters
+    ----------
+    metrics : TrainingMetrics
+        The training metrics, with history.
+    prefix : str
+        The path prefix of the files.
+    plot_format : str
+        The file format: png, svg or csv. CSV writes both curves to a single file.
+    episodes : int
+        The moving average window size.
+
+    Returns
+    -------
+    list
+        The paths of the written files.
+    """
+    if plot_format not in PLOT_FORMATS:
+        raise ValueError(f"Invalid plot format: {plot_format}")
+    if plot_format == "csv":
+        save_curves_csv(metrics, f"{prefix}-curves.csv", episodes)
+        return [f"{prefix}-curves.csv"]
+    paths = []
+    for curve, values in learning_curves(metrics, episodes).items():
+        paths.append(f"{prefix}-{curve}.{plot_format}")
+        plot_curve(values, curve, episodes, paths[-1])
+    return paths
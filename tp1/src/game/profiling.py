@@ -0,0 +1,142 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+class PhaseTimers:
+    """
+    Counters and timers of the phases of a run.
+    Methods are timed by wrapping them on an instance, or on a subclass for objects created during the run, so nothing
+    is measured, and nothing is slowed down, unless the timers are installed. Phases may nest, a board query made
+    during a turn counts in both phases.
+    """
+
+    def __init__(self):
+        """
+        Initializes the timers with no phases.
+        """
+        self.seconds = {}
+        self.calls = {}
+        self.wrapped = []
+
+    def add(self, phase: str, seconds: float):
+        """
+        Adds a call to a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase.
+        seconds : float
+            The duration of the call.
+        """
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    @contextmanager
+    def phase(self, phase: str):
+        """
+        Context manager timing its block as a call to a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def timed(self, function, phase: str):
+        """
+        Returns a function timing every call of the given one as a call to a phase.
+
+        Parameters
+        ----------
+        function : callable
+            The function to time.
+        phase : str
+            The name of the phase.
+
+        Returns
+        -------
+        callable
+            The timed function.
+        """
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+        return timed_function
+
+    def wrap(self, instance, methods: tuple, phase: str):
+        """
+        Times the given methods of an instance.
+
+        Parameters
+        ----------
+        instance : object
+            The object whose methods are timed.
+        methods : tuple
+            The names of the methods.
+        phase : str
+            The name of the phase.
+        """
+        for method in methods:
+            setattr(instance, method, self.timed(getattr(instance, method), phase))
+            self.wrapped.append((instance, method))
+
+    def unwrap_all(self):
+        """
+        Restores the methods wrapped with wrap.
+        """
+        for instance, method in reversed(self.wrapped):
+            delattr(instance, method)
+        self.wrapped = []
+
+    def timed_type(self, cls: type, methods: tuple, phase: str) -> type:
+        """
+        Returns a subclass timing the given methods, for objects created during the run.
+
+        Parameters
+        ----------
+        cls : type
+            The class to time.
+        methods : tuple
+            The names of the methods.
+        phase : str
+            The name of the phase.
+
+        Returns
+        -------
+        type
+            The timed subclass.
+        """
+        return type(cls.__name__, (cls,), {method: self.timed(getattr(cls, method), phase) for method in methods})
+
+    def report(self, total: float) -> str:
+        """
+        Formats the time breakdown of the phases, from the slowest one.
+
+        Parameters
+        ----------
+        total : float
+            The duration of the whole run in seconds.
+
+        Returns
+        -------
+        str
+            One line per phase with its calls, total time, share of the run and mean time per call.
+        """
+        lines = [f"{'Phase':<20}{'Calls':>12}{'Seconds':>12}{'% of run':>10}{'us/call':>12}"]
+        for phase, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            calls = self.calls[phase]
+            lines.append(f"{phase:<20}{calls:>12}{seconds:>12.3f}{100 * seconds / total:>10.1f}"
+                         f"{1e6 * seconds / calls:>12.2f}")
+        lines.append(f"{'total':<20}{'':>12}{total:>12.3f}{100.0:>10.1f}")
+        return "\n".join(lines)
@@ -1,52 +1,114 @@
 import random
 
-import matplotlib.pyplot as plt
+import numpy as np
 
 from .board import Board
+from .metrics import TrainingMetrics
 from .players import Player
-from .utils import pos_to_xy, xy_to_pos, board_to_index
+from .plots import plot_curve, learning_curves
+from .replay import ReplayBuffer
+from .utils import (pos_to_xy, board_to_index, canonicalize, inverse_transform_action, legal_actions,
+                    legal_mask_table, predict_from_tables, q_values_array)
+
+N_STATES = 3 ** 9
+N_ACTIONS = 9
+BACKENDS = ("dict", "numpy")
 
 
 class QLearning(Player):
     """
     Q-Learning player for Tic Tac Toe.
-    This player uses Q-Learning methods to learn and improve its strategy over time.
+    This player uses Q-Learning methods to learn and improve its strategy over time. Only the empty cells of a board
+    are considered as actions, so the learner never picks an occupied cell.
+    With a replay buffer, transitions are stored instead of learnt from one by one, and at the end of every episode a
+    minibatch sampled from the buffer updates the Q-values at once.
+    Instead of the one-step update, the Q-values can be updated with n-step returns, or with Watkins Q(lambda)
+    eligibility traces kept for the steps of the current episode only, so the final reward reaches the opening moves
+    sooner.
     """
 
-    def __init__(self):
+    def __init__(self, backend: str = "dict", symmetry: bool = False, replay_capacity: int = None,
+                 replay_batch_size: int = 64, n_step: int = 1, trace_decay: float = None):
         """
         Initializes the Q-Learning player.
+
+        Parameters
+        ----------
+        backend : str
+            Storage of the Q-values. "dict" keeps a dict of dicts with the visited states, while "numpy" preallocates
+            a float32 array with one row per state code and one column per action.
+        symmetry : bool
+            If True, the Q-values are keyed by the canonical representative of each board among its rotations and
+            reflections, so experience from one orientation applies to all of them.
+        replay_capacity : int, optional
+            The number of transitions kept in the replay buffer. Without it, every transition updates its Q-value
+            online. Only supported by the numpy backend.
+        replay_batch_size : int
+            The number of transitions sampled from the replay buffer at the end of every episode.
+        n_step : int
+            The number of rewards of the returns updating a Q-value, before bootstrapping on the best Q-value of the
+            state reached. 1 is the one-step update.
+        trace_decay : float, optional
+            The lambda of Watkins Q(lambda). The traces of the episode steps decay by gamma * lambda on every step and
+            are cut after an exploratory move. Without it, the n-step update is used.
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid Q-values backend: {backend}")
+        if replay_capacity is not None and backend != "numpy":
+            raise ValueError("The replay buffer is only supported by the numpy backend")
+        if n_step < 1:
+            raise ValueError(f"Invalid number of steps: {n_step}")
+        if trace_decay is not None and not 0 <= trace_decay <= 1:
+            raise ValueError(f"Invalid trace decay: {trace_decay}")
+        if (n_step > 1 or trace_decay is not None) and replay_capacity is not None \
+                or n_step > 1 and trace_decay is not None:
+            raise ValueError("Only one of the replay buffer, n-step returns and eligibility traces can be used")
         self.alpha = 0.1
         self.epsilon = 0.2
         self.gamma = 0.9
         self.train = False
-        self.q_values = {}
+        self.backend = backend
+        self.symmetry = symmetry
+        if backend == "numpy":
+            self.q_values = np.zeros((N_STATES, N_ACTIONS), dtype=np.float32)
+        else:
+            self.q_values = {}
         self.last_state = None
         self.last_action = None
         self.n_steps = 0
         self.episode_reward = 0
-        self.train_results = []
-        self.train_rewards = []
+        self.metrics = TrainingMetrics()
+        self.replay = None if replay_capacity is None else ReplayBuffer(replay_capacity, N_ACTIONS)
+        self.replay_batch_size = replay_batch_size
+        self.replay_rng = None
+        self.n_step = n_step
+        self.trace_decay = trace_decay
+        # Steps waiting for their n-step return, and eligibility traces keyed by (state, action)
+        self.pending_steps = []
+        self.traces = {}
+        # Callable receiving the (state, action, reward, next state) transitions instead of learning from them
+        self.transition_sink = None
 
     def new_game(self):
         """
-        Prints a message indicating q-learning is participating in a new game.
+        Notifies a message indicating q-learning is participating in a new game.
         If the mode is training, it initializes the episode steps and rewards.
         :return:
         """
-        print("Q-Learning participates in a new game")
+        self.notify("Q-Learning participates in a new game")
         if self.train:
             self.n_steps = 0
             self.episode_reward = 0
             self.last_state = None
             self.last_action = None
+            self.pending_steps = []
+            self.traces = {}
 
     def start(self):
         """
-        Prints a message indicating q-learning starts the game.
+        Notifies a message indicating q-learning starts the game.
         """
-        print("Q-Learning starts")
+        self.notify("Q-Learning starts")
 
     def turn(self, board: Board) -> (int, int):
         """
@@ -63,86 +125,93 @@ class QLearning(Player):
             The (x, y) coordinates of the chosen position.
         """
         index = board_to_index(board)
+        transform = 0
+        if self.symmetry:
+            index, transform = canonicalize(index)
+        actions = legal_actions(index, board.width * board.height)
         if not self.train:
-            next_step = max(self.q_values[index], key=self.q_values[index].get)
+            # States never visited while training get a random legal move
+            if self.backend == "dict" and index not in self.q_values:
+                next_step = random.choice(actions)
+            else:
+                next_step = self._best_action(index, actions)
         else:
-            if index not in self.q_values:
-                # Check if Q-values are initialized for the current state
-                self.q_values[index] = {i: 0 for i in range(9)}
+            # Check if Q-values are initialized for the current state
+            self._init_state(index, actions)
             if self.n_steps >= 20:
                 # Check if we are over the limit of turns
-                self.train_results.append('I')
                 reward = -50
                 self.episode_reward += reward
-                self._update_q_values(self.last_state, self.last_action, reward, 0)
-                self.train_rewards.append(self.episode_reward)
+                self._learn(reward)
+                self.metrics.record('I', self.episode_reward)
                 raise RuntimeWarning("No more moves left")
             elif self.n_steps > 0:
                 # Update last step rewards
                 reward = -0.1
                 self.episode_reward += reward
-                actual_max_q_value = max(self.q_values[index].values())
-                self._update_q_values(self.last_state, self.last_action, reward, actual_max_q_value)
+                self._learn(reward, index, actions)
 
             # Choose the next step
             if random.random() < self.epsilon:
-                # Explore: choose a random action
-                empty_spot = board.get_empty_spots()
-                next_step_x, next_step_y = empty_spot.pop(random.randrange(len(empty_spot)))
-                next_step = xy_to_pos(next_step_x, next_step_y)
+                # Explore: choose a random legal action
+                next_step = random.choice(actions)
+                if self.traces and self._q_value(index, next_step) < self._max_q_value(index, actions):
+                    # Watkins Q(lambda) only credits earlier steps through greedy moves
+                    self.traces = {}
             else:
-                # Exploit: choose the best action based on Q-values
-                next_step = max(self.q_values[index], key=self.q_values[index].get)
+                # Exploit: choose the legal action with the best Q-value
+                next_step = self._best_action(index, actions)
             self.last_state = index
             self.last_action = next_step
             self.n_steps += 1
 
-        return pos_to_xy(next_step)
+        if self.symmetry:
+            next_step = inverse_transform_action(next_step, transform)
+        return pos_to_xy(next_step, board.width)
 
     def invalid_position(self):
         """
-        Prints a message indicating q-learning has chosen an invalid position.
+        Notifies a message indicating q-learning has chosen an invalid position, and counts it if in training mode.
         """
-        print("Q-Learning choose an invalid position")
+        self.notify("Q-Learning choose an invalid position")
+        if self.train:
+            self.metrics.record_invalid_moves()
 
     def win(self):
         """
-        Prints a message indicating q-learning has won.
+        Notifies a message indicating q-learning has won.
         Updates the rewards and Q-values if in training mode.
         """
-        print("Q-Learning Wins")
+        self.notify("Q-Learning Wins")
         if self.train:
             reward = 10
             self.episode_reward += reward
-            self._update_q_values(self.last_state, self.last_action, reward, 0)
-            self.train_rewards.append(self.episode_reward)
-            self.train_results.append('W')
+            self._learn(reward)
+            self.metrics.record('W', self.episode_reward)
 
     def loose(self):
         """
-        Prints a message indicating q-learning has lost.
+        Notifies a message indicating q-learning has lost.
         Updates the rewards and Q-values if in training mode.
         """
-        print("Q-Learning Loose")
+        self.notify("Q-Learning Loose")
         if self.train:
             reward = -10
             self.episode_reward += reward
-            self._update_q_values(self.last_state, self.last_action, reward, 0)
-            self.train_rewards.append(self.episode_reward)
-            self.train_results.append('L')
+            self._learn(reward)
+            self.metrics.record('L', self.episode_reward)
 
     def draw(self):
         """
-        Prints a message indicating q-learning has drawn.
+        Notifies a message indicating q-learning has drawn.
         Updates the rewards and Q-values if in training mode.
         """
-        print("Q-Learning Draw")
+        self.notify("Q-Learning Draw")
         if self.train:
             reward = -2
             self.episode_reward += reward
-            self._update_q_values(self.last_state, self.last_action, reward, 0)
-            self.train_rewards.append(self.episode_reward)
-            self.train_results.append('D')
+            self._learn(reward)
+            self.metrics.record('D', self.episode_reward)
 
     def set_train(self, train: bool):
         """
@@ -164,12 +233,9 @@ class QLearning(Player):
         float
             The average reward.
         """
-        if len(self.train_rewards) < episodes:
-            return sum(self.train_rewards) / len(self.train_rewards)
-        else:
-            return sum(self.train_rewards[-episodes:]) / episodes
+        return self.metrics.average_reward(episodes)
 
-    def plot_rewards(self, episodes: int = 100) -> None:
+    def plot_rewards(self, episodes: int = 100, output: str = None) -> None:
         """
         Plot a moving average (over n episodes) of the rewards.
 
@@ -177,21 +243,12 @@ class QLearning(Player):
         ----------
         episodes : int
             The moving average window size.
+        output : str, optional
+            The image file to save the plot to, instead of showing it.
         """
-        moving_avg = [
-            sum(self.train_rewards[max(0, i - episodes + 1):i + 1]) / min(i + 1, episodes)
-            for i in range(len(self.train_rewards))
-        ]
-        plt.figure(figsize=(10, 5))
-        plt.plot(moving_avg, label=f"Moving Average ({episodes} episodes)", color="red")
-        plt.xlabel("Episodes")
-        plt.ylabel("Reward")
-        plt.title("Episode Rewards")
-        plt.legend()
-        plt.grid()
-        plt.show()
-
-    def plot_success_rate(self, episodes: int = 100) -> None:
+        plot_curve(learning_curves(self.metrics, episodes)["rewards"], "rewards", episodes, output)
+
+    def plot_success_rate(self, episodes: int = 100, output: str = None) -> None:
         """
         Plot the success rate with a moving average over n episodes.
 
@@ -199,19 +256,10 @@ class QLearning(Player):
         ----------
         episodes : int
             The moving average window size.
+        output : str, optional
+            The image file to save the plot to, instead of showing it.
         """
-        moving_avg = [
-            sum([1 for r in self.train_results[max(0, i - episodes + 1):i + 1] if r == 'W']) / min(i + 1, episodes)
-            for i in range(len(self.train_results))
-        ]
-        plt.figure(figsize=(10, 5))
-        plt.plot(moving_avg, label=f"Success Rate ({episodes} episodes)", color="green")
-        plt.xlabel("Episodes")
-        plt.ylabel("Success Rate")
-        plt.title("Success Rate")
-        plt.legend()
-        plt.grid()
-        plt.show()
+        plot_curve(learning_curves(self.metrics, episodes)["success_rate"], "success_rate", episodes, output)
 
     def get_success_rate(self, episodes: int = 100) -> float:
         """
@@ -227,12 +275,188 @@ class QLearning(Player):
         float
             The success rate.
         """
-        if len(self.train_results) < episodes:
-            return sum([1 for result in self.train_results if result == 'W']) / len(self.train_results)
+        return self.metrics.success_rate(episodes)
+
+    def greedy_action(self, index: int):
+        """
+        Returns the action with the best Q-value for a board state code.
+
+        Parameters
+        ----------
+        index : int
+            The board state code.
+
+        Returns
+        -------
+        int
+            The position of the best legal action, None if the state has no Q-values or no empty cells.
+        """
+        transform = 0
+        if self.symmetry:
+            index, transform = canonicalize(index)
+        actions = legal_actions(index)
+        if not actions or self.backend == "dict" and index not in self.q_values:
+            return None
+        return inverse_transform_action(self._best_action(index, actions), transform)
+
+    def predict_batch(self, states, return_q_values: bool = False):
+        """
+        Returns the actions with the best Q-value for a batch of board state codes in one vectorized call.
+
+        Parameters
+        ----------
+        states : array_like
+            The board state codes.
+        return_q_values : bool
+            If True, the Q-values of the states are returned too.
+
+        Returns
+        -------
+        np.ndarray or tuple
+            The best legal action of each state, -1 for states without Q-values, and if asked the (n, 9) Q-values of
+            each state, NaN for the unknown ones and the occupied cells.
+        """
+        q_values = self.q_values if self.backend == "numpy" else q_values_array(self.q_values)
+        q_values = np.where(legal_mask_table(), q_values, np.nan)
+        unknown = np.isnan(q_values)
+        actions = np.where(unknown.all(axis=1), -1, np.where(unknown, -np.inf, q_values).argmax(axis=1))
+        return predict_from_tables(states, lambda keys: (actions[keys], q_values[keys]), self.symmetry,
+                                   return_q_values)
+
+    def apply_transitions(self, transitions: list):
+        """
+        Updates the Q-values with the given transitions, in order.
+
+        Parameters
+        ----------
+        transitions : list
+            A list of (state, action, reward, next state) tuples. The next state is None for final transitions.
+            They bypass the n-step returns and the eligibility traces and are learnt with the one-step update, or with
+            a replay buffer, added to it and learnt from one sampled minibatch per final transition.
+        """
+        if self.replay is not None:
+            if not transitions:
+                return
+            states, actions, rewards, next_states = zip(*transitions)
+            done = np.array([next_state is None for next_state in next_states])
+            self.replay.add_batch(np.array(states), np.array(actions), np.array(rewards, dtype=np.float32),
+                                  np.array([next_state or 0 for next_state in next_states]), done)
+            self._replay(self.replay_batch_size * max(1, int(done.sum())))
+            return
+        for state, action, reward, next_index in transitions:
+            self._init_state(state, legal_actions(state))
+            if next_index is None:
+                max_q_value = 0
+            else:
+                next_actions = legal_actions(next_index)
+                self._init_state(next_index, next_actions)
+                max_q_value = self._max_q_value(next_index, next_actions)
+            self._update_q_values(state, action, reward, max_q_value)
+
+    def _init_state(self, index: int, actions: tuple):
+        # Only the legal actions of a state get Q-values
+        if self.backend == "dict" and index not in self.q_values:
+            self.q_values[index] = {action: 0 for action in actions}
+
+    def _learn(self, reward: float, next_index: int = None, next_actions: tuple = None):
+        # Update the Q-value of the last step, next index is None if the last step was final
+        if self.transition_sink is not None:
+            self.transition_sink((self.last_state, self.last_action, reward, next_index))
+            return
+        if self.replay is not None:
+            self.replay.add(self.last_state, self.last_action, reward, next_index)
+            if next_index is None:
+                self._replay(self.replay_batch_size)
+            return
+        if self.trace_decay is not None:
+            self._learn_traces(reward, next_index, next_actions)
+            return
+        if self.n_step > 1:
+            self._learn_n_step(reward, next_index, next_actions)
+            return
+        max_q_value = 0 if next_index is None else self._max_q_value(next_index, next_actions)
+        self._update_q_values(self.last_state, self.last_action, reward, max_q_value)
+
+    def _learn_n_step(self, reward: float, next_index: int = None, next_actions: tuple = None):
+        # Update the Q-value of the step taken n steps ago with its n-step return, or of every pending step at the end
+        # of the episode with the rewards left
+        self.pending_steps.append((self.last_state, self.last_action, reward))
+        if next_index is not None:
+            if len(self.pending_steps) < self.n_step:
+                return
+            bootstrap = self._max_q_value(next_index, next_actions)
+            steps = self.pending_steps[:1]
         else:
-            return sum([1 for result in self.train_results[-episodes:] if result == 'W']) / episodes
+            bootstrap = 0
+            steps = self.pending_steps
+        for first in range(len(steps)):
+            n_step_return = bootstrap
+            for _, _, step_reward in reversed(self.pending_steps[first:]):
+                n_step_return = step_reward + self.gamma * n_step_return
+            state, action, _ = self.pending_steps[first]
+            self._add_q_value(state, action, self.alpha * (n_step_return - self._q_value(state, action)))
+        self.pending_steps = [] if next_index is None else self.pending_steps[1:]
+
+    def _learn_traces(self, reward: float, next_index: int = None, next_actions: tuple = None):
+        # Watkins Q(lambda) with replacing traces, only the steps of the current episode have one
+        max_q_value = 0 if next_index is None else self._max_q_value(next_index, next_actions)
+        td_error = reward + self.gamma * max_q_value - self._q_value(self.last_state, self.last_action)
+        self.traces[(self.last_state, self.last_action)] = 1.0
+        decay = self.gamma * self.trace_decay
+        for (state, action), trace in self.traces.items():
+            self._add_q_value(state, action, self.alpha * td_error * trace)
+            self.traces[(state, action)] = trace * decay
+        if next_index is None:
+            self.traces = {}
+
+    def _q_value(self, index: int, action: int) -> float:
+        if self.backend == "numpy":
+            return float(self.q_values[index, action])
+        return self.q_values[index].get(action, 0)
+
+    def _add_q_value(self, index: int, action: int, delta: float):
+        if self.backend == "numpy":
+            self.q_values[index, action] += delta
+            return
+        q_values = self.q_values[index]
+        q_values[action] = q_values.get(action, 0) + delta
+
+    def _replay(self, samples: int):
+        # Learn from a minibatch of the replay buffer. Duplicated transitions are averaged, so a small buffer sampled
+        # many times doesn't overshoot the targets.
+        if self.replay_rng is None:
+            # Seeded from the random module on first use, so seeded training runs are reproducible
+            self.replay_rng = np.random.default_rng(random.getrandbits(64))
+        states, actions, rewards, next_states, done, next_legal = self.replay.sample(samples, self.replay_rng)
+        next_q_values = np.where(next_legal, self.q_values[next_states], -np.inf).max(axis=1)
+        max_q_values = np.where(done | ~next_legal.any(axis=1), 0, next_q_values)
+        keys, inverse = np.unique(states * N_ACTIONS + actions, return_inverse=True)
+        q_values = self.q_values.reshape(-1)
+        td_errors = rewards + self.gamma * max_q_values - q_values[keys][inverse]
+        q_values[keys] += self.alpha * np.bincount(inverse, weights=td_errors) / np.bincount(inverse)
+
+    def _best_action(self, index: int, actions: tuple) -> int:
+        # The legal action with the best Q-value, the first one on ties. Tables saved before the actions were masked
+        # may hold values of occupied cells, they are ignored.
+        if self.backend == "numpy":
+            return actions[int(self.q_values[index, list(actions)].argmax())]
+        q_values = self.q_values[index]
+        return max(actions, key=lambda action: q_values.get(action, 0))
+
+    def _max_q_value(self, index: int, actions: tuple) -> float:
+        if not actions:
+            return 0
+        if self.backend == "numpy":
+            return float(self.q_values[index, list(actions)].max())
+        q_values = self.q_values[index]
+        return max(q_values.get(action, 0) for action in actions)
 
-    def _update_q_values(self, last_state: str, last_action: int, reward: float, max_q_value: float):
+    def _update_q_values(self, last_state: int, last_action: int, reward: float, max_q_value: float):
+        if self.backend == "numpy":
+            q_value = self.q_values[last_state, last_action]
+            self.q_values[last_state, last_action] = (
+                    q_value + self.alpha * (reward + self.gamma * max_q_value - q_value))
+            return
         self.q_values[last_state][last_action] = (
                 self.q_values[last_state][last_action] +
                 self.alpha * (reward + self.gamma * max_q_value - self.q_values[last_state][last_action]))
@@ -0,0 +1,126 @@
+import numpy as np
+
+from .utils import legal_mask_table
+
+
+class ReplayBuffer:
+    """
+    Fixed capacity ring buffer of the transitions of a learner, held in NumPy arrays.
+    Every transition keeps the state code, the action, the reward, the next state code, whether it ended the episode
+    and the legal actions of the next state, so minibatches are sampled and learnt from with array operations. Once
+    full, new transitions overwrite the oldest ones.
+    """
+
+    def __init__(self, capacity: int, n_actions: int = 9):
+        """
+        Initializes the empty buffer.
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of transitions kept.
+        n_actions : int
+            The number of actions of a state, the cells of the board.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Invalid replay buffer capacity: {capacity}")
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.next_legal = np.zeros((capacity, n_actions), dtype=bool)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, state: int, action: int, reward: float, next_state: int = None):
+        """
+        Adds a transition.
+
+        Parameters
+        ----------
+        state : int
+            The state code the action was taken in.
+        action : int
+            The action taken.
+        reward : float
+            The reward of the action.
+        next_state : int, optional
+            The state code reached, None if the action ended the episode.
+        """
+        position = self.position
+        self.states[position] = state
+        self.actions[position] = action
+        self.rewards[position] = reward
+        self.done[position] = next_state is None
+        if next_state is None:
+            self.next_states[position] = 0
+            self.next_legal[position] = False
+        else:
+            self.next_states[position] = next_state
+            self.next_legal[position] = legal_mask_table()[next_state]
+        self.position = (position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray,
+                  done: np.ndarray):
+        """
+        Adds a batch of transitions at once, in order.
+
+        Parameters
+        ----------
+        states : np.ndarray
+            The state codes the actions were taken in.
+        actions : np.ndarray
+            The actions taken.
+        rewards : np.ndarray
+            The rewards of the actions.
+        next_states : np.ndarray
+            The state codes reached, ignored for the final transitions.
+        done : np.ndarray
+            Whether each action ended its episode.
+        """
+        count = len(states)
+        start = self.position
+        if count > self.capacity:
+            # Only the newest transitions would be kept, at the positions they would be written to one by one
+            start = (start + count - self.capacity) % self.capacity
+            states, actions, rewards = states[-self.capacity:], actions[-self.capacity:], rewards[-self.capacity:]
+            next_states, done = next_states[-self.capacity:], done[-self.capacity:]
+        positions = (start + np.arange(len(states))) % self.capacity
+        done = np.asarray(done, dtype=bool)
+        next_states = np.where(done, 0, next_states)
+        self.states[positions] = states
+        self.actions[positions] = actions
+        self.rewards[positions] = rewards
+        self.next_states[positions] = next_states
+        self.done[positions] = done
+        self.next_legal[positions] = legal_mask_table()[next_states] & ~done[:, None]
+        self.position = (self.position + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> tuple:
+        """
+        Samples a minibatch of transitions uniformly, with replacement.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of transitions sampled.
+        rng : np.random.Generator
+            The random generator.
+
+        Returns
+        -------
+        tuple
+            The states, actions, rewards, next states, done flags and next legal masks of the sampled transitions.
+        """
+        if self.size == 0:
+            raise ValueError("The replay buffer is empty")
+        indexes = rng.integers(0, self.size, batch_size)
+        return (self.states[indexes], self.actions[indexes], self.rewards[indexes], self.next_states[indexes],
+                self.done[indexes], self.next_legal[indexes])
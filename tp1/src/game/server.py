@@ -0,0 +1,414 @@
+import asyncio
+import json
+import random
+import socket
+import time
+from collections import deque
+
+import numpy as np
+
+from .board import Board
+from .tic_tac_toe import TicTacToe
+from .utils import pos_to_xy
+
+# TCP address on localhost used unless another one is given, "unix:<path>" addresses use a Unix socket instead
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+# Pending connections accepted by the listening socket, so thousands of clients can connect at once
+SERVER_BACKLOG = 4096
+# Number of the latest request latencies kept to compute the percentiles
+LATENCY_SAMPLES = 100000
+
+STATUS_PLAYING = "playing"
+STATUS_WON = "won"
+STATUS_LOST = "lost"
+STATUS_DRAW = "draw"
+
+
+def parse_address(address: str) -> tuple:
+    """
+    Parses a server address.
+
+    Parameters
+    ----------
+    address : str
+        "<host>:<port>" for TCP or "unix:<path>" for a Unix socket.
+
+    Returns
+    -------
+    tuple
+        ("unix", path) or ("tcp", host, port).
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid server address: {address}")
+    return "tcp", host, int(port)
+
+
+class GameSession:
+    """
+    A game of a server client against the model. The client plays X and the model O, as in the interactive game.
+    Every session has its own board, the model is shared by all the sessions and only read: moves are its greedy
+    actions, or a random empty position on states it doesn't know.
+    """
+
+    def __init__(self, model, rng: random.Random = None):
+        """
+        Initializes the session with no game.
+
+        Parameters
+        ----------
+        model : Player
+            The trained model, with a greedy_action method.
+        rng : random.Random, optional
+            The random generator of the first player and the fallback moves.
+        """
+        self.model = model
+        self.rng = rng or random.Random()
+        self.board = Board()
+        self.status = None
+
+    def new_game(self, first: str = None) -> dict:
+        """
+        Starts a new game. The model plays its first move if it starts.
+
+        Parameters
+        ----------
+        first : str, optional
+            The player making the first move: "user" or "model". Chosen randomly if not given.
+
+        Returns
+        -------
+        dict
+            The game state, with the first player.
+        """
+        if first is None:
+            first = self.rng.choice(["user", "model"])
+        elif first not in ("user", "model"):
+            raise ValueError(f"Invalid first player: {first}")
+        self.board = Board()
+        self.status = STATUS_PLAYING
+        response = {"first": first}
+        if first == "model":
+            response["model_position"] = self._model_move()
+        return dict(self.state(), **response)
+
+    def move(self, position: int) -> dict:
+        """
+        Plays a move of the client and the reply of the model.
+
+        Parameters
+        ----------
+        position : int
+            The position of the client move, from 0 to 8.
+
+        Returns
+        -------
+        dict
+            The game state, with the model move if it played.
+        """
+        if self.status != STATUS_PLAYING:
+            raise ValueError("No game in progress")
+        if not isinstance(position, int) or not 0 <= position < 9 \
+                or not self.board.place_symbol(TicTacToe.SYMBOL_PLAYER1, *pos_to_xy(position)):
+            raise ValueError("Invalid position")
+        if self.board.is_winner(TicTacToe.SYMBOL_PLAYER1):
+            self.status = STATUS_WON
+        elif self.board.is_full():
+            self.status = STATUS_DRAW
+        else:
+            model_position = self._model_move()
+            return dict(self.state(), model_position=model_position)
+        return self.state()
+
+    def state(self) -> dict:
+        """
+        Returns the state of the game.
+
+        Returns
+        -------
+        dict
+            The board state code and the game status: None before the first game, "playing", "won", "lost" or
+            "draw", from the client side.
+        """
+        return {"board": self.board.state, "status": self.status}
+
+    def _model_move(self) -> int:
+        action = self.model.greedy_action(self.board.state)
+        if action is None or not 0 <= action < 9 \
+                or not self.board.place_symbol(TicTacToe.SYMBOL_PLAYER2, *pos_to_xy(action)):
+            action = self.rng.choice([pos_x + pos_y * 3 for pos_x, pos_y in self.board.get_empty_spots()])
+            self.board.place_symbol(TicTacToe.SYMBOL_PLAYER2, *pos_to_xy(action))
+        if self.board.is_winner(TicTacToe.SYMBOL_PLAYER2):
+            self.status = STATUS_LOST
+        elif self.board.is_full():
+            self.status = STATUS_DRAW
+        return action
+
+
+class LatencyStats:
+    """
+    Processing time of the requests of a server. The latest latencies are kept for the percentiles, so memory stays
+    bounded on long runs.
+    """
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        """
+        Initializes the statistics with no requests.
+
+        Parameters
+        ----------
+        samples : int
+            The number of latest latencies kept.
+        """
+        self.requests = 0
+        self.total = 0.0
+        self.latencies = deque(maxlen=samples)
+
+    def record(self, seconds: float):
+        """
+        Records the latency of a request.
+
+        Parameters
+        ----------
+        seconds : float
+            The processing time of the request.
+        """
+        self.requests += 1
+        self.total += seconds
+        self.latencies.append(seconds)
+
+    def summary(self) -> dict:
+        """
+        Returns the request count and latencies in microseconds.
+
+        Returns
+        -------
+        dict
+            The requests, the mean latency and the 50th, 90th, 99th percentiles and maximum of the latest ones.
+        """
+        summary = {"requests": self.requests, "mean_us": 1e6 * self.total / self.requests if self.requests else 0.0}
+        latencies = np.fromiter(self.latencies, dtype=np.float64) * 1e6 if self.latencies else np.zeros(1)
+        for name, percentile in (("p50_us", 50), ("p90_us", 90), ("p99_us", 99), ("max_us", 100)):
+            summary[name] = float(np.percentile(latencies, percentile))
+        return summary
+
+    def report(self) -> str:
+        """
+        Formats the summary of the latencies.
+
+        Returns
+        -------
+        str
+            One line with the requests and latencies.
+        """
+        summary = self.summary()
+        return (f"{summary['requests']} requests, latency mean {summary['mean_us']:.1f} us, "
+                f"p50 {summary['p50_us']:.1f} us, p90 {summary['p90_us']:.1f} us, p99 {summary['p99_us']:.1f} us, "
+                f"max {summary['max_us']:.1f} us")
+
+
+class GameServer:
+    """
+    Asyncio server playing games of many clients at once against one loaded model.
+    Every connection holds a game session, requests and responses are JSON objects, one per line:
+    {"op": "new", "first": "user" | "model"} starts a game, {"op": "move", "position": <0-8>} plays a move and
+    {"op": "stats"} returns the latency summary. Every response has the server processing time of the request in
+    "latency_us", and errors are returned in "error" with the state of the game.
+    """
+
+    def __init__(self, model, address: str = DEFAULT_ADDRESS, seed: int = None):
+        """
+        Initializes the server. Nothing listens until start is called.
+
+        Parameters
+        ----------
+        model : Player
+            The trained model, with a greedy_action method.
+        address : str
+            "<host>:<port>" for TCP or "unix:<path>" for a Unix socket. Port 0 picks a free port.
+        seed : int, optional
+            The seed of the random generator of the sessions.
+        """
+        self.model = model
+        self.address = address
+        self.rng = random.Random(seed)
+        self.latency = LatencyStats()
+        self.sessions = 0
+        self.server = None
+
+    async def start(self):
+        """
+        Starts listening for connections.
+        """
+        parsed = parse_address(self.address)
+        if parsed[0] == "unix":
+            self.server = await asyncio.start_unix_server(self._serve_client, parsed[1], backlog=SERVER_BACKLOG)
+        else:
+            self.server = await asyncio.start_server(self._serve_client, parsed[1], parsed[2],
+                                                     backlog=SERVER_BACKLOG)
+            host, port = self.server.sockets[0].getsockname()[:2]
+            self.address = f"{host}:{port}"
+
+    async def serve_forever(self):
+        """
+        Starts the server if needed and serves clients until cancelled.
+        """
+        if self.server is None:
+            await self.start()
+        await self.server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening and waits for the server to close.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+    def handle_request(self, session: GameSession, request: dict) -> dict:
+        """
+        Handles a request of a client.
+
+        Parameters
+        ----------
+        session : GameSession
+            The game session of the client.
+        request : dict
+            The decoded request.
+
+        Returns
+        -------
+        dict
+            The response, without the latency.
+        """
+        operation = request.get("op")
+        try:
+            if operation == "new":
+                return session.new_game(request.get("first"))
+            if operation == "move":
+                return session.move(request.get("position"))
+            if operation == "stats":
+                return dict(self.latency.summary(), sessions=self.sessions)
+            raise ValueError(f"Invalid operation: {operation}")
+        except ValueError as error:
+            return dict(session.state(), error=str(error))
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = GameSession(self.model, random.Random(self.rng.getrandbits(64)))
+        self.sessions += 1
+        try:
+            while line := await reader.readline():
+                start = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    response = dict(session.state(), error="Invalid request")
+                else:
+                    response = self.handle_request(session, request)
+                latency = time.perf_counter() - start
+                self.latency.record(latency)
+                response["latency_us"] = round(latency * 1e6, 1)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+
+class GameClient:
+    """
+    Blocking client of a game server, for interactive players waiting for the user anyway.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS):
+        """
+        Connects to the server.
+
+        Parameters
+        ----------
+        address : str
+            "<host>:<port>" for TCP or "unix:<path>" for a Unix socket.
+        """
+        parsed = parse_address(address)
+        if parsed[0] == "unix":
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(parsed[1])
+        else:
+            self.socket = socket.create_connection(parsed[1:])
+        self.file = self.socket.makefile("rwb")
+
+    def request(self, request: dict) -> dict:
+        """
+        Sends a request and waits for its response.
+
+        Parameters
+        ----------
+        request : dict
+            The request.
+
+        Returns
+        -------
+        dict
+            The response.
+        """
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection")
+        return json.loads(line)
+
+    def new_game(self, first: str = None) -> dict:
+        """
+        Starts a new game.
+
+        Parameters
+        ----------
+        first : str, optional
+            The player making the first move: "user" or "model". Chosen by the server if not given.
+
+        Returns
+        -------
+        dict
+            The game state.
+        """
+        return self.request({"op": "new"} if first is None else {"op": "new", "first": first})
+
+    def move(self, position: int) -> dict:
+        """
+        Plays a move.
+
+        Parameters
+        ----------
+        position : int
+            The position of the move, from 0 to 8.
+
+        Returns
+        -------
+        dict
+            The game state after the move and the model reply.
+        """
+        return self.request({"op": "move", "position": position})
+
+    def stats(self) -> dict:
+        """
+        Returns the latency summary of the server.
+
+        Returns
+        -------
+        dict
+            The requests and latencies of the server.
+        """
+        return self.request({"op": "stats"})
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+        self.file.close()
+        self.socket.close()
@@ -0,0 +1,317 @@
+import os
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from .batch_env import LINES, WEIGHTS
+from .board import Board, SYMBOL_CODES, CELL_WEIGHTS
+from .players import Player
+from .tic_tac_toe import TicTacToe
+from .utils import pos_to_xy
+
+N_STATES = 3 ** 9
+# Bit layout of the lookup table entries
+MOVES_MASK = 0x1FF
+VALUE_SHIFT = 9
+REACHABLE_BIT = 1 << 11
+TERMINAL_BIT = 1 << 12
+# Table shipped with the project, loaded by GameSolver.cached
+TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "resources",
+                          "solver.npy")
+
+
+class GameSolver:
+    """
+    Exact Tic Tac Toe solver. It holds, for every board state code and symbol to move, the minimax value of the
+    position for the player to move, its optimal moves and whether the position is reachable in a game.
+    The whole table is computed once and can be saved to, and loaded from, a small .npy file.
+    """
+
+    def __init__(self, table: np.ndarray):
+        """
+        Initializes the solver with a lookup table.
+
+        Parameters
+        ----------
+        table : np.ndarray
+            uint16 array of shape (2, 3^9), indexed by the symbol code to move minus one and the state code.
+            Bits 0-8 hold the optimal moves, bits 9-10 the value plus one, bit 11 the reachable flag and bit 12 the
+            terminal flag.
+        """
+        self.table = table
+
+    @classmethod
+    def build(cls) -> "GameSolver":
+        """
+        Computes the minimax values of every position, from the full boards back to the empty one.
+
+        Returns
+        -------
+        GameSolver
+            The solver with the computed table.
+        """
+        digits = (np.arange(N_STATES)[:, None] // WEIGHTS) % 3
+        filled = (digits != 0).sum(axis=1)
+        won = {code: (digits[:, LINES] == code).all(axis=2).any(axis=1) for code in (1, 2)}
+        terminal = won[1] | won[2] | (filled == 9)
+        values = np.zeros((2, N_STATES), dtype=np.int8)
+        moves = np.zeros((2, N_STATES), dtype=np.uint16)
+        for mover in (1, 2):
+            values[mover - 1, won[mover]] = 1
+            values[mover - 1, won[3 - mover]] = -1
+        # Children have one more filled cell, so their values are known when a level is solved
+        for level in range(8, -1, -1):
+            states = np.flatnonzero((filled == level) & ~terminal)
+            for mover in (1, 2):
+                child_values = np.full((len(states), 9), -2, dtype=np.int8)
+                for cell in range(9):
+                    empty = digits[states, cell] == 0
+                    children = states[empty] + mover * WEIGHTS[cell]
+                    child_values[empty, cell] = -values[2 - mover, children]
+                best = child_values.max(axis=1)
+                values[mover - 1, states] = best
+                optimal = child_values == best[:, None]
+                moves[mover - 1, states] = (optimal * (1 << np.arange(9))).sum(axis=1)
+        reachable = cls._reachable(digits, terminal)
+        table = moves | ((values.astype(np.int16) + 1).astype(np.uint16) << VALUE_SHIFT)
+        table[reachable] |= REACHABLE_BIT
+        table[:, terminal] |= TERMINAL_BIT
+        return cls(table)
+
+    @classmethod
+    def load(cls, path: str) -> "GameSolver":
+        """
+        Loads a solver table saved with save.
+
+        Parameters
+        ----------
+        path : str
+            The path of the .npy file.
+
+        Returns
+        -------
+        GameSolver
+            The solver with the loaded table.
+        """
+        return cls(np.load(path))
+
+    @classmethod
+    def cached(cls, path: str = TABLE_PATH) -> "GameSolver":
+        """
+        Returns the solver of a table file, loaded once per process and then kept in memory. Nothing is written: if
+        the file is missing or invalid, the table is built instead.
+
+        Parameters
+        ----------
+        path : str
+            The path of the .npy file, the table shipped in the resources directory by default.
+
+        Returns
+        -------
+        GameSolver
+            The solver with the loaded or computed table, shared by all the calls with the same path.
+        """
+        return _load_or_build(cls, path)
+
+    def save(self, path: str):
+        """
+        Saves the solver table.
+
+        Parameters
+        ----------
+        path : str
+            The path of the .npy file.
+        """
+        np.save(path, self.table)
+
+    def value(self, state: int, symbol: str) -> int:
+        """
+        Returns the value of a position with perfect play from both players.
+
+        Parameters
+        ----------
+        state : int
+            The board state code.
+        symbol : str
+            The symbol of the player to move.
+
+        Returns
+        -------
+        int
+            1 if the player to move wins, 0 for a draw and -1 if it looses.
+        """
+        return int(self.table[SYMBOL_CODES[symbol] - 1, state] >> VALUE_SHIFT & 0b11) - 1
+
+    def best_moves(self, state: int, symbol: str) -> list:
+        """
+        Returns the optimal moves of a position.
+
+        Parameters
+        ----------
+        state : int
+            The board state code.
+        symbol : str
+            The symbol of the player to move.
+
+        Returns
+        -------
+        list
+            The optimal positions, empty if the game is over.
+        """
+        moves = int(self.table[SYMBOL_CODES[symbol] - 1, state]) & MOVES_MASK
+        return [pos for pos in range(9) if moves & (1 << pos)]
+
+    def reachable_states(self, symbol: str) -> np.ndarray:
+        """
+        Returns the positions reachable in a game where the given symbol has to move and the game is not over.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol of the player to move.
+
+        Returns
+        -------
+        np.ndarray
+            The state codes of the positions.
+        """
+        entries = self.table[SYMBOL_CODES[symbol] - 1]
+        return np.flatnonzero((entries & REACHABLE_BIT != 0) & (entries & TERMINAL_BIT == 0))
+
+    def evaluate_policy(self, model, symbol: str = TicTacToe.SYMBOL_PLAYER2) -> dict:
+        """
+        Compares the greedy moves of a trained model against optimal play on every reachable position where the model
+        has to move, without playing games.
+
+        Parameters
+        ----------
+        model : Player
+            A trained model with a greedy_action method, such as MonteCarloEsControl or QLearning.
+        symbol : str
+            The symbol the model plays with.
+
+        Returns
+        -------
+        dict
+            The number of evaluated states, the states without a known action, the states with an invalid action,
+            the states where the action is optimal, the states where the action worsens the position value (blunders)
+            and the optimal rate over all the evaluated states.
+        """
+        mover = SYMBOL_CODES[symbol]
+        other = 3 - mover
+        report = {"states": 0, "unknown": 0, "invalid": 0, "optimal": 0, "blunders": 0}
+        for state in self.reachable_states(symbol).tolist():
+            report["states"] += 1
+            action = model.greedy_action(state)
+            entry = int(self.table[mover - 1, state])
+            if action is None:
+                report["unknown"] += 1
+            elif (state // CELL_WEIGHTS[action]) % 3 != 0:
+                report["invalid"] += 1
+            elif entry & (1 << action):
+                report["optimal"] += 1
+            else:
+                child = state + mover * CELL_WEIGHTS[action]
+                child_value = 1 - (int(self.table[other - 1, child]) >> VALUE_SHIFT & 0b11)
+                if child_value < (entry >> VALUE_SHIFT & 0b11) - 1:
+                    report["blunders"] += 1
+        report["optimal_rate"] = report["optimal"] / report["states"]
+        return report
+
+    @staticmethod
+    def _reachable(digits: np.ndarray, terminal: np.ndarray) -> np.ndarray:
+        # Walk the games forward from the empty board, with either symbol starting
+        reachable = np.zeros((2, N_STATES), dtype=bool)
+        reachable[:, 0] = True
+        filled = (digits != 0).sum(axis=1)
+        for level in range(9):
+            for mover in (1, 2):
+                states = np.flatnonzero(reachable[mover - 1] & (filled == level) & ~terminal)
+                for cell in range(9):
+                    children = states[digits[states, cell] == 0] + mover * WEIGHTS[cell]
+                    reachable[2 - mover, children] = True
+        return reachable
+
+
+@lru_cache(maxsize=None)
+def _load_or_build(solver_type: type, path: str) -> GameSolver:
+    try:
+        table = np.load(path)
+        if table.shape == (2, N_STATES) and table.dtype == np.uint16:
+            return solver_type(table)
+    except (OSError, ValueError):
+        pass
+    return solver_type.build()
+
+
+class PerfectPlayer(Player):
+    """
+    A class to represent a player making optimal moves, chosen randomly among the optimal ones.
+    """
+
+    def __init__(self, symbol: str = TicTacToe.SYMBOL_PLAYER2, solver: GameSolver = None):
+        """
+        Initializes the perfect player.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol the player plays with.
+        solver : GameSolver, optional
+            The solver with the optimal moves. The cached table is used if not given.
+        """
+        self.symbol = symbol
+        self.solver = GameSolver.cached() if solver is None else solver
+
+    def new_game(self):
+        """
+        Notifies a message indicating the perfect player starts a new game.
+        """
+        self.notify("Perfect player participates in a new game")
+
+    def start(self):
+        """
+        Notifies a message indicating the perfect player starts the game.
+        """
+        self.notify("Perfect player starts")
+
+    def turn(self, board: Board) -> (int, int):
+        """
+        Randomly selects one of the optimal moves and returns the coordinates.
+
+        Parameters
+        ----------
+        board : Board
+            The current state of the game board.
+
+        Returns
+        -------
+        tuple
+            The (x, y) coordinates of the chosen position.
+        """
+        return pos_to_xy(random.choice(self.solver.best_moves(board.state, self.symbol)))
+
+    def invalid_position(self):
+        """
+        The perfect player shouldn't choose an invalid position, so this method raise an exception.
+        """
+        raise ValueError("Perfect player choose an invalid position")
+
+    def win(self):
+        """
+        Notifies a message indicating the perfect player has won.
+        """
+        self.notify("Perfect player won")
+
+    def loose(self):
+        """
+        Notifies a message indicating the perfect player has lost.
+        """
+        self.notify("Perfect player loose")
+
+    def draw(self):
+        """
+        Notifies a message indicating the game is a draw.
+        """
+        self.notify("Perfect player Draw")
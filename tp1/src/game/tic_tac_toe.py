@@ -1,18 +1,19 @@
 import random
 
 from .board import Board
+from .events import DEFAULT_OBSERVERS
 from .players import Player
 
 
 class TicTacToe:
     """
-    Tic Tac Toe game class.
+    Tic Tac Toe game class, played on the board given, of any width, height and number of symbols in a row to win.
     """
 
     SYMBOL_PLAYER1 = "X"
     SYMBOL_PLAYER2 = "O"
 
-    def __init__(self, player1: Player, player2: Player, board: Board = Board()):
+    def __init__(self, player1: Player, player2: Player, board: Board = None, observers: list = None):
         """
         Constructs all the necessary attributes for the Tic Tac Toe game.
 
@@ -23,9 +24,13 @@ class TicTacToe:
         player2 : Player
             The second player.
         board : Board, optional
-            The game board. A new default Board is created if not given.
+            The game board. A new 3x3 Board is created if not given.
+        observers : list, optional
+            The GameObserver instances notified of the game events. The console output is used if not given, an
+            empty list makes the game quiet.
         """
-        self.board = board
+        self.board = Board() if board is None else board
+        self.observers = DEFAULT_OBSERVERS if observers is None else tuple(observers)
         self.player1 = player1
         self.player2 = player2
 
@@ -34,7 +39,7 @@ class TicTacToe:
         Starts a new game of Tic Tac Toe. Randomly selects which player starts first.
         Alternates turns between players until the board is full or a player wins.
         """
-        print("New Game")
+        self.notify("New Game")
         self.player1.new_game()
         self.player2.new_game()
         player2_turn = random.choice([False, True])
@@ -46,7 +51,8 @@ class TicTacToe:
             if player2_turn:
                 pos_x, pos_y = self.player_play(self.player2)
                 self.board.place_symbol(self.SYMBOL_PLAYER2, pos_x, pos_y)
-                self.board.print()
+                for observer in self.observers:
+                    observer.on_board(self.board)
                 if self.board.is_winner(self.SYMBOL_PLAYER2):
                     self.player2.win()
                     self.player1.loose()
@@ -54,7 +60,8 @@ class TicTacToe:
             else:
                 pos_x, pos_y = self.player_play(self.player1)
                 self.board.place_symbol(self.SYMBOL_PLAYER1, pos_x, pos_y)
-                self.board.print()
+                for observer in self.observers:
+                    observer.on_board(self.board)
                 if self.board.is_winner(self.SYMBOL_PLAYER1):
                     self.player1.win()
                     self.player2.loose()
@@ -63,6 +70,18 @@ class TicTacToe:
         self.player1.draw()
         self.player2.draw()
 
+    def notify(self, message: str):
+        """
+        Sends a message to the game observers.
+
+        Parameters
+        ----------
+        message : str
+            The message text.
+        """
+        for observer in self.observers:
+            observer.on_message(message)
+
     def player_play(self, player: Player):
         """
         Handle the player's turn. Get the player's move and check the validity.
@@ -77,12 +96,14 @@ class TicTacToe:
 
     def random_board(self):
         """
-        Generates a random board state for Tic Tac Toe.
+        Generates a random board state for Tic Tac Toe, using the same board implementation and size as the current one.
         """
         player2_turn = random.choice([True, False])
+        board_type = type(self.board)
+        width, height, k = self.board.width, self.board.height, self.board.k
         while True:
-            self.board = Board()
-            for _ in range(0, random.randrange(0, 9)):
+            self.board = board_type(width, height, k)
+            for _ in range(0, random.randrange(0, width * height)):
                 empty_spots = self.board.get_empty_spots()
                 pos_x, pos_y = empty_spots.pop(random.randrange(len(empty_spots)))
                 symbol = self.SYMBOL_PLAYER2 if player2_turn else self.SYMBOL_PLAYER1
@@ -1,19 +1,246 @@
-from .board import Board
+from functools import lru_cache
 
+import numpy as np
 
-def board_to_index(board: Board):
-    index = ""
-    for i in range(3):
-        for j in range(3):
-            index += board.grid[i][j]
-    return index
+from .board import Board, SYMBOL_CODES, CELL_WEIGHTS
 
 
-def pos_to_xy(pos: int):
-    pos_x = pos % 3
-    pos_y = int(pos / 3)
+def _symmetry(pos: int, transform: int) -> int:
+    # Rotate the cell a quarter turn clockwise transform % 4 times, then mirror it horizontally if transform >= 4
+    pos_x, pos_y = pos % 3, pos // 3
+    for _ in range(transform % 4):
+        pos_x, pos_y = 2 - pos_y, pos_x
+    if transform >= 4:
+        pos_x = 2 - pos_x
+    return pos_x + pos_y * 3
+
+
+# The 8 symmetries of the board. SYMMETRIES[t][pos] is the cell where transform t moves the cell pos, and
+# INVERSE_SYMMETRIES[t] undoes it. Transform 0 is the identity.
+SYMMETRIES = tuple(tuple(_symmetry(pos, transform) for pos in range(9)) for transform in range(8))
+INVERSE_SYMMETRIES = tuple(tuple(symmetry.index(pos) for pos in range(9)) for symmetry in SYMMETRIES)
+
+
+def board_to_index(board: Board) -> int:
+    return board.state
+
+
+def legacy_index_to_state(index: str) -> int:
+    state = 0
+    for pos, symbol in enumerate(index):
+        if symbol != " ":
+            state += SYMBOL_CODES[symbol] * CELL_WEIGHTS[pos]
+    return state
+
+
+def state_to_board(state: int, width: int = 3, height: int = 3, k: int = 3) -> Board:
+    """
+    Builds the board of a state code.
+
+    Parameters
+    ----------
+    state : int
+        The base-3 state code of the board.
+    width : int
+        The number of columns of the board.
+    height : int
+        The number of rows of the board.
+    k : int
+        The number of symbols in a row needed to win.
+
+    Returns
+    -------
+    Board
+        A new board with the symbols of the state.
+    """
+    board = Board(width, height, k)
+    for pos in range(width * height):
+        digit = state // board.weights[pos] % 3
+        if digit:
+            board.place_symbol("X" if digit == SYMBOL_CODES["X"] else "O", *pos_to_xy(pos, width))
+    return board
+
+
+@lru_cache(maxsize=None)
+def symmetry_tables():
+    """
+    Builds, once, the canonicalization tables of every board state code.
+    The canonical representative of a board is the smallest state code among its 8 symmetries.
+
+    Returns
+    -------
+    tuple
+        The canonical state code of every state, the transform mapping every state to its canonical state, and the
+        (8, 9) arrays with the forward and inverse cell permutations of each transform.
+    """
+    weights = np.array(CELL_WEIGHTS, dtype=np.int64)
+    states = np.arange(3 ** 9, dtype=np.int64)
+    digits = (states[:, None] // weights) % 3
+    forward = np.array(SYMMETRIES)
+    inverse = np.array(INVERSE_SYMMETRIES)
+    # The digit of cell pos moves to cell forward[t][pos], so the transformed board takes its cell c from inverse[t][c]
+    transformed = np.stack([digits[:, inverse[transform]] @ weights for transform in range(8)], axis=1)
+    transforms = transformed.argmin(axis=1)
+    canonical_states = transformed[states, transforms]
+    return canonical_states, transforms, forward, inverse
+
+
+@lru_cache(maxsize=1 << 16)
+def legal_actions(state: int, n_cells: int = 9) -> tuple:
+    """
+    Returns the empty cells of a board state code, the only actions a player can take. A canonical state code gives
+    the legal actions in the canonical board frame.
+
+    Parameters
+    ----------
+    state : int
+        The board state code.
+    n_cells : int
+        The number of cells of the board.
+
+    Returns
+    -------
+    tuple
+        The empty positions, in increasing order.
+    """
+    return tuple(pos for pos in range(n_cells) if state // 3 ** pos % 3 == 0)
+
+
+@lru_cache(maxsize=None)
+def legal_mask_table() -> np.ndarray:
+    """
+    Builds, once, the legal actions mask of every 3x3 board state code.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of shape (3^9, 9), True for the empty cells of each state.
+    """
+    weights = np.array(CELL_WEIGHTS, dtype=np.int64)
+    return (np.arange(3 ** 9, dtype=np.int64)[:, None] // weights) % 3 == 0
+
+
+def canonicalize(state: int):
+    """
+    Maps a board state code to the canonical representative of its symmetries.
+
+    Parameters
+    ----------
+    state : int
+        The board state code.
+
+    Returns
+    -------
+    tuple
+        The canonical state code and the transform mapping the board to it.
+    """
+    canonical_states, transforms, _, _ = symmetry_tables()
+    return int(canonical_states[state]), int(transforms[state])
+
+
+def transform_action(action: int, transform: int) -> int:
+    """
+    Maps a position of a board to the position in the transformed board. Positions outside the board are kept.
+
+    Parameters
+    ----------
+    action : int
+        The position in the board.
+    transform : int
+        The symmetry transform.
+
+    Returns
+    -------
+    int
+        The position in the transformed board.
+    """
+    return SYMMETRIES[transform][action] if 0 <= action < 9 else action
+
+
+def inverse_transform_action(action: int, transform: int) -> int:
+    """
+    Maps a position of a transformed board back to the position in the original board. Positions outside the board
+    are kept.
+
+    Parameters
+    ----------
+    action : int
+        The position in the transformed board.
+    transform : int
+        The symmetry transform.
+
+    Returns
+    -------
+    int
+        The position in the original board.
+    """
+    return INVERSE_SYMMETRIES[transform][action] if 0 <= action < 9 else action
+
+
+def predict_from_tables(states, lookup, symmetry: bool, return_q_values: bool):
+    """
+    Looks up the greedy actions, and optionally the Q-values, of a batch of board state codes, mapping them through
+    the board symmetries if the tables are keyed by canonical states.
+
+    Parameters
+    ----------
+    states : array_like
+        The board state codes.
+    lookup : callable
+        Function returning, for an array of table keys, the greedy action of each key (-1 if unknown) and the (n, 9)
+        Q-values of each key (NaN if unknown).
+    symmetry : bool
+        If True, the tables are keyed by canonical state codes and their actions are in the canonical board frame.
+    return_q_values : bool
+        If True, the Q-values of the states are returned too.
+
+    Returns
+    -------
+    np.ndarray or tuple
+        The greedy action of each state (-1 if unknown), and the (n, 9) Q-values of each state in its board frame.
+    """
+    states = np.asarray(states, dtype=np.int64)
+    if not symmetry:
+        actions, q_values = lookup(states)
+        return (actions, q_values) if return_q_values else actions
+    canonical_states, transforms, forward, inverse = symmetry_tables()
+    transforms = transforms[states]
+    actions, q_values = lookup(canonical_states[states])
+    on_board = (actions >= 0) & (actions < 9)
+    actions[on_board] = inverse[transforms[on_board], actions[on_board]]
+    if not return_q_values:
+        return actions
+    # The value of a board position is the value of the position it moves to in the canonical board
+    return actions, np.take_along_axis(q_values, forward[transforms], axis=1)
+
+
+def q_values_array(q_values: dict) -> np.ndarray:
+    """
+    Builds a dense array from Q-values keyed by state code and action.
+
+    Parameters
+    ----------
+    q_values : dict
+        The Q-values, a dict of dicts with the values of each state by action. Positions outside the board are skipped.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (3^9, 9) with the Q-values, NaN for the missing ones.
+    """
+    array = np.full((3 ** 9, 9), np.nan)
+    for index, values in q_values.items():
+        for action, q_value in values.items():
+            if 0 <= action < 9:
+                array[index, action] = q_value
+    return array
+
+
+def pos_to_xy(pos: int, width: int = 3):
+    pos_x = pos % width
+    pos_y = pos // width
     return pos_x, pos_y
 
 
-def xy_to_pos(pos_x: int, pos_y: int):
-    return pos_x + pos_y * 3
+def xy_to_pos(pos_x: int, pos_y: int, width: int = 3):
+    return pos_x + pos_y * width
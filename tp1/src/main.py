@@ -4,47 +4,117 @@ You can play against a bot, a Monte Carlo model, or another human player.
 It also allows you to train a Monte Carlo or a Q-learning model using reinforcement learning.
 
 Usage:
-    main.py play --games=<number_of_games> [--bot] [--model-file=<model-file>] [--human]
-    main.py train --model=<model-type> --episodes=<number_of_episodes>
+    main.py play --games=<number_of_games> [--bot] [--model-file=<model-file>] [--human] [--perfect]
+                 [--board-size=<size>]
+    main.py play --games=<number_of_games> --server=<address>
+    main.py train --model=<model-type> --episodes=<number_of_episodes> [--board=<board-type>] [--board-size=<size>]
+                  [--backend=<backend>] [--batch-size=<batch-size> | --workers=<workers>] [--seed=<seed>]
+                  [--opponent=<opponent>] [--symmetry] [--plot-format=<format>] [--profile] [--timings]
+                  [--checkpoint-episodes=<episodes>] [--checkpoint-minutes=<minutes>]
+                  [--replay-capacity=<transitions>] [--replay-batch=<transitions>] [--n-step=<steps>]
+                  [--trace-decay=<lambda>] [--exact-evaluation] [--no-history]
+    main.py train --resume=<checkpoint-file> [--plot-format=<format>] [--profile] [--timings] [--exact-evaluation]
+    main.py plot --metrics-file=<metrics-file> [--plot-format=<format>]
+    main.py bench [--output=<output-file>] [--quick] [--baseline=<baseline-file>]
+    main.py serve --model-file=<model-file> [--address=<address>]
+    main.py plan
 
 Options:
     -h --help                       Show this screen.
+    --address=<address>             The address the game server listens on: <host>:<port> for TCP or unix:<path> for
+                                    a Unix socket. [default: 127.0.0.1:8765]
+    --backend=<backend>             Q-values storage of the q-learning model. Valid options are: dict or numpy.
+                                    [default: dict]
+    --baseline=<baseline-file>      Compare the benchmarks with a previous JSON report and fail on regressions.
+    --batch-size=<batch-size>       Train with the headless batch environment, playing this number of games at once.
+    --board=<board-type>            The board implementation used for training. Valid options are: list or bitboard.
+                                    [default: list]
+    --board-size=<size>             The board size as <width>x<height>x<k>, k being the number of symbols in a row
+                                    needed to win. Other sizes than 3x3x3 are only supported by sequential training
+                                    of dict models without symmetry, against the bot. [default: 3x3x3]
     --bot                           Play against a bot.
+    --checkpoint-episodes=<episodes>
+                                    Save a checkpoint of the training every this number of episodes.
+    --checkpoint-minutes=<minutes>  Save a checkpoint of the training every this number of minutes.
     --episodes=<number_of_episodes> Number of episodes to train the Monte Carlo model.
+    --exact-evaluation              Show the exact win, draw and loss probabilities of the model against the bot in
+                                    the training progress. Only for 3x3x3 boards.
     --games=<number_of_games>       Number of games to play.
     --human                         Play against another human player.
     --model-file=<model-file>       Play against a trained model.
     --model=<model_type>            The type of model to train. Valid options are: monte-carlo or q-learning.
+    --metrics-file=<metrics-file>   Regenerate the plots of the training metrics saved in this file.
+    --output=<output-file>          Write the benchmarks JSON report to this file instead of the standard output.
+    --n-step=<steps>                Number of rewards of the q-learning returns, 1 being the one-step update.
+                                    Only for sequential training. [default: 1]
+    --opponent=<opponent>           The opponent of the model during training. Valid options are: bot or perfect.
+                                    [default: bot]
+    --no-history                    Keep only the rolling window of the training metrics, so memory doesn't grow
+                                    with the episodes. The metrics file and the plots aren't saved.
+    --perfect                       Play against a perfect player.
+    --plot-format=<format>          Save the training plots to files instead of showing them. Valid options are: png,
+                                    svg or csv.
+    --profile                       Profile the training with cProfile, print the slowest functions and save the stats.
+    --quick                         Run the benchmarks with fewer repetitions.
+    --replay-batch=<transitions>    Number of transitions learnt from the replay buffer after every episode.
+                                    [default: 64]
+    --replay-capacity=<transitions> Train the q-learning model from a replay buffer keeping this number of
+                                    transitions, only with the numpy backend and without --batch-size.
+    --resume=<checkpoint-file>      Resume the training saved in a checkpoint file, with its options.
+    --seed=<seed>                   Seed of the random generators used for training.
+    --server=<address>              Play against the model of a game server at this address.
+    --symmetry                      Share the learnt values among the rotations and reflections of each board.
+    --timings                       Time the training phases and print their breakdown at the end.
+    --trace-decay=<lambda>          Update the q-learning values with Watkins Q(lambda) eligibility traces decaying
+                                    with this lambda. Only for sequential training.
+    --workers=<workers>             Collect training episodes in this number of worker processes.
 """
 
-import os
+import json
 import pickle
+import random
 import sys
-from contextlib import contextmanager
+import time
 from datetime import datetime
 
 from docopt import docopt
-from tqdm import tqdm
 
+from game.bit_board import BitBoard
+from game.checkpoint import Checkpointer, load_checkpoint
+from game.evaluation import exact_outcomes, format_outcomes
 from game.board import Board
+from game.metrics import TrainingMetrics
 from game.monte_carlo import MonteCarloEsControl
+from game.persistence import load_model, export_model
+from game.planner import ValueIterationPlanner
 from game.players import BotPlayer, UserPlayer
+from game.profiling import PhaseTimers
 from game.q_learning import QLearning
+from game.solver import PerfectPlayer
 from game.tic_tac_toe import TicTacToe
 
+# Modules slow to import (tqdm, matplotlib, multiprocessing, asyncio, the profiler and the benchmarks) are imported by
+# the commands using them, so short commands such as play start fast
 
-@contextmanager
-def suppress_stdout():
-    """
-    Context manager to suppress standard output.
-    """
-    with open(os.devnull, 'w') as devnull:
-        old_stdout = sys.stdout
-        sys.stdout = devnull
-        try:
-            yield
-        finally:
-            sys.stdout = old_stdout
+# Moving average window of the training plots
+PLOT_EPISODES = 100
+METRICS_SUFFIX = '-metrics.npz'
+CHECKPOINT_SUFFIX = '.ckpt'
+# Options of a training run, saved in its checkpoints to resume it
+TRAINING_OPTIONS = ('--model', '--episodes', '--board', '--board-size', '--backend', '--batch-size', '--workers',
+                    '--seed', '--opponent', '--symmetry', '--checkpoint-episodes', '--checkpoint-minutes',
+                    '--replay-capacity', '--replay-batch', '--n-step', '--trace-decay', '--no-history')
+# Number of functions printed by --profile, and board methods timed by --timings
+PROFILE_FUNCTIONS = 30
+BOARD_METHODS = ('place_symbol', 'is_winner', 'is_full', 'get_empty_spots')
+
+# Width, height and number of symbols in a row to win of the classic game
+DEFAULT_BOARD_SIZE = (3, 3, 3)
+
+BOARD_TYPES = {
+    'list': Board,
+    'bitboard': BitBoard
+}
 
 
 def play(args: dict):
@@ -55,19 +125,30 @@ def play(args: dict):
         args (dict): Command line arguments.
     """
     player_1 = UserPlayer()
+    if args['--server']:
+        from game.server import GameClient
+        client = GameClient(args['--server'])
+        try:
+            for _ in range(int(args['--games'])):
+                player_1.play_remote(client)
+        finally:
+            client.close()
+        return
+    board_size = parse_board_size(args['--board-size'])
     if args['--bot']:
         player_2 = BotPlayer()
     elif args['--model-file']:
-        with open(args['--model-file'], 'rb') as file:
-            # noinspection PyTypeChecker
-            model_player = pickle.load(file)
-        player_2 = model_player
+        player_2 = load_model(args['--model-file'])
     elif args['--human']:
         player_2 = UserPlayer()
+    elif args['--perfect']:
+        if board_size != DEFAULT_BOARD_SIZE:
+            raise RuntimeError('The perfect player only plays 3x3x3 boards')
+        player_2 = PerfectPlayer(symbol=TicTacToe.SYMBOL_PLAYER2)
     else:
         raise RuntimeError('Invalid run mode')
     for _ in range(int(args['--games'])):
-        board = Board()
+        board = Board(*board_size)
         game = TicTacToe(player_1, player_2, board)
         game.start()
 
@@ -79,39 +160,437 @@ def train(args: dict):
     Args:
         args (dict): Command line arguments.
     """
-    if args['--model'] == 'monte-carlo':
-        model_player = MonteCarloEsControl()
-        random_start = True
-    elif args['--model'] == 'q-learning':
-        model_player = QLearning()
-        random_start = False
+    name = 'model-' + datetime.now().strftime('%Y_%m_%d-%H_%M_%S')
+    if args['--resume']:
+        model_player, state = load_checkpoint(args['--resume'])
+        # The run continues with its own options, only the reporting ones come from the command line
+        args = dict(args, **state['options'])
+        checkpoint_path = args['--resume']
+    else:
+        model_player = create_model(args)
+        if args['--no-history']:
+            model_player.metrics = TrainingMetrics(keep_history=False)
+        state = None
+        checkpoint_path = name + CHECKPOINT_SUFFIX
+    if args['--board'] not in BOARD_TYPES:
+        raise RuntimeError('Invalid board')
+    if args['--opponent'] == 'bot':
+        opponent = BotPlayer()
+    elif args['--opponent'] == 'perfect':
+        if args['--batch-size'] or args['--workers']:
+            raise RuntimeError('The perfect opponent is only available for sequential training')
+        opponent = PerfectPlayer(symbol=TicTacToe.SYMBOL_PLAYER1)
     else:
-        raise RuntimeError('Invalid model')
+        raise RuntimeError('Invalid opponent')
+    board_type = BOARD_TYPES[args['--board']]
+    board_size = parse_board_size(args['--board-size'])
+    if board_size != DEFAULT_BOARD_SIZE and (args['--batch-size'] or args['--workers'] or args['--symmetry']
+                                             or args['--backend'] == 'numpy' or args['--opponent'] != 'bot'):
+        raise RuntimeError('Boards other than 3x3x3 are only supported by sequential training of dict models without '
+                           'symmetry, against the bot')
+    evaluate = args['--exact-evaluation']
+    if evaluate and board_size != DEFAULT_BOARD_SIZE:
+        raise RuntimeError('The exact evaluation is only available for 3x3x3 boards')
+    random_start = isinstance(model_player, MonteCarloEsControl)
     model_player.set_train(True)
-    bot_player = BotPlayer()
     total_episodes = int(args['--episodes'])
-    update_episodes = int(total_episodes / 100)
-    pbar = tqdm(range(total_episodes))
+    update_episodes = max(1, int(total_episodes / 100))
+    # Progress is averaged over the rolling window of the metrics
+    model_player.metrics.set_window(update_episodes)
+    seed = None if args['--seed'] is None else int(args['--seed'])
+    if state is not None:
+        random.setstate(state['random'])
+    elif seed is not None:
+        random.seed(seed)
+    checkpointer = None
+    if args['--checkpoint-episodes'] or args['--checkpoint-minutes']:
+        checkpointer = Checkpointer(
+            checkpoint_path, model_player,
+            every_episodes=int(args['--checkpoint-episodes']) if args['--checkpoint-episodes'] else None,
+            every_minutes=float(args['--checkpoint-minutes']) if args['--checkpoint-minutes'] else None,
+            options={option: args[option] for option in TRAINING_OPTIONS})
+    # Nothing is timed or profiled unless asked, so the options don't slow down normal runs
+    timers = PhaseTimers() if args['--timings'] else None
+    profiler = None
+    if args['--profile']:
+        import cProfile
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    if args['--batch-size']:
+        train_batch(model_player, total_episodes, update_episodes, int(args['--batch-size']), seed, timers,
+                    checkpointer, state, evaluate)
+    elif args['--workers']:
+        train_parallel(model_player, total_episodes, update_episodes, int(args['--workers']), seed or 0, board_type,
+                       random_start, timers, checkpointer, state, evaluate)
+    else:
+        train_games(model_player, opponent, total_episodes, update_episodes, board_type, random_start, timers,
+                    checkpointer, state, board_size, evaluate)
+    if profiler is not None:
+        profiler.disable()
+        print_profile(profiler, name + '.prof')
+    if timers is not None:
+        print(timers.report(time.perf_counter() - start))
+        timers.unwrap_all()
+    model_player.set_train(False)
+    model_player.set_observers()
+    if evaluate:
+        print(f'Exact outcomes against the bot: {format_outcomes(exact_outcomes(model_player))}')
+        planner = ValueIterationPlanner()
+        planner.solve()
+        print(f'Value iteration planner reference: {format_outcomes(exact_outcomes(planner.to_model()))}')
+    if board_size == DEFAULT_BOARD_SIZE:
+        export_model(model_player, name + '.model')
+    else:
+        # Binary model files hold 3x3 boards, models of other sizes are pickled
+        with open(name + '.pkl', 'wb') as file:
+            pickle.dump(model_player, file)
+    if args['--no-history']:
+        return
+    model_player.metrics.save(name + METRICS_SUFFIX)
+    # Plot the training results
+    show_plots(model_player.metrics, name, args['--plot-format'])
+
+
+def parse_board_size(size: str) -> tuple:
+    """
+    Parse a board size.
+
+    Args:
+        size (str): The board size as <width>x<height>x<k>.
+
+    Returns:
+        tuple: The width, the height and the number of symbols in a row needed to win.
+    """
+    try:
+        width, height, k = (int(value) for value in size.lower().split('x'))
+    except ValueError:
+        raise RuntimeError(f'Invalid board size: {size}')
+    return width, height, k
+
+
+def create_model(args: dict):
+    """
+    Create the model to train.
+
+    Args:
+        args (dict): Command line arguments.
+
+    Returns:
+        Player: The new model.
+    """
+    if args['--model'] == 'monte-carlo':
+        return MonteCarloEsControl(symmetry=args['--symmetry'])
+    elif args['--model'] == 'q-learning':
+        if args['--replay-capacity'] and (args['--backend'] != 'numpy' or args['--batch-size']):
+            raise RuntimeError('The replay buffer is only supported by the numpy backend, without --batch-size')
+        if (int(args['--n-step']) > 1 or args['--trace-decay']) and (args['--batch-size'] or args['--workers']):
+            raise RuntimeError('n-step returns and eligibility traces are only supported by sequential training')
+        return QLearning(backend=args['--backend'], symmetry=args['--symmetry'],
+                         replay_capacity=int(args['--replay-capacity']) if args['--replay-capacity'] else None,
+                         replay_batch_size=int(args['--replay-batch']), n_step=int(args['--n-step']),
+                         trace_decay=float(args['--trace-decay']) if args['--trace-decay'] else None)
+    raise RuntimeError('Invalid model')
+
+
+def print_profile(profiler, path: str):
+    """
+    Print the functions with the highest cumulative time and save the profile stats.
+
+    Args:
+        profiler (cProfile.Profile): The profiler of the run.
+        path (str): The path of the stats file, readable with pstats or snakeviz.
+    """
+    import pstats
+    stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(PROFILE_FUNCTIONS)
+    stats.dump_stats(path)
+    print(f"Saved {path}")
+
+
+def plot(args: dict):
+    """
+    Regenerate the training plots from a saved metrics file.
+
+    Args:
+        args (dict): Command line arguments.
+    """
+    path = args['--metrics-file']
+    prefix = path[:-len(METRICS_SUFFIX)] if path.endswith(METRICS_SUFFIX) else path.rsplit('.', 1)[0]
+    show_plots(TrainingMetrics.load(path), prefix, args['--plot-format'])
+
+
+def show_plots(metrics: TrainingMetrics, prefix: str, plot_format: str = None):
+    """
+    Show the training plots, or save them to files if a format is given.
+
+    Args:
+        metrics (TrainingMetrics): The training metrics.
+        prefix (str): The path prefix of the plot files.
+        plot_format (str): The format of the plot files, None to show the plots.
+    """
+    from game.plots import learning_curves, plot_curve, save_plots
+    if plot_format is None:
+        curves = learning_curves(metrics, PLOT_EPISODES)
+        for curve, values in curves.items():
+            plot_curve(values, curve, PLOT_EPISODES)
+    else:
+        for path in save_plots(metrics, prefix, plot_format, PLOT_EPISODES):
+            print(f"Saved {path}")
+
+
+def train_games(model_player, opponent, total_episodes: int, update_episodes: int, board_type, random_start: bool,
+                timers: PhaseTimers = None, checkpointer: Checkpointer = None, state: dict = None,
+                board_size: tuple = DEFAULT_BOARD_SIZE, evaluate: bool = False):
+    """
+    Train the model playing one TicTacToe game per episode against the opponent.
+
+    Args:
+        model_player (Player): The model to train.
+        opponent (Player): The opponent of the model.
+        total_episodes (int): Number of episodes to train.
+        update_episodes (int): Number of episodes between progress updates.
+        board_type (type): The board implementation.
+        random_start (bool): Whether games start from a random board.
+        timers (PhaseTimers): The timers of the training phases, None to not time them.
+        checkpointer (Checkpointer): The checkpointer of the run, None to not save checkpoints.
+        state (dict): The training state of the checkpoint to resume from, None to start a new run.
+        board_size (tuple): The width, height and number of symbols in a row to win of the boards.
+        evaluate (bool): Whether to show the exact outcome probabilities of the model in the progress.
+    """
+    from tqdm import tqdm
+    # Training games are quiet, no observers are attached
+    opponent.set_observers([])
+    model_player.set_observers([])
+    start_episode = 0 if state is None else state['episodes']
+    pbar = tqdm(range(start_episode, total_episodes), initial=start_episode, total=total_episodes)
+    if timers is not None:
+        timers.wrap(model_player, ('turn',), 'turn')
+        timers.wrap(model_player, ('win', 'loose', 'draw'), 'terminal updates')
+        timers.wrap(opponent, ('turn',), 'opponent turn')
+        timers.wrap(pbar, ('set_description',), 'progress')
+        board_type = timers.timed_type(board_type, BOARD_METHODS, 'board')
     for episode in pbar:
         try:
-            with suppress_stdout():  # Suppress console output
-                game = TicTacToe(bot_player, model_player, Board())
-                if random_start:
-                    game.random_board()
-                game.start()
+            game = TicTacToe(opponent, model_player, board_type(*board_size), observers=[])
+            if random_start:
+                game.random_board()
+            game.start()
         except RuntimeWarning:
             pass
         if episode % update_episodes == 0:
-            pbar.set_description(f"Episode {episode} |"
-                                 f" Average reward: {model_player.get_average_reward(episodes=update_episodes)} |"
-                                 f" Average success rate: {model_player.get_success_rate(episodes=update_episodes)}")
-    model_player.set_train(False)
-    # Plot the training results
-    model_player.plot_rewards(episodes=100)
-    model_player.plot_success_rate(episodes=100)
-    with open('model-' + datetime.now().strftime('%Y_%m_%d-%H_%M_%S') + '.pkl', 'wb') as file:
-        # noinspection PyTypeChecker
-        pickle.dump(model_player, file)
+            pbar.set_description(progress_description(model_player, episode, update_episodes, evaluate))
+        # Checked after every episode, so checkpoints are written every period, even below the progress updates
+        if checkpointer is not None and checkpointer.due(episode + 1):
+            checkpointer.write({'episodes': episode + 1, 'random': random.getstate()})
+
+
+def train_batch(model_player, total_episodes: int, update_episodes: int, batch_size: int, seed: int = None,
+                timers: PhaseTimers = None, checkpointer: Checkpointer = None, state: dict = None,
+                evaluate: bool = False):
+    """
+    Train the model with the headless batch environment, playing many games against the bot at once.
+
+    Args:
+        model_player (Player): The model to train.
+        total_episodes (int): Number of episodes to train.
+        update_episodes (int): Number of episodes between progress updates.
+        batch_size (int): Number of games played at once.
+        seed (int): Seed of the random generator.
+        timers (PhaseTimers): The timers of the training phases, None to not time them.
+        checkpointer (Checkpointer): The checkpointer of the run, None to not save checkpoints.
+        state (dict): The training state of the checkpoint to resume from, None to start a new run.
+        evaluate (bool): Whether to show the exact outcome probabilities of the model in the progress.
+    """
+    from tqdm import tqdm
+    from game.batch_training import BatchMonteCarloTrainer, BatchQLearningTrainer
+    if isinstance(model_player, MonteCarloEsControl):
+        trainer = BatchMonteCarloTrainer(model_player, n_games=batch_size, seed=seed)
+    else:
+        trainer = BatchQLearningTrainer(model_player, n_games=batch_size, seed=seed)
+    start_episode = 0
+    if state is not None:
+        trainer.set_random_state(state['numpy_random'])
+        start_episode = state['episodes']
+    pbar = tqdm(initial=start_episode, total=total_episodes)
+    if timers is not None:
+        timers.wrap(trainer, ('_choose_actions',), 'turn')
+        timers.wrap(trainer, ('_learn', '_record'), 'updates')
+        timers.wrap(trainer.env, ('step', 'reset'), 'board')
+        timers.wrap(pbar, ('update', 'set_description'), 'progress')
+    chunk = chunk_episodes(update_episodes, checkpointer)
+    for episode in range(start_episode, total_episodes, chunk):
+        episodes = min(chunk, total_episodes - episode)
+        trainer.train(episodes)
+        pbar.update(episodes)
+        # Chunks may be shorter than the progress updates to check the checkpoints more often
+        if (episode + episodes) % update_episodes < episodes or episode + episodes == total_episodes:
+            if evaluate:
+                # The model tables are only up to date after a sync
+                trainer.sync()
+            pbar.set_description(progress_description(model_player, episode + episodes, update_episodes, evaluate))
+        if checkpointer is not None and checkpointer.due(episode + episodes):
+            trainer.sync()
+            checkpointer.write({'episodes': episode + episodes, 'random': random.getstate(),
+                                'numpy_random': trainer.random_state()})
+    pbar.close()
+    trainer.sync()
+
+
+def train_parallel(model_player, total_episodes: int, update_episodes: int, workers: int, seed: int, board_type,
+                   random_start: bool, timers: PhaseTimers = None, checkpointer: Checkpointer = None,
+                   state: dict = None, evaluate: bool = False):
+    """
+    Train the model collecting the episodes in a pool of worker processes.
+
+    Args:
+        model_player (Player): The model to train.
+        total_episodes (int): Number of episodes to train.
+        update_episodes (int): Number of episodes between progress updates.
+        workers (int): Number of worker processes.
+        seed (int): Base seed of the workers random generators.
+        board_type (type): The board implementation.
+        random_start (bool): Whether games start from a random board.
+        timers (PhaseTimers): The timers of the training phases, None to not time them.
+        checkpointer (Checkpointer): The checkpointer of the run, None to not save checkpoints.
+        state (dict): The training state of the checkpoint to resume from, None to start a new run.
+        evaluate (bool): Whether to show the exact outcome probabilities of the model in the progress.
+    """
+    from tqdm import tqdm
+    from game.parallel import ParallelTrainer
+    trainer = ParallelTrainer(model_player, workers, seed, board_type=board_type, random_start=random_start)
+    start_episode = 0
+    if state is not None:
+        # Worker seeds depend on the round, so the resumed rounds don't replay the same episodes
+        trainer.rounds = state['rounds']
+        start_episode = state['episodes']
+    pbar = tqdm(initial=start_episode, total=total_episodes)
+    if timers is not None:
+        # The model is pickled for the workers, so only the trainer is timed: rounds include the snapshots, the
+        # episodes played by the workers and the merge of their experience
+        timers.wrap(trainer, ('_train_round',), 'rounds')
+        timers.wrap(trainer, ('_snapshot',), 'snapshot')
+        timers.wrap(trainer.pool, ('map',), 'workers')
+        timers.wrap(pbar, ('update', 'set_description'), 'progress')
+    try:
+        chunk = chunk_episodes(update_episodes, checkpointer)
+        for episode in range(start_episode, total_episodes, chunk):
+            episodes = min(chunk, total_episodes - episode)
+            trainer.train(episodes)
+            pbar.update(episodes)
+            # Chunks may be shorter than the progress updates to check the checkpoints more often
+            if (episode + episodes) % update_episodes < episodes or episode + episodes == total_episodes:
+                pbar.set_description(progress_description(model_player, episode + episodes, update_episodes,
+                                                          evaluate))
+            if checkpointer is not None and checkpointer.due(episode + episodes):
+                checkpointer.write({'episodes': episode + episodes, 'random': random.getstate(),
+                                    'rounds': trainer.rounds})
+    finally:
+        pbar.close()
+        trainer.close()
+
+
+def chunk_episodes(update_episodes: int, checkpointer: Checkpointer = None) -> int:
+    """
+    Number of episodes trained at once between progress updates and checkpoint checks.
+
+    Args:
+        update_episodes (int): Number of episodes between progress updates.
+        checkpointer (Checkpointer): The checkpointer of the run, None if no checkpoints are saved.
+
+    Returns:
+        int: The progress update period, or the checkpoint period if it is shorter.
+    """
+    if checkpointer is None or checkpointer.every_episodes is None:
+        return update_episodes
+    return max(1, min(update_episodes, checkpointer.every_episodes))
+
+
+def progress_description(model_player, episode: int, update_episodes: int, evaluate: bool = False) -> str:
+    """
+    Describe the training progress with the average reward and success rate of the last episodes.
+
+    Args:
+        model_player (Player): The model being trained.
+        episode (int): The current episode.
+        update_episodes (int): Number of episodes to average.
+        evaluate (bool): Whether to add the exact outcome probabilities of the model against the bot.
+
+    Returns:
+        str: The progress description.
+    """
+    description = (f"Episode {episode} |"
+                   f" Average reward: {model_player.get_average_reward(episodes=update_episodes)} |"
+                   f" Average success rate: {model_player.get_success_rate(episodes=update_episodes)} |"
+                   f" Invalid moves: {model_player.metrics.invalid_moves} |"
+                   f" Truncated episodes: {model_player.metrics.truncated_episodes}")
+    if evaluate:
+        description += f" | Exact: {format_outcomes(exact_outcomes(model_player))}"
+    return description
+
+
+def bench(args: dict):
+    """
+    Run the benchmark suite and write its JSON report.
+
+    Args:
+        args (dict): Command line arguments.
+    """
+    from game.benchmarks.suite import run_suite, write_report, compare_reports
+    report = run_suite(quick=args['--quick'])
+    write_report(report, args['--output'])
+    if args['--baseline']:
+        with open(args['--baseline']) as file:
+            regressions = compare_reports(json.load(file), report)
+        for regression in regressions:
+            print(f"Regression in {regression['benchmark']} {regression['params']}: {regression['measure']} "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['change']:+.0%})",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def serve(args: dict):
+    """
+    Serve games against a trained model until interrupted, then print the request latencies.
+
+    Args:
+        args (dict): Command line arguments.
+    """
+    import asyncio
+    from game.server import GameServer
+    server = GameServer(load_model(args['--model-file']), args['--address'])
+    try:
+        asyncio.run(_serve(server))
+    except KeyboardInterrupt:
+        pass
+    print(server.latency.report())
+
+
+def plan(args: dict):
+    """
+    Plan the optimal policy against the bot with value iteration, print its exact outcomes and save it as a model.
+
+    Args:
+        args (dict): Command line arguments.
+    """
+    name = 'planner-' + datetime.now().strftime('%Y_%m_%d-%H_%M_%S') + '.model'
+    start = time.perf_counter()
+    planner = ValueIterationPlanner()
+    sweeps = planner.solve()
+    model_player = planner.to_model()
+    elapsed = time.perf_counter() - start
+    print(f'Planned {len(planner.states)} states in {sweeps} sweeps and {elapsed * 1000:.1f} ms')
+    print(f'Exact outcomes against the bot: {format_outcomes(exact_outcomes(model_player))}')
+    export_model(model_player, name)
+    print(f'Saved {name}')
+
+
+async def _serve(server):
+    await server.start()
+    print(f'Serving games on {server.address}')
+    await server.serve_forever()
 
 
 def main():
@@ -123,6 +602,14 @@ def main():
         play(args)
     elif args['train']:
         train(args)
+    elif args['plot']:
+        plot(args)
+    elif args['bench']:
+        bench(args)
+    elif args['serve']:
+        serve(args)
+    elif args['plan']:
+        plan(args)
     else:
         print("Invalid command. Use --help for usage information.")
 
@@ -0,0 +1,10 @@
+from src.game.benchmarks.board import bench_board, OPERATIONS
+
+
+def test_bench_board_measures_every_operation_of_every_board():
+    # When
+    results = bench_board(repeats=10)
+    # Then
+    assert [(result["board"], result["operation"]) for result in results] == (
+            [("list", operation) for operation in OPERATIONS] + [("bitboard", operation) for operation in OPERATIONS])
+    assert all(result["call_us"] > 0 for result in results)
@@ -0,0 +1,9 @@
+from src.game.benchmarks.game import bench_episodes
+
+
+def test_bench_episodes_returns_throughput_per_board():
+    # When
+    results = bench_episodes(episodes=20)
+    # Then
+    assert [result["board"] for result in results] == ["list", "bitboard"]
+    assert all(result["episodes_per_s"] > 0 for result in results)
@@ -0,0 +1,17 @@
+from src.game.benchmarks.monte_carlo import bench_training
+
+
+def test_bench_training_returns_one_result_per_episode_count():
+    # When
+    results = bench_training(episode_counts=(10, 100), repeats=5)
+    # Then
+    assert [result["episodes"] for result in results] == [10, 100]
+    assert all(result["episode_us"] > 0 for result in results)
+    assert 0 < results[0]["table_states"] <= results[1]["table_states"]
+
+
+def test_bench_training_time_does_not_grow_with_episodes():
+    # When
+    results = bench_training(episode_counts=(1_000, 20_000), repeats=500)
+    # Then
+    assert results[1]["episode_us"] < results[0]["episode_us"] * 10
@@ -0,0 +1,19 @@
+from src.game.benchmarks.q_learning import bench_update_q_values, bench_convergence, UPDATES
+
+
+def test_bench_update_q_values_returns_one_result_per_backend_and_table_size():
+    # When
+    results = bench_update_q_values(table_sizes=(10, 100), repeats=5)
+    # Then
+    assert [(result["backend"], result["table_size"]) for result in results] == [
+        ("dict", 10), ("dict", 100), ("numpy", 10), ("numpy", 100)]
+    assert all(result["update_us"] > 0 for result in results)
+
+
+def test_bench_convergence_returns_one_result_per_update():
+    # When
+    results = bench_convergence(target=0.0, window=10, seeds=2, check_episodes=10)
+    # Then
+    assert [(result["n_step"], result["trace_decay"]) for result in results] == [
+        (update["n_step"], update["trace_decay"]) for update in UPDATES]
+    assert all(result["mean_episodes"] == 10 and result["episode_us"] > 0 for result in results)
@@ -0,0 +1,23 @@
+from src.game.benchmarks.startup import bench_startup, heavy_modules, import_times, STARTUP_BUDGET_MS
+
+
+def test_import_times_include_the_module():
+    # When
+    times = import_times("game.board")
+    # Then
+    assert times["game.board"] > 0
+    assert "game" in times
+
+
+def test_main_imports_no_heavy_modules():
+    # When
+    times = import_times("main")
+    # Then
+    assert heavy_modules(times) == []
+
+
+def test_main_starts_within_budget():
+    # When
+    result = bench_startup(repeats=3)[0]
+    # Then
+    assert result["import_us"] < STARTUP_BUDGET_MS * 1000
@@ -0,0 +1,37 @@
+import json
+
+from src.game.benchmarks.suite import run_suite, compare_reports, write_report
+
+
+def report(board_us, episode_us):
+    return {"benchmarks": {
+        "board": [{"board": "list", "operation": "is_full", "call_us": board_us}],
+        "game": [{"board": "list", "episode_us": episode_us, "episodes_per_s": 1e6 / episode_us}],
+    }}
+
+
+def test_run_suite_quick_covers_every_benchmark(tmp_path):
+    # When
+    result = run_suite(quick=True)
+    write_report(result, str(tmp_path / "report.json"))
+    # Then
+    assert set(result["benchmarks"]) == {"board", "game", "q_learning", "monte_carlo", "startup",
+                                           "q_learning_convergence"}
+    assert json.loads((tmp_path / "report.json").read_text()) == result
+
+
+def test_compare_reports_finds_slower_measures():
+    # When
+    regressions = compare_reports(report(1.0, 100.0), report(1.1, 150.0))
+    # Then
+    assert len(regressions) == 1
+    assert regressions[0]["benchmark"] == "game"
+    assert regressions[0]["params"] == {"board": "list"}
+    assert regressions[0]["change"] == 0.5
+
+
+def test_compare_reports_ignores_measures_missing_from_baseline():
+    # Given
+    baseline = {"benchmarks": {"board": []}}
+    # When & Then
+    assert compare_reports(baseline, report(1.0, 100.0)) == []
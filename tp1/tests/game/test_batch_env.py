@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from src.game.batch_env import (BatchTicTacToe, winners, BOT_CODE, MODEL_CODE, REWARD_INVALID, REWARD_WIN,
+                                REWARD_STEP, RESULT_INVALID, RESULT_WIN, RESULT_NONE, WEIGHTS)
+
+
+@pytest.fixture
+def env():
+    return BatchTicTacToe(64, np.random.default_rng(0))
+
+
+def test_winners_detects_lines():
+    # Given
+    boards = np.zeros((3, 9), dtype=np.int8)
+    boards[0, [0, 4, 8]] = MODEL_CODE
+    boards[1, [2, 5, 8]] = BOT_CODE
+    boards[2, [0, 1]] = MODEL_CODE
+    # When
+    result = winners(boards, MODEL_CODE)
+    # Then
+    assert result.tolist() == [True, False, False]
+
+
+def test_reset_starts_games_with_model_to_move(env):
+    # When
+    states = env.reset()
+    # Then
+    moves = (env.boards != 0).sum(axis=1)
+    assert set(moves.tolist()) <= {0, 1}
+    assert (env.boards != MODEL_CODE).all()
+    assert (states == env.boards.astype(np.int64) @ WEIGHTS).all()
+
+
+def test_reset_random_start_boards_without_winner():
+    # Given
+    env = BatchTicTacToe(256, np.random.default_rng(0), random_start=True)
+    # When
+    env.reset()
+    # Then
+    assert (env.boards != 0).sum(axis=1).max() > 1
+    assert not winners(env.boards, BOT_CODE).any()
+    assert not winners(env.boards, MODEL_CODE).any()
+    assert env.legal_mask().any(axis=1).all()
+
+
+def test_random_legal_actions_returns_empty_cells(env):
+    # Given
+    env.reset()
+    # When
+    actions = env.random_legal_actions()
+    # Then
+    assert env.legal_mask()[np.arange(env.n_games), actions].all()
+
+
+def test_step_occupied_cell_ends_game_as_invalid():
+    # Given
+    env = BatchTicTacToe(1, np.random.default_rng(0))
+    env.boards[0, 4] = BOT_CODE
+    # When
+    _, rewards, done, results = env.step(np.array([4]))
+    # Then
+    assert rewards.tolist() == [REWARD_INVALID]
+    assert done.tolist() == [True]
+    assert results.tolist() == [RESULT_INVALID]
+
+
+def test_step_winning_move_ends_game_as_win():
+    # Given
+    env = BatchTicTacToe(1, np.random.default_rng(0))
+    env.boards[0, [0, 1]] = MODEL_CODE
+    env.boards[0, [3, 4]] = BOT_CODE
+    # When
+    _, rewards, done, results = env.step(np.array([2]))
+    # Then
+    assert rewards.tolist() == [REWARD_WIN]
+    assert done.tolist() == [True]
+    assert results.tolist() == [RESULT_WIN]
+
+
+def test_step_not_final_move_bot_replies():
+    # Given
+    env = BatchTicTacToe(1, np.random.default_rng(0))
+    # When
+    states, rewards, done, results = env.step(np.array([4]))
+    # Then
+    assert rewards.tolist() == [REWARD_STEP]
+    assert done.tolist() == [False]
+    assert results.tolist() == [RESULT_NONE]
+    assert (env.boards[0] == BOT_CODE).sum() == 1
+    assert states[0] == env.boards[0].astype(np.int64) @ WEIGHTS
@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from src.game.batch_training import BatchQLearningTrainer, BatchMonteCarloTrainer
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.q_learning import QLearning
+from src.game.utils import canonicalize, legal_actions
+
+
+def test_q_learning_trainer_records_episodes():
+    # Given
+    q_learning = QLearning(backend="numpy")
+    trainer = BatchQLearningTrainer(q_learning, n_games=32, seed=0)
+    # When
+    trainer.train(100)
+    # Then
+    assert len(q_learning.metrics) == 100
+    assert len(q_learning.metrics.rewards) == 100
+    assert set(q_learning.metrics.results.tolist()) <= {0, 1, 2, 3}
+    assert q_learning.q_values.any()
+
+
+def test_q_learning_trainer_averages_updates_of_shared_pairs():
+    # Given
+    q_learning = QLearning(backend="numpy")
+    trainer = BatchQLearningTrainer(q_learning, n_games=3, seed=0)
+    games = np.arange(3)
+    keys, actions = np.array([0, 0, 1]), np.array([4, 4, 2])
+    done = np.array([True, True, True])
+    # When
+    trainer._learn(games, keys, actions, np.array([10.0, 2.0, -2.0]), np.zeros(3, dtype=np.int64), done)
+    # Then
+    assert q_learning.q_values[0, 4] == pytest.approx(0.1 * 6)
+    assert q_learning.q_values[1, 2] == pytest.approx(0.1 * -2)
+
+
+def test_q_learning_trainer_dict_backend_sync_writes_q_values():
+    # Given
+    q_learning = QLearning()
+    trainer = BatchQLearningTrainer(q_learning, n_games=32, seed=0)
+    trainer.train(100)
+    # When
+    trainer.sync()
+    # Then
+    assert len(q_learning.q_values) > 0
+    assert all(set(q_values) == set(legal_actions(index)) for index, q_values in q_learning.q_values.items())
+
+
+def test_q_learning_trainer_learns_to_beat_random_bot():
+    # Given
+    q_learning = QLearning(backend="numpy")
+    trainer = BatchQLearningTrainer(q_learning, n_games=1024, seed=0)
+    # When
+    trainer.train(100000)
+    # Then
+    assert q_learning.get_success_rate(episodes=10000) > 0.7
+
+
+def test_monte_carlo_trainer_sync_writes_tables():
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    trainer = BatchMonteCarloTrainer(monte_carlo, n_games=32, seed=0)
+    trainer.train(200)
+    # When
+    trainer.sync()
+    # Then
+    assert len(monte_carlo.metrics) == 200
+    assert len(monte_carlo.q_values) > 0
+    for index, q_values in monte_carlo.q_values.items():
+        assert monte_carlo.visit_counts[index].keys() == q_values.keys()
+        assert monte_carlo.policy[index] == max(q_values, key=q_values.get)
+
+
+def test_monte_carlo_trainer_q_values_are_mean_returns():
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    trainer = BatchMonteCarloTrainer(monte_carlo, n_games=16, seed=0)
+    trainer.train(500)
+    trainer.sync()
+    index = max(monte_carlo.visit_counts, key=lambda state: sum(monte_carlo.visit_counts[state].values()))
+    # When
+    q_values = monte_carlo.q_values[index]
+    # Then
+    assert all(-50 <= q_value <= 10 for q_value in q_values.values())
+    assert sum(monte_carlo.visit_counts[index].values()) > 1
+
+
+def test_monte_carlo_trainer_keeps_existing_tables():
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.q_values = {1: {4: 3.0}}
+    monte_carlo.visit_counts = {1: {4: 2}}
+    monte_carlo.policy = {1: 4}
+    trainer = BatchMonteCarloTrainer(monte_carlo, n_games=4, seed=0)
+    # When
+    trainer.sync()
+    # Then
+    assert monte_carlo.q_values[1] == {4: pytest.approx(3.0)}
+    assert monte_carlo.visit_counts[1] == {4: 2}
+    assert monte_carlo.policy[1] == 4
+
+
+@pytest.mark.parametrize("model", [QLearning(symmetry=True), MonteCarloEsControl(symmetry=True)])
+def test_trainer_symmetry_uses_canonical_states(model):
+    # Given
+    trainer = (BatchQLearningTrainer if isinstance(model, QLearning) else BatchMonteCarloTrainer)(model, 64, seed=0)
+    trainer.train(500)
+    # When
+    trainer.sync()
+    # Then
+    assert all(canonicalize(state)[0] == state for state in model.q_values)
+
+
+def test_set_random_state_restores_generator():
+    # Given
+    trainer = BatchQLearningTrainer(QLearning(), 16, seed=0)
+    other = BatchQLearningTrainer(QLearning(), 16, seed=1)
+    state = trainer.random_state()
+    # When
+    trainer.set_random_state(state)
+    other.set_random_state(state)
+    # Then
+    assert other.states.tolist() == trainer.states.tolist()
+    assert other.rng.random() == trainer.rng.random()
+
+
+@pytest.mark.parametrize("symmetry", [False, True])
+def test_q_learning_trainer_never_plays_invalid_moves(symmetry):
+    # Given
+    q_learning = QLearning(backend="numpy", symmetry=symmetry)
+    trainer = BatchQLearningTrainer(q_learning, n_games=64, seed=0)
+    # When
+    trainer.train(2000)
+    # Then
+    assert q_learning.metrics.invalid_moves == 0
+    assert q_learning.metrics.truncated_episodes == 0
+
+
+@pytest.mark.parametrize("model_type, trainer_type", [(QLearning, BatchQLearningTrainer),
+                                                      (MonteCarloEsControl, BatchMonteCarloTrainer)])
+def test_trainer_records_every_episode_learnt_from(model_type, trainer_type):
+    # Given
+    model = model_type(backend="numpy") if model_type is QLearning else model_type()
+    trainer = trainer_type(model, n_games=256, seed=0)
+    learn = trainer._learn
+    learnt = []
+    trainer._learn = lambda games, *step: learnt.append(int(step[-1].sum())) or learn(games, *step)
+    # When
+    for _ in range(20):
+        trainer.train(10)
+    # Then
+    assert len(model.metrics) == 200
+    assert sum(learnt) == 200
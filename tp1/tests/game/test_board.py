@@ -1,5 +1,8 @@
+import random
+
 import pytest
 
+from src.game.bit_board import BitBoard
 from src.game.board import Board
 
 
@@ -122,3 +125,122 @@ def test_print_output_prints_message(capsys, board):
     # Then
     captured = capsys.readouterr()
     assert captured.out != ""
+
+
+def test_place_symbol_updates_state(board):
+    # When
+    board.place_symbol('X', 1, 0)
+    board.place_symbol('O', 0, 1)
+    # Then
+    assert board.state == 1 * 3 + 2 * 27
+
+
+def test_place_symbol_occupied_spot_does_not_update_state(board):
+    # Given
+    board.place_symbol('X', 0, 0)
+    # When
+    board.place_symbol('O', 0, 0)
+    # Then
+    assert board.state == 1
+
+
+def brute_force_winner(board, symbol):
+    # Scan every line of k cells of the board
+    for y in range(board.height):
+        for x in range(board.width):
+            for step_x, step_y in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                cells = [(x + i * step_x, y + i * step_y) for i in range(board.k)]
+                if all(0 <= cx < board.width and 0 <= cy < board.height and board.grid[cy][cx] == symbol
+                       for cx, cy in cells):
+                    return True
+    return False
+
+
+@pytest.mark.parametrize("width, height, k", [(3, 3, 3), (4, 4, 3), (5, 5, 4), (6, 4, 4), (7, 6, 4)])
+def test_is_winner_matches_full_scan_on_random_games(width, height, k):
+    # Given
+    rng = random.Random(0)
+    for _ in range(30):
+        board = Board(width, height, k)
+        spots = board.get_empty_spots()
+        rng.shuffle(spots)
+        for turn, (x, y) in enumerate(spots):
+            # When
+            board.place_symbol('XO'[turn % 2], x, y)
+            # Then
+            assert board.is_winner('X') == brute_force_winner(board, 'X')
+            assert board.is_winner('O') == brute_force_winner(board, 'O')
+
+
+def test_is_winner_anti_diagonal_on_larger_board():
+    # Given
+    board = Board(5, 5, 4)
+    for x, y in ((4, 1), (3, 2), (1, 4), (2, 3)):
+        board.place_symbol('O', x, y)
+    # When
+    result = board.is_winner('O')
+    # Then
+    assert result == True
+
+
+def test_is_winner_line_shorter_than_k_returns_false():
+    # Given
+    board = Board(4, 4, 4)
+    for x in range(3):
+        board.place_symbol('X', x, 0)
+    board.place_symbol('X', 0, 1)
+    # When
+    result = board.is_winner('X')
+    # Then
+    assert result == False
+
+
+def test_larger_board_bounds_state_and_full():
+    # Given
+    board = Board(4, 3, 3)
+    # When
+    placed = board.place_symbol('X', 3, 2)
+    # Then
+    assert placed == True
+    assert board.place_symbol('O', 4, 0) == False
+    assert board.place_symbol('O', 0, 3) == False
+    assert board.state == 3 ** 11
+    assert len(board.get_empty_spots()) == 11
+    assert board.is_full() == False
+
+
+def test_invalid_board_size_raises():
+    # Then
+    with pytest.raises(ValueError):
+        Board(3, 3, 4)
+
+
+def test_grid_setter_recomputes_state_and_winners(board):
+    # Given
+    bit_board = BitBoard()
+    grid = [['X', 'X', 'X'],
+            ['O', 'O', ' '],
+            [' ', ' ', ' ']]
+    # When
+    board.grid = grid
+    bit_board.grid = grid
+    # Then
+    assert board.is_winner('X')
+    assert not board.is_winner('O')
+    assert not board.is_full()
+    assert board.state == bit_board.state == 1 + 3 + 9 + 2 * 27 + 2 * 81
+    assert board.get_empty_spots() == bit_board.get_empty_spots()
+
+
+def test_grid_setter_replaces_previous_symbols(board):
+    # Given
+    board.place_symbol('O', 1, 1)
+    # When
+    board.grid = [['X', 'O', 'X'],
+                  ['X', 'O', 'O'],
+                  ['O', 'X', 'X']]
+    # Then
+    assert board.is_full()
+    assert not board.is_winner('X') and not board.is_winner('O')
+    assert board.grid[1][1] == 'O'
+    assert board.placed == 9
@@ -0,0 +1,179 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.game.checkpoint import Checkpointer, load_checkpoint
+from src.game.metrics import TrainingMetrics
+from src.game.board import Board
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.players import BotPlayer
+from src.game.q_learning import QLearning
+from src.game.tic_tac_toe import TicTacToe
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return str(tmp_path / "model.ckpt")
+
+
+def train_step(monte_carlo, index):
+    monte_carlo.episode_steps = [(index, 4)]
+    monte_carlo.episode_rewards = [10]
+    monte_carlo._update_q_values_and_policy('W')
+
+
+def test_load_checkpoint_applies_incremental_records(checkpoint_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    checkpointer = Checkpointer(checkpoint_path, monte_carlo, options={"--model": "monte-carlo"})
+    train_step(monte_carlo, 1)
+    checkpointer.write({"episodes": 1})
+    train_step(monte_carlo, 2)
+    train_step(monte_carlo, 1)
+    checkpointer.write({"episodes": 3})
+    # When
+    model, state = load_checkpoint(checkpoint_path)
+    # Then
+    assert checkpointer.log_size > 0
+    assert model.q_values == monte_carlo.q_values
+    assert model.visit_counts == {1: {4: 2}, 2: {4: 1}}
+    assert model.policy == monte_carlo.policy
+    assert len(model.metrics) == 3
+    assert state == {"episodes": 3, "options": {"--model": "monte-carlo"}}
+
+
+def test_load_checkpoint_counts_episodes_without_history(checkpoint_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.metrics = TrainingMetrics(keep_history=False)
+    checkpointer = Checkpointer(checkpoint_path, monte_carlo)
+    train_step(monte_carlo, 1)
+    checkpointer.write({"episodes": 1})
+    train_step(monte_carlo, 2)
+    checkpointer.write({"episodes": 2})
+    # When
+    model, _ = load_checkpoint(checkpoint_path)
+    # Then
+    assert len(model.metrics) == 2
+    assert len(model.metrics.results) == 0
+
+
+def test_incremental_record_only_holds_changed_states(checkpoint_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    for index in range(100):
+        train_step(monte_carlo, index)
+    checkpointer = Checkpointer(checkpoint_path, monte_carlo)
+    checkpointer.write({"episodes": 100})
+    # When
+    train_step(monte_carlo, 1)
+    checkpointer.write({"episodes": 101})
+    # Then
+    assert checkpointer.log_size < checkpointer.full_size / 10
+
+
+def test_load_checkpoint_drops_torn_record(checkpoint_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    checkpointer = Checkpointer(checkpoint_path, monte_carlo)
+    train_step(monte_carlo, 1)
+    checkpointer.write({"episodes": 1})
+    train_step(monte_carlo, 2)
+    checkpointer.write({"episodes": 2})
+    with open(checkpoint_path, "r+b") as file:
+        file.truncate(len(file.read()) - 3)
+    # When
+    model, state = load_checkpoint(checkpoint_path)
+    # Then
+    assert state["episodes"] == 1
+    assert list(model.q_values) == [1]
+
+
+def test_write_compacts_when_changes_outgrow_model(checkpoint_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    checkpointer = Checkpointer(checkpoint_path, monte_carlo)
+    checkpointer.write({"episodes": 0})
+    # When
+    for episode in range(1, 40):
+        train_step(monte_carlo, episode)
+        checkpointer.write({"episodes": episode})
+    model, state = load_checkpoint(checkpoint_path)
+    # Then
+    assert checkpointer.log_size <= checkpointer.full_size * 2
+    assert model.q_values == monte_carlo.q_values
+    assert state["episodes"] == 39
+
+
+def test_checkpoint_numpy_q_learning_rows(checkpoint_path):
+    # Given
+    q_learning = QLearning(backend="numpy")
+    checkpointer = Checkpointer(checkpoint_path, q_learning)
+    checkpointer.write({"episodes": 0})
+    q_learning.q_values[7, 3] = 1.5
+    q_learning.metrics.record('W', 10)
+    checkpointer.write({"episodes": 1})
+    # When
+    model, _ = load_checkpoint(checkpoint_path)
+    # Then
+    assert isinstance(model.q_values, np.ndarray)
+    assert model.q_values[7, 3] == 1.5
+    assert np.count_nonzero(model.q_values) == 1
+    assert model.metrics.results.tolist() == [0]
+
+
+def play_games(model, episodes):
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    model.set_observers([])
+    for _ in range(episodes):
+        try:
+            TicTacToe(bot_player, model, Board(), observers=[]).start()
+        except RuntimeWarning:
+            pass
+
+
+def test_resume_replay_q_learning_from_incremental_record(checkpoint_path):
+    # Given
+    random.seed(1)
+    q_learning = QLearning(backend="numpy", replay_capacity=500, replay_batch_size=16)
+    q_learning.set_train(True)
+    checkpointer = Checkpointer(checkpoint_path, q_learning)
+    play_games(q_learning, 50)
+    checkpointer.write({"episodes": 50})
+    play_games(q_learning, 50)
+    checkpointer.write({"episodes": 100, "random": random.getstate()})
+    play_games(q_learning, 50)
+    # When
+    model, state = load_checkpoint(checkpoint_path)
+    random.setstate(state["random"])
+    play_games(model, 50)
+    # Then
+    assert checkpointer.log_size > 0
+    assert np.array_equal(model.q_values, q_learning.q_values)
+    assert np.array_equal(model.replay.states, q_learning.replay.states)
+
+
+def test_checkpoint_skips_instance_functions(checkpoint_path):
+    # Given
+    q_learning = QLearning()
+    q_learning.turn = lambda board: (0, 0)
+    checkpointer = Checkpointer(checkpoint_path, q_learning)
+    # When
+    checkpointer.write({"episodes": 0, "random": random.getstate()})
+    model, state = load_checkpoint(checkpoint_path)
+    # Then
+    assert "turn" not in vars(model)
+    assert state["random"] == random.getstate()
+
+
+def test_due_after_episodes_or_minutes(checkpoint_path):
+    # Given
+    by_episodes = Checkpointer(checkpoint_path, QLearning(), every_episodes=10)
+    by_minutes = Checkpointer(checkpoint_path, QLearning(), every_minutes=0)
+    # Then
+    assert not by_episodes.due(9)
+    assert by_episodes.due(10)
+    assert by_minutes.due(0)
+    assert not Checkpointer(checkpoint_path, QLearning()).due(1000)
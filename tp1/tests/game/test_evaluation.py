@@ -0,0 +1,102 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.game.board import Board
+from src.game.evaluation import exact_outcomes, outcome_tables, format_outcomes
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.persistence import export_model, load_model
+from src.game.players import BotPlayer
+from src.game.q_learning import QLearning
+from src.game.solver import GameSolver
+from src.game.tic_tac_toe import TicTacToe
+
+# Outcomes of two random players, for the first one
+FIRST_WINS, DRAWS, SECOND_WINS = 737 / 1260, 8 / 63, 121 / 420
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return GameSolver.build()
+
+
+class FixedActionModel:
+    def __init__(self, action):
+        self.action = action
+
+    def predict_batch(self, states):
+        return np.full(len(states), self.action)
+
+
+def test_exact_outcomes_unknown_policy_plays_randomly():
+    # When
+    outcomes = exact_outcomes(MonteCarloEsControl())
+    # Then
+    assert outcomes["model_first"] == pytest.approx({"win": FIRST_WINS, "draw": DRAWS, "loss": SECOND_WINS})
+    assert outcomes["bot_first"] == pytest.approx({"win": SECOND_WINS, "draw": DRAWS, "loss": FIRST_WINS})
+    assert outcomes["average"]["win"] == pytest.approx((FIRST_WINS + SECOND_WINS) / 2)
+
+
+@pytest.mark.parametrize("action", [-1, 9, 4])
+def test_exact_outcomes_invalid_actions_play_randomly(action):
+    # When
+    model_outcomes, bot_outcomes = outcome_tables(FixedActionModel(action), "X")
+    # Then
+    assert model_outcomes[3 ** 4] == pytest.approx(outcome_tables(FixedActionModel(-1), "X")[0][3 ** 4])
+    assert bot_outcomes[0].sum() == pytest.approx(1)
+
+
+def test_exact_outcomes_perfect_policy_never_loses(solver):
+    # Given
+    model = MonteCarloEsControl()
+    model.policy = {state: solver.best_moves(state, "O")[0] for state in solver.reachable_states("O").tolist()}
+    # When
+    outcomes = exact_outcomes(model)
+    # Then
+    assert outcomes["model_first"]["loss"] == pytest.approx(0)
+    assert outcomes["bot_first"]["loss"] == pytest.approx(0)
+    assert outcomes["model_first"]["win"] > FIRST_WINS
+
+
+def test_exact_outcomes_of_exported_model_match_trained_model(solver, tmp_path):
+    # Given
+    model = MonteCarloEsControl()
+    model.policy = {state: solver.best_moves(state, "O")[0] for state in solver.reachable_states("O").tolist()}
+    path = str(tmp_path / "model.model")
+    export_model(model, path)
+    player = load_model(path)
+    # When
+    outcomes = exact_outcomes(player)
+    # Then
+    expected = exact_outcomes(model)
+    assert all(outcomes[name] == pytest.approx(expected[name]) for name in expected)
+    player.model_file.close()
+
+
+def test_exact_outcomes_match_played_games():
+    # Given
+    random.seed(0)
+    q_learning = QLearning(backend="numpy")
+    q_learning.set_train(True)
+    q_learning.set_observers([])
+    bot = BotPlayer()
+    bot.set_observers([])
+    for _ in range(500):
+        TicTacToe(bot, q_learning, Board(), observers=[]).start()
+    q_learning.set_train(False)
+    wins = []
+    q_learning.win = lambda: wins.append(1)
+    # When
+    outcomes = exact_outcomes(q_learning)
+    for _ in range(4000):
+        TicTacToe(bot, q_learning, Board(), observers=[]).start()
+    # Then
+    assert len(wins) / 4000 == pytest.approx(outcomes["average"]["win"], abs=0.03)
+
+
+def test_format_outcomes_shows_average():
+    # When
+    description = format_outcomes({"average": {"win": 0.5, "draw": 0.25, "loss": 0.25}})
+    # Then
+    assert description == "win 0.500, draw 0.250, loss 0.250"
@@ -0,0 +1,31 @@
+from src.game.board import Board
+from src.game.events import GameObserver, ConsoleObserver
+
+
+def test_game_observer_ignores_events(capsys):
+    # Given
+    observer = GameObserver()
+    # When
+    observer.on_message("message")
+    observer.on_board(Board())
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_console_observer_on_message_prints_message(capsys):
+    # When
+    ConsoleObserver().on_message("message")
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out == "message\n"
+
+
+def test_console_observer_on_board_prints_board(capsys):
+    # Given
+    board = Board()
+    # When
+    ConsoleObserver().on_board(board)
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out.startswith("---+---+---")
@@ -0,0 +1,156 @@
+import pytest
+
+from src.game.metrics import TrainingMetrics, RESULT_CODES
+
+
+@pytest.fixture
+def metrics():
+    return TrainingMetrics(window=3)
+
+
+def test_record_keeps_history(metrics):
+    # When
+    metrics.record('W', 1.5)
+    metrics.record('I', -50)
+    # Then
+    assert len(metrics) == 2
+    assert metrics.results.tolist() == [RESULT_CODES['W'], RESULT_CODES['I']]
+    assert metrics.rewards.tolist() == [1.5, -50]
+    assert metrics.results.dtype.itemsize == 1
+    assert metrics.rewards.dtype.itemsize == 4
+
+
+def test_rolling_window_only_uses_last_episodes(metrics):
+    # Given
+    for result, reward in [('W', 10), ('L', -10), ('W', 8), ('D', -2), ('W', 6)]:
+        metrics.record(result, reward)
+    # When
+    average_reward = metrics.average_reward()
+    success_rate = metrics.success_rate()
+    # Then
+    assert average_reward == pytest.approx(4)
+    assert success_rate == pytest.approx(2 / 3)
+
+
+def test_other_window_sizes_use_history(metrics):
+    # Given
+    for result, reward in [('W', 10), ('L', -10), ('W', 8), ('D', -2), ('W', 6)]:
+        metrics.record(result, reward)
+    # When & Then
+    assert metrics.average_reward(episodes=5) == pytest.approx(2.4)
+    assert metrics.success_rate(episodes=10) == pytest.approx(3 / 5)
+
+
+def test_without_history_only_window_is_available():
+    # Given
+    metrics = TrainingMetrics(window=2, keep_history=False)
+    for result, reward in [('W', 10), ('L', -10), ('W', 8)]:
+        metrics.record(result, reward)
+    # When & Then
+    assert len(metrics.results) == 0
+    assert metrics.average_reward() == pytest.approx(-1)
+    with pytest.raises(ValueError):
+        metrics.average_reward(episodes=3)
+
+
+def test_window_is_kept_in_arrays():
+    # Given
+    metrics = TrainingMetrics(window=1000000, keep_history=False)
+    # When
+    metrics.record_batch([RESULT_CODES['W'], RESULT_CODES['L']], [10, -10])
+    # Then
+    assert metrics._window_wins.nbytes == 1000000
+    assert metrics._window_rewards.nbytes == 8000000
+    assert metrics.success_rate() == pytest.approx(0.5)
+
+
+def test_record_batch_wrapping_window_matches_record():
+    # Given
+    episodes = [('W', 10), ('L', -10), ('W', 8), ('D', -2), ('W', 6), ('L', -10), ('D', -2)]
+    batched = TrainingMetrics(window=3, keep_history=False)
+    recorded = TrainingMetrics(window=3, keep_history=False)
+    # When
+    for start, end in [(0, 2), (2, 4), (4, 7)]:
+        batched.record_batch([RESULT_CODES[result] for result, _ in episodes[start:end]],
+                             [reward for _, reward in episodes[start:end]])
+    for result, reward in episodes:
+        recorded.record(result, reward)
+    # Then
+    assert batched.average_reward() == pytest.approx(recorded.average_reward())
+    assert batched.success_rate() == pytest.approx(recorded.success_rate())
+    assert batched.average_reward() == pytest.approx(-2)
+
+
+def test_record_batch_matches_record(metrics):
+    # Given
+    episodes = [('W', 10), ('L', -10), ('W', 8), ('D', -2)]
+    other = TrainingMetrics(window=3)
+    for result, reward in episodes:
+        metrics.record(result, reward)
+    # When
+    other.record_batch([RESULT_CODES[result] for result, _ in episodes], [reward for _, reward in episodes])
+    # Then
+    assert other.results.tolist() == metrics.results.tolist()
+    assert other.average_reward() == pytest.approx(metrics.average_reward())
+    assert other.success_rate() == pytest.approx(metrics.success_rate())
+
+
+def test_set_window_refills_from_history(metrics):
+    # Given
+    for result, reward in [('W', 10), ('L', -10), ('W', 8), ('D', -2)]:
+        metrics.record(result, reward)
+    # When
+    metrics.set_window(2)
+    # Then
+    assert metrics.average_reward() == pytest.approx(3)
+    assert metrics.success_rate() == pytest.approx(0.5)
+
+
+def test_empty_metrics_return_zero(metrics):
+    # Then
+    assert metrics.average_reward() == 0
+    assert metrics.success_rate(episodes=10) == 0
+
+
+def test_save_and_load_keep_history(metrics, tmp_path):
+    # Given
+    for result, reward in [('W', 10), ('L', -10), ('I', -50.5)]:
+        metrics.record(result, reward)
+    path = str(tmp_path / "metrics.npz")
+    # When
+    metrics.save(path)
+    loaded = TrainingMetrics.load(path)
+    # Then
+    assert loaded.window == 3
+    assert loaded.results.tolist() == metrics.results.tolist()
+    assert loaded.rewards.tolist() == metrics.rewards.tolist()
+    assert loaded.average_reward() == pytest.approx(metrics.average_reward())
+
+
+def test_counts_truncated_episodes_and_invalid_moves(metrics):
+    # Given
+    other = TrainingMetrics()
+    other.record_batch([RESULT_CODES['I'], RESULT_CODES['W']], [-50, 10])
+    other.record_invalid_moves(3)
+    # When
+    metrics.record('I', -50)
+    metrics.record('D', -2)
+    metrics.record_invalid_moves()
+    metrics.merge(other)
+    # Then
+    assert metrics.truncated_episodes == 2
+    assert metrics.invalid_moves == 4
+
+
+def test_save_and_load_keep_invalid_moves(metrics, tmp_path):
+    # Given
+    metrics.record('I', -50)
+    metrics.record_invalid_moves(2)
+    path = str(tmp_path / "metrics.npz")
+    # When
+    metrics.save(path)
+    loaded = TrainingMetrics.load(path)
+    # Then
+    assert loaded.invalid_moves == 2
+    assert loaded.truncated_episodes == 1
+
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from src.game.board import Board
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.persistence import export_model, load_model, ModelFile, ModelFilePlayer, MODEL_HEADER
+from src.game.q_learning import QLearning
+from src.game.utils import legal_actions
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    return str(tmp_path / "model.model")
+
+
+def test_export_model_monte_carlo_writes_policy(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.q_values = {1: {4: 1.5}, 3: {0: -1.0, 4: 2.0}}
+    monte_carlo.policy = {1: 4, 3: 4, 5: 7}
+    # When
+    export_model(monte_carlo, model_path)
+    model_file = ModelFile(model_path)
+    # Then
+    assert model_file.states.tolist() == [1, 3, 5]
+    assert model_file.policy.tolist() == [4, 4, 7]
+    assert model_file.q_values[1, 0] == -1.0
+    assert np.isnan(model_file.q_values[2]).all()
+    model_file.close()
+
+
+@pytest.mark.parametrize("backend", ["dict", "numpy"])
+def test_export_model_q_learning_writes_best_actions(model_path, backend):
+    # Given
+    q_learning = QLearning(backend=backend)
+    q_learning._init_state(1, legal_actions(1))
+    q_learning._init_state(2, legal_actions(2))
+    q_learning.q_values[1][6] = 1.0
+    q_learning.q_values[2][3] = 0.5
+    # When
+    export_model(q_learning, model_path)
+    model_file = ModelFile(model_path)
+    # Then
+    assert model_file.states.tolist() == [1, 2]
+    assert model_file.policy.tolist() == [6, 3]
+    assert model_file.greedy_action(1) == 6
+    assert model_file.greedy_action(0) is None
+    model_file.close()
+
+
+def test_model_file_arrays_are_memory_mapped(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.policy = {1: 4}
+    export_model(monte_carlo, model_path)
+    # When
+    model_file = ModelFile(model_path)
+    # Then
+    assert not model_file.states.flags.owndata
+    assert not model_file.states.flags.writeable
+    assert len(model_file) == 1
+    model_file.close()
+
+
+def test_model_file_symmetry_maps_action_back(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl(symmetry=True)
+    monte_carlo.policy = {1: 8}
+    export_model(monte_carlo, model_path)
+    board = Board()
+    board.place_symbol("X", 2, 2)
+    # When
+    model_file = ModelFile(model_path)
+    # Then
+    assert model_file.greedy_action(board.state) == 0
+    model_file.close()
+
+
+def test_model_file_rejects_other_versions(model_path):
+    # Given
+    with open(model_path, "wb") as file:
+        file.write(MODEL_HEADER.pack(b"TTTM", 99, 1, 0, 0))
+    # When & Then
+    with pytest.raises(ValueError):
+        ModelFile(model_path)
+
+
+def test_load_model_returns_model_file_player(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.policy = {0: 4}
+    export_model(monte_carlo, model_path)
+    # When
+    player = load_model(model_path)
+    # Then
+    assert isinstance(player, ModelFilePlayer)
+    assert player.turn(Board()) == (1, 1)
+    player.model_file.close()
+
+
+def test_model_file_player_turn_plays_empty_spot_on_invalid_policy(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    board = Board()
+    board.place_symbol("X", 1, 1)
+    monte_carlo.policy = {board.state: 4}
+    export_model(monte_carlo, model_path)
+    player = ModelFilePlayer(ModelFile(model_path))
+    # When
+    position = player.turn(board)
+    # Then
+    assert position in board.get_empty_spots()
+    player.model_file.close()
+
+
+def test_export_model_monte_carlo_skips_actions_outside_board(model_path):
+    # Given
+    monte_carlo = MonteCarloEsControl()
+    monte_carlo.q_values = {0: {9: -50.0, 4: 1.0}}
+    monte_carlo.policy = {0: 4}
+    # When
+    export_model(monte_carlo, model_path)
+    model_file = ModelFile(model_path)
+    # Then
+    assert model_file.q_values[0, 4] == 1.0
+    model_file.close()
@@ -61,7 +61,7 @@ def test_new_game_prints_message(capsys, monte_carlo):
 def test_turn_play_returns_policy_position(monte_carlo, board):
     # Given
     board.place_symbol("X", 1, 0)
-    monte_carlo.policy = {" X       ": 5}
+    monte_carlo.policy = {3: 5}
     # When
     pos_x, pos_y = monte_carlo.turn(board)
     # Then
@@ -82,22 +82,22 @@ def test_turn_train_second_movement_returns_new_random_policy_position(monte_car
     # Given
     monte_carlo.set_train(True)
     random.seed(47)
-    monte_carlo.episode_steps = [("         ", 0)]
+    monte_carlo.episode_steps = [(0, 0)]
     board.place_symbol("X", 0, 0)
     # When
     pos_x, pos_y = monte_carlo.turn(board)
     # Then
     assert (pos_x, pos_y) == (0, 2)
-    assert monte_carlo.policy == {"X        ": 6}
+    assert monte_carlo.policy == {1: 6}
 
 
 def test_turn_train_second_movement_returns_existing_policy_position(monte_carlo, board):
     # Given
     monte_carlo.set_train(True)
     random.seed(47)
-    monte_carlo.episode_steps = [("         ", 0)]
+    monte_carlo.episode_steps = [(0, 0)]
     board.place_symbol("X", 0, 0)
-    monte_carlo.policy = {"X        ": 8}
+    monte_carlo.policy = {1: 8}
     # When
     pos_x, pos_y = monte_carlo.turn(board)
     # Then
@@ -109,9 +109,9 @@ def test_turn_train_second_movement_updates_reward(monte_carlo, board):
     # Given
     monte_carlo.set_train(True)
     random.seed(47)
-    monte_carlo.episode_steps = [("         ", 0)]
+    monte_carlo.episode_steps = [(0, 0)]
     board.place_symbol("X", 0, 0)
-    monte_carlo.policy = {"X        ": 8}
+    monte_carlo.policy = {1: 8}
     # When
     monte_carlo.turn(board)
     # Then
@@ -192,7 +192,8 @@ def test_set_train_mode(monte_carlo):
 
 def test_get_average_reward(monte_carlo):
     # Given
-    monte_carlo.train_rewards = [1, 2, 3, 4, 5]
+    for reward in [1, 2, 3, 4, 5]:
+        monte_carlo.metrics.record('W', reward)
     # When
     avg_reward_all = monte_carlo.get_average_reward(episodes=5)
     avg_reward_partial = monte_carlo.get_average_reward(episodes=3)
@@ -205,7 +206,8 @@ def test_get_average_reward(monte_carlo):
 
 def test_plot_rewards(monte_carlo, mocker):
     # Given
-    monte_carlo.train_rewards = [1, 2, 3, 4, 5]
+    for reward in [1, 2, 3, 4, 5]:
+        monte_carlo.metrics.record('W', reward)
     mock_show = mocker.patch("matplotlib.pyplot.show")
     # When
     monte_carlo.plot_rewards(episodes=3)
@@ -215,7 +217,8 @@ def test_plot_rewards(monte_carlo, mocker):
 
 def test_get_success_rate(monte_carlo):
     # Given
-    monte_carlo.train_results = ['W', 'L', 'W', 'D', 'W']
+    for result in ['W', 'L', 'W', 'D', 'W']:
+        monte_carlo.metrics.record(result, 0)
     # When
     success_rate_all = monte_carlo.get_success_rate(episodes=5)
     success_rate_partial = monte_carlo.get_success_rate(episodes=3)
@@ -228,7 +231,8 @@ def test_get_success_rate(monte_carlo):
 
 def test_plot_success_rate(monte_carlo, mocker):
     # Given
-    monte_carlo.train_results = ['W', 'L', 'W', 'D', 'W']
+    for result in ['W', 'L', 'W', 'D', 'W']:
+        monte_carlo.metrics.record(result, 0)
     mock_show = mocker.patch("matplotlib.pyplot.show")
     # When
     monte_carlo.plot_success_rate(episodes=3)
@@ -240,12 +244,150 @@ def test_update_q_values_and_policy(monte_carlo):
     # Given
     monte_carlo.episode_steps = [("b1", 0), ("b2", 1), ("b3", 2)]
     monte_carlo.episode_rewards = [-0.1, -0.1, 10]
-    monte_carlo.returns_sum = {("b1", 0): 2, ("b2", 1): -0.1, ("b3", 2): 5}
-    monte_carlo.return_count = {("b1", 0): 1, ("b2", 1): 1, ("b3", 2): 1}
-    monte_carlo.q_values = {"b1": {0: 2, 1: 5}, "b2": {1: -10}, "b3": {2: -10}}
+    monte_carlo.visit_counts = {"b1": {0: 1, 1: 1}, "b2": {1: 1}, "b3": {2: 1}}
+    monte_carlo.q_values = {"b1": {0: 2, 1: 5}, "b2": {1: -0.1}, "b3": {2: 5}}
     monte_carlo.policy = {"b1": 8, "b2": 8, "b3": 8}
     # When
-    monte_carlo._update_q_values_and_policy()
+    monte_carlo._update_q_values_and_policy('W')
     # Then
-    assert monte_carlo.q_values == {"b1": {0: 4.955, 1: 5}, "b2": {1: 4.4}, "b3": {2: 7.5}}
+    assert monte_carlo.q_values == {"b1": {0: pytest.approx(4.955), 1: 5}, "b2": {1: pytest.approx(4.4)},
+                                    "b3": {2: pytest.approx(7.5)}}
+    assert monte_carlo.visit_counts == {"b1": {0: 2, 1: 1}, "b2": {1: 2}, "b3": {2: 2}}
     assert monte_carlo.policy == {"b1": 1, "b2": 1, "b3": 2}
+    assert monte_carlo.episode_steps == []
+    assert monte_carlo.episode_rewards == []
+
+
+def test_update_q_values_and_policy_repeated_step_uses_first_visit_return(monte_carlo):
+    # Given
+    monte_carlo.episode_steps = [("b1", 0), ("b2", 1), ("b1", 0)]
+    monte_carlo.episode_rewards = [1, 2, 3]
+    # When
+    monte_carlo._update_q_values_and_policy('W')
+    # Then
+    assert monte_carlo.q_values == {"b1": {0: pytest.approx(1 + 0.9 * 2 + 0.81 * 3)}, "b2": {1: pytest.approx(4.7)}}
+    assert monte_carlo.visit_counts == {"b1": {0: 1}, "b2": {1: 1}}
+
+
+def test_update_q_values_and_policy_only_updates_visited_states_policy(monte_carlo):
+    # Given
+    monte_carlo.episode_steps = [("b1", 0)]
+    monte_carlo.episode_rewards = [10]
+    monte_carlo.q_values = {"b2": {1: 5, 2: 7}}
+    monte_carlo.policy = {"b2": 1}
+    # When
+    monte_carlo._update_q_values_and_policy('W')
+    # Then
+    assert monte_carlo.policy == {"b1": 0, "b2": 1}
+
+
+def test_update_q_values_and_policy_with_returns_sink_records_instead_of_learning(monte_carlo):
+    # Given
+    returns = []
+    monte_carlo.returns_sink = returns.extend
+    monte_carlo.episode_steps = [("b1", 0), ("b2", 1)]
+    monte_carlo.episode_rewards = [1, 2]
+    # When
+    monte_carlo._update_q_values_and_policy('W')
+    # Then
+    assert returns == [("b2", 1, 2), ("b1", 0, pytest.approx(2.8))]
+    assert monte_carlo.q_values == {}
+    assert len(monte_carlo.metrics) == 1
+
+
+def test_apply_returns_updates_q_values_and_policy(monte_carlo):
+    # Given
+    monte_carlo.q_values = {"b1": {0: 1.0}}
+    monte_carlo.visit_counts = {"b1": {0: 1}}
+    # When
+    monte_carlo.apply_returns([("b1", 0, 3.0), ("b1", 2, 1.5)])
+    # Then
+    assert monte_carlo.q_values == {"b1": {0: 2.0, 2: 1.5}}
+    assert monte_carlo.visit_counts == {"b1": {0: 2, 2: 1}}
+    assert monte_carlo.policy == {"b1": 0}
+
+
+def test_greedy_action_returns_policy_action(monte_carlo):
+    # Given
+    monte_carlo.policy = {3: 5}
+    # When & Then
+    assert monte_carlo.greedy_action(3) == 5
+    assert monte_carlo.greedy_action(4) is None
+
+
+def test_turn_play_symmetry_returns_transformed_policy_position(board):
+    # Given
+    monte_carlo = MonteCarloEsControl(symmetry=True)
+    board.place_symbol("X", 2, 2)
+    # The canonical board has the X on the top left corner, where the center stays the center
+    monte_carlo.policy = {1: 4}
+    # When
+    pos_x, pos_y = monte_carlo.turn(board)
+    # Then
+    assert (pos_x, pos_y) == (1, 1)
+
+
+def test_turn_play_symmetry_maps_corner_action_back(board):
+    # Given
+    monte_carlo = MonteCarloEsControl(symmetry=True)
+    board.place_symbol("X", 2, 2)
+    monte_carlo.policy = {1: 8}
+    # When
+    pos_x, pos_y = monte_carlo.turn(board)
+    # Then
+    assert (pos_x, pos_y) == (0, 0)
+
+
+def test_turn_train_symmetry_records_canonical_steps(board):
+    # Given
+    monte_carlo = MonteCarloEsControl(symmetry=True)
+    monte_carlo.set_train(True)
+    monte_carlo.episode_steps = [(0, 0)]
+    board.place_symbol("X", 2, 2)
+    monte_carlo.policy = {1: 8}
+    # When
+    monte_carlo.turn(board)
+    # Then
+    assert monte_carlo.episode_steps[-1] == (1, 8)
+
+
+def test_greedy_action_symmetry_maps_action_back(board):
+    # Given
+    monte_carlo = MonteCarloEsControl(symmetry=True)
+    board.place_symbol("X", 2, 2)
+    monte_carlo.policy = {1: 8}
+    # When & Then
+    assert monte_carlo.greedy_action(board.state) == 0
+
+
+def test_turn_train_first_movement_is_always_legal(monte_carlo, board):
+    # Given
+    monte_carlo.set_train(True)
+    board.place_symbol("X", 0, 0)
+    board.place_symbol("O", 1, 0)
+    # When
+    positions = set()
+    for seed in range(200):
+        random.seed(seed)
+        monte_carlo.episode_steps = []
+        positions.add(monte_carlo.turn(board))
+    # Then
+    assert positions == set(board.get_empty_spots())
+
+
+def test_turn_play_without_policy_returns_legal_position(monte_carlo, board):
+    # Given
+    board.place_symbol("X", 2, 2)
+    # When
+    pos_x, pos_y = monte_carlo.turn(board)
+    # Then
+    assert (pos_x, pos_y) in board.get_empty_spots()
+
+
+def test_invalid_position_train_counts_invalid_move(monte_carlo):
+    # Given
+    monte_carlo.set_train(True)
+    # When
+    monte_carlo.invalid_position()
+    # Then
+    assert monte_carlo.metrics.invalid_moves == 1
@@ -0,0 +1,67 @@
+import pickle
+
+import pytest
+
+from src.game.board import Board
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.parallel import ParallelTrainer, play_episodes
+from src.game.q_learning import QLearning
+
+
+def train(model, workers: int, seed: int, episodes: int = 200, random_start: bool = False):
+    model.set_train(True)
+    trainer = ParallelTrainer(model, workers, seed, round_episodes=50, random_start=random_start)
+    try:
+        trainer.train(episodes)
+    finally:
+        trainer.close()
+    return model
+
+
+def test_train_q_learning_merges_experience():
+    # When
+    q_learning = train(QLearning(), workers=2, seed=1)
+    # Then
+    assert len(q_learning.metrics) == 200
+    assert len(q_learning.metrics.rewards) == 200
+    assert any(q_value != 0 for q_values in q_learning.q_values.values() for q_value in q_values.values())
+
+
+def test_train_q_learning_with_replay_fills_buffer_of_the_model():
+    # When
+    q_learning = train(QLearning(backend="numpy", replay_capacity=10000), workers=2, seed=1)
+    # Then
+    assert len(q_learning.replay) > 200
+    assert q_learning.q_values.any()
+
+
+def test_train_monte_carlo_merges_experience():
+    # When
+    monte_carlo = train(MonteCarloEsControl(), workers=2, seed=1, random_start=True)
+    # Then
+    assert len(monte_carlo.metrics) == 200
+    assert monte_carlo.q_values != {}
+    assert monte_carlo.policy.keys() >= monte_carlo.q_values.keys()
+
+
+@pytest.mark.parametrize("model_type", [QLearning, MonteCarloEsControl])
+def test_train_same_seed_and_workers_is_reproducible(model_type):
+    # When
+    first = train(model_type(), workers=2, seed=7)
+    second = train(model_type(), workers=2, seed=7)
+    # Then
+    assert first.metrics.results.tolist() == second.metrics.results.tolist()
+    assert first.q_values == second.q_values
+
+
+def test_play_episodes_records_experience():
+    # Given
+    q_learning = QLearning()
+    q_learning.set_train(True)
+    snapshot = pickle.dumps(q_learning)
+    # When
+    experience, metrics = play_episodes((snapshot, 10, "0:0:0", Board, False))
+    # Then
+    assert len(metrics) == 10
+    assert len(experience) > 0
+    assert all(len(transition) == 4 for transition in experience)
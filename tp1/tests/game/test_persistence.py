@@ -0,0 +1,96 @@
+import pickle
+
+import pytest
+
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.persistence import load_model, convert_legacy_model
+from src.game.q_learning import QLearning
+
+
+@pytest.fixture
+def monte_carlo():
+    return MonteCarloEsControl()
+
+
+@pytest.fixture
+def q_learning():
+    return QLearning()
+
+
+def test_convert_legacy_model_monte_carlo_converts_keys_and_visit_counts(monte_carlo):
+    # Given
+    monte_carlo.q_values = {"X        ": {4: 1.0}}
+    monte_carlo.policy = {"X        ": 4}
+    monte_carlo.returns_sum = {("X        ", 4): 1.0}
+    monte_carlo.return_count = {("X        ", 4): 1}
+    # When
+    convert_legacy_model(monte_carlo)
+    # Then
+    assert monte_carlo.q_values == {1: {4: 1.0}}
+    assert monte_carlo.policy == {1: 4}
+    assert monte_carlo.visit_counts == {1: {4: 1}}
+    assert not hasattr(monte_carlo, "returns_sum")
+    assert not hasattr(monte_carlo, "return_count")
+
+
+def test_convert_legacy_model_q_learning_converts_keys(q_learning):
+    # Given
+    q_learning.q_values = {" O       ": {0: 0.5}}
+    q_learning.last_state = " O       "
+    # When
+    convert_legacy_model(q_learning)
+    # Then
+    assert q_learning.q_values == {6: {0: 0.5}}
+    assert q_learning.last_state == 6
+
+
+def test_convert_legacy_model_integer_keys_unchanged(q_learning):
+    # Given
+    q_learning.q_values = {6: {0: 0.5}}
+    # When
+    convert_legacy_model(q_learning)
+    # Then
+    assert q_learning.q_values == {6: {0: 0.5}}
+
+
+def test_convert_legacy_model_adds_new_attributes_with_defaults(q_learning):
+    # Given
+    q_learning.q_values = {" O       ": {0: 0.5}}
+    for name in ("backend", "symmetry", "replay", "n_step", "trace_decay", "pending_steps", "transition_sink"):
+        delattr(q_learning, name)
+    # When
+    convert_legacy_model(q_learning)
+    # Then
+    assert q_learning.backend == "dict"
+    assert not q_learning.symmetry
+    assert q_learning.replay is None
+    assert q_learning.n_step == 1
+    assert q_learning.pending_steps == []
+    assert q_learning.transition_sink is None
+    assert q_learning.q_values == {6: {0: 0.5}}
+
+
+def test_load_model_converts_pickled_legacy_model(tmp_path, monte_carlo):
+    # Given
+    monte_carlo.policy = {"XO       ": 8}
+    path = tmp_path / "model.pkl"
+    with open(path, 'wb') as file:
+        pickle.dump(monte_carlo, file)
+    # When
+    model = load_model(str(path))
+    # Then
+    assert isinstance(model, MonteCarloEsControl)
+    assert model.policy == {1 + 2 * 3: 8}
+
+
+def test_convert_legacy_model_moves_training_history_to_metrics(q_learning):
+    # Given
+    del q_learning.metrics
+    q_learning.train_results = ['W', 'L']
+    q_learning.train_rewards = [10, -10.5]
+    # When
+    convert_legacy_model(q_learning)
+    # Then
+    assert q_learning.metrics.results.tolist() == [0, 1]
+    assert q_learning.metrics.rewards.tolist() == [10, -10.5]
+    assert not hasattr(q_learning, "train_results")
@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from src.game.board import CELL_WEIGHTS
+from src.game.evaluation import exact_outcomes, game_tables
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.planner import ValueIterationPlanner
+from src.game.utils import legal_actions
+
+
+@pytest.fixture(scope="module")
+def planner():
+    planner = ValueIterationPlanner()
+    planner.solve()
+    return planner
+
+
+def expected_return(policy: dict, state: int) -> float:
+    # Discounted return of the model moving from a state, walking the game tree with the learners rewards
+    _, filled, winners = game_tables()
+
+    @lru_cache(maxsize=None)
+    def model_return(state: int) -> float:
+        afterstate = state + 2 * CELL_WEIGHTS[policy[state]]
+        if winners[afterstate] == 2:
+            return 10
+        if filled[afterstate] == 9:
+            return -2
+        returns = []
+        for reply in legal_actions(afterstate):
+            next_state = afterstate + CELL_WEIGHTS[reply]
+            if winners[next_state] == 1:
+                returns.append(-10)
+            elif filled[next_state] == 9:
+                returns.append(-2)
+            else:
+                returns.append(-0.1 + 0.9 * model_return(next_state))
+        return sum(returns) / len(returns)
+    return model_return(state)
+
+
+def test_solve_converges_in_few_sweeps(planner):
+    # Then
+    assert planner.sweeps <= 7
+    assert len(planner.policy()) == len(planner.states)
+
+
+def test_values_are_the_returns_of_the_policy(planner):
+    # Given
+    policy = planner.policy()
+    values = dict(zip(planner.states.tolist(), planner.values.tolist()))
+    # When & Then
+    for state in (0, 1, 3 ** 4, 2 + 3 ** 4):
+        assert values[state] == pytest.approx(expected_return(policy, state))
+
+
+def test_policy_takes_winning_moves(planner):
+    # Given
+    state = 2 + 2 * 3 + 1 * 3 ** 3 + 1 * 3 ** 4
+    # When
+    policy = planner.policy()
+    # Then
+    assert policy[state] == 2
+    assert planner.q_values()[planner.states.tolist().index(state), 2] == 10
+
+
+def test_policy_is_an_upper_bound_of_other_policies(planner):
+    # Given
+    model = planner.to_model()
+    other = MonteCarloEsControl()
+    other.policy = {state: legal_actions(state)[0] for state in planner.states.tolist()}
+    # When
+    outcomes = exact_outcomes(model)
+    other_outcomes = exact_outcomes(other)
+    # Then
+    assert outcomes["average"]["win"] > 0.95
+    assert outcomes["average"]["win"] > other_outcomes["average"]["win"]
+    assert all(model.policy[state] in legal_actions(state) for state in model.policy)
+
+
+def test_to_model_keeps_values_of_legal_actions(planner):
+    # When
+    model = planner.to_model()
+    # Then
+    assert set(model.q_values[1]) == set(legal_actions(1))
+    assert model.policy[1] == max(model.q_values[1], key=model.q_values[1].get)
+    assert not np.isinf(list(model.q_values[0].values())).any()
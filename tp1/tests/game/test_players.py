@@ -1,3 +1,5 @@
+from unittest.mock import Mock
+
 import pytest
 
 from src.game.board import Board
@@ -126,3 +128,35 @@ def test_bot_player_draw_prints_message(capsys, bot_player):
     # Then
     captured = capsys.readouterr()
     assert captured.out != ""
+
+
+def test_bot_player_without_observers_is_quiet(capsys, bot_player):
+    # Given
+    bot_player.set_observers([])
+    # When
+    bot_player.new_game()
+    bot_player.win()
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_user_player_observer_receives_messages(user_player):
+    # Given
+    observer = Mock()
+    user_player.set_observers([observer])
+    # When
+    user_player.draw()
+    # Then
+    observer.on_message.assert_called_once_with("User Draw")
+
+
+def test_set_observers_without_observers_restores_console(capsys, user_player):
+    # Given
+    user_player.set_observers([])
+    # When
+    user_player.set_observers()
+    user_player.win()
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out == "User won\n"
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.game.metrics import TrainingMetrics
+from src.game.plots import moving_average, learning_curves, save_plots, plot_curve
+
+
+@pytest.fixture
+def metrics():
+    metrics = TrainingMetrics()
+    for result, reward in [('W', 10), ('L', -10), ('W', 8), ('D', -2), ('W', 6)]:
+        metrics.record(result, reward)
+    return metrics
+
+
+def test_moving_average_matches_window_means():
+    # Given
+    values = np.array([1, 2, 3, 4, 5])
+    # When
+    result = moving_average(values, 3)
+    # Then
+    assert result.tolist() == pytest.approx([1, 1.5, 2, 3, 4])
+
+
+def test_learning_curves(metrics):
+    # When
+    curves = learning_curves(metrics, episodes=2)
+    # Then
+    assert curves["rewards"].tolist() == pytest.approx([10, 0, -1, 3, 2])
+    assert curves["success_rate"].tolist() == pytest.approx([1, 0.5, 0.5, 0.5, 0.5])
+
+
+@pytest.mark.parametrize("plot_format", ["png", "svg"])
+def test_save_plots_writes_images(metrics, tmp_path, plot_format, mocker):
+    # Given
+    mock_show = mocker.patch("matplotlib.pyplot.show")
+    # When
+    paths = save_plots(metrics, str(tmp_path / "model"), plot_format, episodes=2)
+    # Then
+    assert paths == [str(tmp_path / f"model-rewards.{plot_format}"),
+                     str(tmp_path / f"model-success_rate.{plot_format}")]
+    assert all((tmp_path / path).stat().st_size > 0 for path in paths)
+    mock_show.assert_not_called()
+
+
+def test_save_plots_writes_csv(metrics, tmp_path):
+    # When
+    paths = save_plots(metrics, str(tmp_path / "model"), "csv", episodes=2)
+    # Then
+    lines = (tmp_path / "model-curves.csv").read_text().splitlines()
+    assert paths == [str(tmp_path / "model-curves.csv")]
+    assert lines[0] == "episode,result,reward,rewards,success_rate"
+    assert lines[2] == "2,1,-10.0,0.0,0.5"
+    assert len(lines) == 6
+
+
+def test_save_plots_rejects_unknown_format(metrics, tmp_path):
+    # When & Then
+    with pytest.raises(ValueError):
+        save_plots(metrics, str(tmp_path / "model"), "gif")
+
+
+def test_plot_curve_without_output_shows_window(mocker):
+    # Given
+    mock_show = mocker.patch("matplotlib.pyplot.show")
+    # When
+    plot_curve(np.array([1.0, 2.0]), "rewards")
+    # Then
+    mock_show.assert_called_once()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.game.batch_training import BatchMonteCarloTrainer, BatchQLearningTrainer
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.persistence import export_model, ModelFile
+from src.game.q_learning import QLearning
+
+STATES = np.arange(3 ** 9)
+
+
+def trained(model):
+    trainer_type = BatchQLearningTrainer if isinstance(model, QLearning) else BatchMonteCarloTrainer
+    trainer = trainer_type(model, 64, seed=0)
+    trainer.train(2000)
+    trainer.sync()
+    return model
+
+
+@pytest.fixture(params=[
+    lambda: QLearning(), lambda: QLearning(backend="numpy"), lambda: QLearning(symmetry=True),
+    lambda: MonteCarloEsControl(), lambda: MonteCarloEsControl(symmetry=True)
+], ids=["q-learning", "q-learning-numpy", "q-learning-symmetry", "monte-carlo", "monte-carlo-symmetry"])
+def model(request):
+    return trained(request.param())
+
+
+def test_predict_batch_matches_greedy_action(model):
+    # When
+    actions = model.predict_batch(STATES)
+    # Then
+    expected = [model.greedy_action(state) for state in STATES.tolist()]
+    assert actions.tolist() == [-1 if action is None else action for action in expected]
+
+
+def test_predict_batch_returns_q_values_in_board_frame(model):
+    # Given
+    states = STATES[np.flatnonzero(model.predict_batch(STATES) >= 0)[:50]]
+    # When
+    actions, q_values = model.predict_batch(states, return_q_values=True)
+    # Then
+    assert q_values.shape == (len(states), 9)
+    if isinstance(model, QLearning):
+        assert (q_values[np.arange(len(states)), actions] == np.nanmax(q_values, axis=1)).all()
+
+
+def test_model_file_predict_batch_matches_greedy_action(model, tmp_path):
+    # Given
+    export_model(model, str(tmp_path / "model.model"))
+    model_file = ModelFile(str(tmp_path / "model.model"))
+    # When
+    actions = model_file.predict_batch(STATES)
+    # Then
+    expected = [model_file.greedy_action(state) for state in STATES.tolist()]
+    assert actions.tolist() == [-1 if action is None else action for action in expected]
+    model_file.close()
+
+
+def test_predict_batch_unknown_states_have_no_action():
+    # Given
+    q_learning = QLearning()
+    q_learning.q_values = {5: {action: float(action == 2) for action in range(9)}}
+    # When
+    actions, q_values = q_learning.predict_batch([5, 6], return_q_values=True)
+    # Then
+    assert actions.tolist() == [2, -1]
+    assert np.isnan(q_values[1]).all()
@@ -0,0 +1,63 @@
+import pytest
+
+from src.game.board import Board
+from src.game.players import BotPlayer
+from src.game.profiling import PhaseTimers
+
+
+@pytest.fixture
+def timers():
+    return PhaseTimers()
+
+
+def test_phase_counts_calls_and_time(timers):
+    # When
+    for _ in range(3):
+        with timers.phase("progress"):
+            pass
+    # Then
+    assert timers.calls == {"progress": 3}
+    assert timers.seconds["progress"] >= 0
+
+
+def test_wrap_times_instance_methods_and_unwrap_all_restores_them(timers):
+    # Given
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    # When
+    timers.wrap(bot_player, ("turn", "win"), "bot")
+    bot_player.turn(Board())
+    bot_player.win()
+    timers.unwrap_all()
+    bot_player.turn(Board())
+    # Then
+    assert timers.calls == {"bot": 2}
+    assert "turn" not in vars(bot_player)
+
+
+def test_timed_type_times_methods_of_new_objects(timers):
+    # Given
+    board_type = timers.timed_type(Board, ("place_symbol", "is_full"), "board")
+    # When
+    board = board_type()
+    board.place_symbol("X", 1, 1)
+    full = board.is_full()
+    # Then
+    assert isinstance(board, Board)
+    assert not full
+    assert timers.calls == {"board": 2}
+    assert Board.place_symbol is not board_type.place_symbol
+
+
+def test_report_lists_phases_from_slowest(timers):
+    # Given
+    timers.add("turn", 0.5)
+    timers.add("board", 1.0)
+    # When
+    report = timers.report(total=2.0)
+    # Then
+    lines = report.splitlines()
+    assert lines[1].startswith("board")
+    assert lines[2].startswith("turn")
+    assert "50.0" in lines[1]
+    assert lines[-1].startswith("total")
@@ -1,9 +1,13 @@
 import random
 
+import numpy as np
 import pytest
 
 from src.game.board import Board
+from src.game.players import BotPlayer
 from src.game.q_learning import QLearning
+from src.game.tic_tac_toe import TicTacToe
+from src.game.utils import legal_actions
 
 
 @pytest.fixture
@@ -70,7 +74,7 @@ def test_turn_play_returns_best_q_value_position(q_learning, board):
     # Given
     q_learning.set_train(False)
     board.place_symbol("X", 1, 0)
-    q_learning.q_values = {" X       ": {5: 1.0, 6: 0.5}}
+    q_learning.q_values = {3: {5: 1.0, 6: 0.5}}
     # When
     pos_x, pos_y = q_learning.turn(board)
     # Then
@@ -80,7 +84,7 @@ def test_turn_play_returns_best_q_value_position(q_learning, board):
 def test_turn_train_epsilon_explores_return_random_position(q_learning, board):
     # Given
     q_learning.set_train(True)
-    q_learning.q_values = {"         ": {0: 100.0}}
+    q_learning.q_values = {0: {0: 100.0}}
     random.seed(1)
     # When
     pos_x, pos_y = q_learning.turn(board)
@@ -91,7 +95,7 @@ def test_turn_train_epsilon_explores_return_random_position(q_learning, board):
 def test_turn_train_epsilon_exploit_return_best_position(q_learning, board):
     # Given
     q_learning.set_train(True)
-    q_learning.q_values = {"         ": {5: 100.0}}
+    q_learning.q_values = {0: {5: 100.0}}
     random.seed(47)
     # When
     pos_x, pos_y = q_learning.turn(board)
@@ -104,15 +108,15 @@ def test_turn_train_updates_q_values(q_learning, board):
     q_learning.set_train(True)
     random.seed(47)
     board.place_symbol("X", 0, 0)
-    q_learning.last_state = "X        "
+    q_learning.last_state = 1
     q_learning.last_action = 0
-    q_learning.q_values = {"X        ": {0: 0.5}}
+    q_learning.q_values = {1: {0: 0.5}}
     q_learning.episode_reward = 15
     q_learning.n_steps = 1
     # When
     q_learning.turn(board)
     # Then
-    assert q_learning.q_values["X        "][0] != 0.5
+    assert q_learning.q_values[1][0] != 0.5
 
 
 def test_invalid_position_prints_message(capsys, q_learning):
@@ -196,7 +200,8 @@ def test_set_train_mode(q_learning):
 
 def test_get_average_reward(q_learning):
     # Given
-    q_learning.train_rewards = [1, 2, 3, 4, 5]
+    for reward in [1, 2, 3, 4, 5]:
+        q_learning.metrics.record('W', reward)
     # When
     avg_reward_all = q_learning.get_average_reward(episodes=5)
     avg_reward_partial = q_learning.get_average_reward(episodes=3)
@@ -209,7 +214,8 @@ def test_get_average_reward(q_learning):
 
 def test_plot_rewards(q_learning, mocker):
     # Given
-    q_learning.train_rewards = [1, 2, 3, 4, 5]
+    for reward in [1, 2, 3, 4, 5]:
+        q_learning.metrics.record('W', reward)
     mock_show = mocker.patch("matplotlib.pyplot.show")
     # When
     q_learning.plot_rewards(episodes=3)
@@ -219,7 +225,8 @@ def test_plot_rewards(q_learning, mocker):
 
 def test_get_success_rate(q_learning):
     # Given
-    q_learning.train_results = ['W', 'L', 'W', 'D', 'W']
+    for result in ['W', 'L', 'W', 'D', 'W']:
+        q_learning.metrics.record(result, 0)
     # When
     success_rate_all = q_learning.get_success_rate(episodes=5)
     success_rate_partial = q_learning.get_success_rate(episodes=3)
@@ -232,9 +239,302 @@ def test_get_success_rate(q_learning):
 
 def test_plot_success_rate(q_learning, mocker):
     # Given
-    q_learning.train_results = ['W', 'L', 'W', 'D', 'W']
+    for result in ['W', 'L', 'W', 'D', 'W']:
+        q_learning.metrics.record(result, 0)
     mock_show = mocker.patch("matplotlib.pyplot.show")
     # When
     q_learning.plot_success_rate(episodes=3)
     # Then
     mock_show.assert_called_once()
+
+
+def test_init_invalid_backend_raise_error():
+    # When & Then
+    with pytest.raises(ValueError):
+        QLearning(backend="invalid")
+
+
+def test_init_numpy_backend_preallocates_q_values():
+    # When
+    q_learning = QLearning(backend="numpy")
+    # Then
+    assert q_learning.q_values.shape == (3 ** 9, 9)
+    assert q_learning.q_values.dtype == np.float32
+
+
+def test_turn_play_numpy_backend_returns_best_q_value_position(board):
+    # Given
+    q_learning = QLearning(backend="numpy")
+    board.place_symbol("X", 1, 0)
+    q_learning.q_values[3, 5] = 1.0
+    q_learning.q_values[3, 6] = 0.5
+    # When
+    pos_x, pos_y = q_learning.turn(board)
+    # Then
+    assert (pos_x, pos_y) == (2, 1)
+
+
+def test_turn_train_numpy_backend_updates_q_values(board):
+    # Given
+    q_learning = QLearning(backend="numpy")
+    q_learning.set_train(True)
+    random.seed(47)
+    board.place_symbol("X", 0, 0)
+    q_learning.last_state = 0
+    q_learning.last_action = 0
+    q_learning.q_values[0, 0] = 0.5
+    q_learning.q_values[1, 4] = 1.0
+    q_learning.n_steps = 1
+    # When
+    q_learning.turn(board)
+    # Then
+    assert q_learning.q_values[0, 0] == pytest.approx(0.5 + 0.1 * (-0.1 + 0.9 * 1.0 - 0.5))
+
+
+def test_win_train_numpy_backend_updates_q_values():
+    # Given
+    q_learning = QLearning(backend="numpy")
+    q_learning.set_train(True)
+    q_learning.last_state = 7
+    q_learning.last_action = 2
+    # When
+    q_learning.win()
+    # Then
+    assert q_learning.q_values[7, 2] == pytest.approx(1.0)
+
+
+def test_apply_transitions_updates_q_values(q_learning):
+    # Given
+    q_learning.q_values = {1: {0: 0.5}, 2: {3: 1.0}}
+    # When
+    q_learning.apply_transitions([(1, 0, -0.1, 2), (2, 3, 10, None)])
+    # Then
+    assert q_learning.q_values[1][0] == pytest.approx(0.5 + 0.1 * (-0.1 + 0.9 * 1.0 - 0.5))
+    assert q_learning.q_values[2][3] == pytest.approx(1.0 + 0.1 * (10 - 1.0))
+
+
+def test_apply_transitions_initializes_new_states(q_learning):
+    # When
+    q_learning.apply_transitions([(1, 4, -0.1, 2)])
+    # Then
+    assert q_learning.q_values[2] == {i: 0 for i in range(1, 9)}
+    assert q_learning.q_values[1][4] == pytest.approx(-0.01)
+
+
+def test_greedy_action_returns_best_q_value_action(q_learning):
+    # Given
+    q_learning.q_values = {3: {5: 1.0, 6: 0.5}}
+    # When & Then
+    assert q_learning.greedy_action(3) == 5
+    assert q_learning.greedy_action(4) is None
+
+
+def test_turn_play_symmetry_returns_transformed_best_position(board):
+    # Given
+    q_learning = QLearning(symmetry=True)
+    board.place_symbol("X", 2, 2)
+    q_learning.q_values = {1: {8: 1.0, 4: 0.5}}
+    # When
+    pos_x, pos_y = q_learning.turn(board)
+    # Then
+    assert (pos_x, pos_y) == (0, 0)
+
+
+def test_turn_train_symmetry_updates_canonical_state(board):
+    # Given
+    q_learning = QLearning(symmetry=True)
+    q_learning.set_train(True)
+    random.seed(47)
+    board.place_symbol("X", 2, 2)
+    # When
+    q_learning.turn(board)
+    # Then
+    assert q_learning.last_state == 1
+    assert list(q_learning.q_values.keys()) == [1]
+
+
+def test_greedy_action_symmetry_maps_action_back(board):
+    # Given
+    q_learning = QLearning(symmetry=True)
+    board.place_symbol("X", 2, 2)
+    q_learning.q_values = {1: {8: 1.0, 4: 0.5}}
+    # When & Then
+    assert q_learning.greedy_action(board.state) == 0
+
+
+def test_turn_train_only_initializes_and_picks_legal_actions(q_learning, board):
+    # Given
+    q_learning.set_train(True)
+    q_learning.epsilon = 0
+    board.place_symbol("X", 0, 0)
+    board.place_symbol("O", 1, 1)
+    # When
+    pos_x, pos_y = q_learning.turn(board)
+    # Then
+    assert set(q_learning.q_values[board.state]) == {1, 2, 3, 5, 6, 7, 8}
+    assert (pos_x, pos_y) == (1, 0)
+
+
+@pytest.mark.parametrize("backend", ["dict", "numpy"])
+def test_greedy_action_ignores_occupied_cells(backend):
+    # Given
+    q_learning = QLearning(backend=backend)
+    state = 1
+    q_learning.q_values[state] = {action: 0.0 for action in range(9)} if backend == "dict" else 0
+    q_learning.q_values[state][0] = 5.0
+    q_learning.q_values[state][7] = 1.0
+    # When & Then
+    assert q_learning.greedy_action(state) == 7
+    assert q_learning.predict_batch([state]).tolist() == [7]
+
+
+def test_turn_play_unknown_state_returns_legal_position(q_learning, board):
+    # Given
+    board.place_symbol("X", 0, 0)
+    # When
+    pos_x, pos_y = q_learning.turn(board)
+    # Then
+    assert (pos_x, pos_y) in board.get_empty_spots()
+
+
+def test_invalid_position_train_counts_invalid_move(q_learning):
+    # Given
+    q_learning.set_train(True)
+    # When
+    q_learning.invalid_position()
+    # Then
+    assert q_learning.metrics.invalid_moves == 1
+
+
+def test_replay_requires_numpy_backend():
+    # When & Then
+    with pytest.raises(ValueError):
+        QLearning(replay_capacity=100)
+
+
+def test_learn_with_replay_updates_in_bulk_at_episode_end():
+    # Given
+    q_learning = QLearning(backend="numpy", replay_capacity=100, replay_batch_size=32)
+    q_learning.last_state, q_learning.last_action = 0, 4
+    # When
+    q_learning._learn(-0.1, 3 ** 4, legal_actions(3 ** 4))
+    stored_only = q_learning.q_values.copy()
+    q_learning.last_state, q_learning.last_action = 3 ** 4, 0
+    q_learning._learn(10)
+    # Then
+    assert len(q_learning.replay) == 2
+    assert not stored_only.any()
+    assert q_learning.q_values[3 ** 4, 0] == pytest.approx(0.1 * 10)
+    assert q_learning.q_values[0, 4] == pytest.approx(-0.01)
+
+
+def test_apply_transitions_with_replay_fills_buffer():
+    # Given
+    q_learning = QLearning(backend="numpy", replay_capacity=100)
+    # When
+    q_learning.apply_transitions([(0, 4, -0.1, 3 ** 4), (3 ** 4, 0, 10, None)])
+    # Then
+    assert len(q_learning.replay) == 2
+    assert q_learning.q_values[3 ** 4, 0] == pytest.approx(1.0)
+
+
+def test_train_with_replay_learns_against_bot():
+    # Given
+    random.seed(0)
+    q_learning = QLearning(backend="numpy", replay_capacity=5000)
+    q_learning.set_train(True)
+    q_learning.set_observers([])
+    bot = BotPlayer()
+    bot.set_observers([])
+    # When
+    for _ in range(1000):
+        TicTacToe(bot, q_learning, Board(), observers=[]).start()
+    # Then
+    assert len(q_learning.replay) > 1000
+    assert q_learning.metrics.success_rate(200) > 0.6
+
+
+@pytest.mark.parametrize("arguments", [{"n_step": 0}, {"trace_decay": 1.5}, {"n_step": 2, "trace_decay": 0.5},
+                                       {"backend": "numpy", "replay_capacity": 10, "n_step": 3}])
+def test_invalid_update_options_raise(arguments):
+    # When & Then
+    with pytest.raises(ValueError):
+        QLearning(**arguments)
+
+
+def play_steps(q_learning, steps):
+    # Feeds the (state, action, reward, next state) steps of an episode to _learn, as turn and the results do
+    for state, action, reward, next_state in steps:
+        q_learning.last_state, q_learning.last_action = state, action
+        q_learning._init_state(state, legal_actions(state))
+        if next_state is not None:
+            q_learning._init_state(next_state, legal_actions(next_state))
+        q_learning._learn(reward, next_state, None if next_state is None else legal_actions(next_state))
+
+
+def test_learn_n_step_updates_with_n_step_returns():
+    # Given
+    q_learning = QLearning(n_step=2)
+    q_learning.q_values = {5: {2: 2.0, 3: 0.0}}
+    steps = [(0, 4, -0.1, 1), (1, 3, -0.1, 5), (5, 2, 10, None)]
+    # When
+    play_steps(q_learning, steps[:1])
+    waiting = dict(q_learning.q_values[0])
+    play_steps(q_learning, steps[1:])
+    # Then
+    assert waiting[4] == 0
+    assert q_learning.q_values[0][4] == pytest.approx(0.1 * (-0.1 + 0.9 * -0.1 + 0.81 * 2.0))
+    assert q_learning.q_values[1][3] == pytest.approx(0.1 * (-0.1 + 0.9 * 10))
+    assert q_learning.q_values[5][2] == pytest.approx(2.0 + 0.1 * (10 - 2.0))
+    assert q_learning.pending_steps == []
+
+
+def test_learn_one_step_matches_n_step_one():
+    # Given
+    steps = [(0, 4, -0.1, 1), (1, 3, -0.1, 5), (5, 2, 10, None)]
+    one_step, n_step = QLearning(), QLearning(n_step=1)
+    # When
+    play_steps(one_step, steps * 3)
+    play_steps(n_step, steps * 3)
+    # Then
+    assert one_step.q_values == n_step.q_values
+
+
+def test_learn_traces_reach_first_step_with_final_reward():
+    # Given
+    q_learning = QLearning(backend="numpy", trace_decay=0.5)
+    # When
+    play_steps(q_learning, [(0, 4, -0.1, 1), (1, 3, 10, None)])
+    # Then
+    assert q_learning.q_values[1, 3] == pytest.approx(1.0)
+    assert q_learning.q_values[0, 4] == pytest.approx(-0.01 + 0.1 * 10 * 0.45)
+    assert q_learning.traces == {}
+
+
+def test_turn_exploratory_move_cuts_traces(board):
+    # Given
+    q_learning = QLearning(trace_decay=0.5)
+    q_learning.set_train(True)
+    q_learning.epsilon = 1
+    q_learning.q_values = {0: {action: 1.0 if action == 0 else 0.0 for action in range(9)}}
+    q_learning.traces = {(3, 1): 0.45}
+    random.seed(1)
+    # When
+    q_learning.turn(board)
+    # Then
+    assert q_learning.last_action != 0
+    assert q_learning.traces == {}
+
+
+def test_learn_with_transition_sink_records_instead_of_learning():
+    # Given
+    q_learning = QLearning(n_step=2)
+    transitions = []
+    q_learning.transition_sink = transitions.append
+    steps = [(0, 4, -0.1, 1), (1, 3, -0.1, 5), (5, 2, 10, None)]
+    # When
+    play_steps(q_learning, steps)
+    # Then
+    assert transitions == steps
+    assert all(q_value == 0 for q_values in q_learning.q_values.values() for q_value in q_values.values())
+    assert q_learning.pending_steps == []
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.game.replay import ReplayBuffer
+
+
+@pytest.fixture
+def replay():
+    return ReplayBuffer(4)
+
+
+def test_add_stores_transition_with_next_legal_mask(replay):
+    # When
+    replay.add(0, 4, -0.1, 1 + 2 * 3 ** 4)
+    replay.add(3, 2, 10)
+    # Then
+    assert len(replay) == 2
+    assert replay.next_legal[0].tolist() == [False, True, True, True, False, True, True, True, True]
+    assert not replay.done[0]
+    assert replay.done[1]
+    assert not replay.next_legal[1].any()
+
+
+def test_add_overwrites_oldest_transitions_when_full(replay):
+    # When
+    for state in range(6):
+        replay.add(state, 0, 0.0, state)
+    # Then
+    assert len(replay) == 4
+    assert sorted(replay.states.tolist()) == [2, 3, 4, 5]
+
+
+def test_add_batch_matches_adding_one_by_one(replay):
+    # Given
+    transitions = [(0, 1, -0.1, 2), (2, 3, 10, None), (5, 0, -0.1, 14), (14, 8, -10, None), (1, 2, -0.1, 7)]
+    one_by_one = ReplayBuffer(4)
+    for transition in transitions:
+        one_by_one.add(*transition)
+    # When
+    states, actions, rewards, next_states = zip(*transitions)
+    replay.add_batch(np.array(states), np.array(actions), np.array(rewards), np.array([s or 0 for s in next_states]),
+                     np.array([s is None for s in next_states]))
+    # Then
+    for name in ("states", "actions", "rewards", "next_states", "done", "next_legal"):
+        assert np.array_equal(getattr(replay, name), getattr(one_by_one, name))
+    assert (replay.position, replay.size) == (one_by_one.position, one_by_one.size)
+
+
+def test_sample_returns_stored_transitions(replay):
+    # Given
+    replay.add(0, 4, -0.1, 3)
+    replay.add(3, 2, 10)
+    # When
+    states, actions, rewards, next_states, done, next_legal = replay.sample(50, np.random.default_rng(0))
+    # Then
+    assert states.shape == (50,)
+    assert next_legal.shape == (50, 9)
+    assert set(zip(states.tolist(), actions.tolist(), done.tolist())) == {(0, 4, False), (3, 2, True)}
+
+
+def test_sample_empty_buffer_raises(replay):
+    # When & Then
+    with pytest.raises(ValueError):
+        replay.sample(1, np.random.default_rng(0))
+
+
+def test_invalid_capacity_raises():
+    # When & Then
+    with pytest.raises(ValueError):
+        ReplayBuffer(0)
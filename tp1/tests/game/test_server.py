@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+import threading
+
+import pytest
+
+from src.game.players import UserPlayer
+from src.game.q_learning import QLearning
+from src.game.server import GameServer, GameSession, GameClient, LatencyStats, parse_address
+from src.game.utils import state_to_board
+
+
+@pytest.fixture
+def model():
+    # The model plays position 4 on the board where X took the corner 0
+    model = QLearning()
+    model.q_values = {1: {action: float(action == 4) for action in range(9)}}
+    return model
+
+
+async def play_random_game(address: str, rng: random.Random) -> dict:
+    reader, writer = await asyncio.open_connection(*address.rsplit(":", 1))
+
+    async def request(message):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    response = await request({"op": "new"})
+    while response["status"] == "playing":
+        board = state_to_board(response["board"])
+        pos_x, pos_y = rng.choice(board.get_empty_spots())
+        response = await request({"op": "move", "position": pos_x + pos_y * 3})
+        assert "error" not in response
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+
+def test_parse_address():
+    # Then
+    assert parse_address("127.0.0.1:8765") == ("tcp", "127.0.0.1", 8765)
+    assert parse_address("unix:/tmp/game.sock") == ("unix", "/tmp/game.sock")
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_session_model_replies_with_policy_move(model):
+    # Given
+    session = GameSession(model)
+    session.new_game("user")
+    # When
+    response = session.move(0)
+    # Then
+    assert response == {"board": 1 + 2 * 3 ** 4, "status": "playing", "model_position": 4}
+
+
+def test_session_user_wins(model):
+    # Given
+    session = GameSession(model)
+    session.new_game("user")
+    session.board = state_to_board(1 + 3 + 2 * 3 ** 4 + 2 * 3 ** 5)
+    # When
+    response = session.move(2)
+    # Then
+    assert response["status"] == "won"
+    with pytest.raises(ValueError):
+        session.move(6)
+
+
+def test_session_rejects_taken_position(model):
+    # Given
+    session = GameSession(model)
+    session.new_game("user")
+    session.move(0)
+    # Then
+    with pytest.raises(ValueError):
+        session.move(4)
+    with pytest.raises(ValueError):
+        session.move(9)
+
+
+def test_latency_stats_summary():
+    # Given
+    stats = LatencyStats()
+    # When
+    for latency in range(1, 101):
+        stats.record(latency * 1e-6)
+    # Then
+    summary = stats.summary()
+    assert summary["requests"] == 100
+    assert summary["mean_us"] == pytest.approx(50.5)
+    assert summary["max_us"] == pytest.approx(100)
+
+
+def test_server_plays_concurrent_games(model):
+    # Given
+    server = GameServer(model, "127.0.0.1:0", seed=0)
+
+    async def scenario():
+        await server.start()
+        rng = random.Random(0)
+        responses = await asyncio.gather(*(play_random_game(server.address, rng) for _ in range(500)))
+        await server.close()
+        return responses
+
+    # When
+    responses = asyncio.run(scenario())
+    # Then
+    assert {response["status"] for response in responses} <= {"won", "lost", "draw"}
+    assert server.latency.requests >= 500 * 3
+    assert all(response["latency_us"] >= 0 for response in responses)
+
+
+def test_server_returns_errors_with_game_state(model):
+    # Given
+    server = GameServer(model, "127.0.0.1:0")
+    session = GameSession(model)
+    # When
+    response = server.handle_request(session, {"op": "move", "position": 0})
+    # Then
+    assert response == {"board": 0, "status": None, "error": "No game in progress"}
+
+
+def test_user_player_plays_remote_game(monkeypatch, model, tmp_path):
+    # Given
+    server = GameServer(model, f"unix:{tmp_path / 'game.sock'}")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=5)
+    client = GameClient(server.address)
+    positions = iter(["0", "4", "1", "2", "3", "5", "6", "7", "8"])
+    monkeypatch.setattr('builtins.input', lambda _: next(positions))
+    player = UserPlayer()
+    player.set_observers([])
+    monkeypatch.setattr(client, "new_game", lambda: GameClient.new_game(client, "user"))
+    # When
+    result = player.play_remote(client)
+    # Then
+    assert result in ("won", "lost", "draw")
+    assert client.stats()["sessions"] == 1
+    client.close()
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
@@ -0,0 +1,200 @@
+import random
+
+import pytest
+
+from src.game.board import Board
+from src.game.monte_carlo import MonteCarloEsControl
+from src.game.players import BotPlayer
+from src.game.solver import GameSolver, PerfectPlayer, TABLE_PATH
+from src.game.tic_tac_toe import TicTacToe
+from src.game.utils import xy_to_pos
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return GameSolver.build()
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+def test_build_empty_board_is_a_draw(solver):
+    # When
+    value = solver.value(0, "X")
+    # Then
+    assert value == 0
+    assert solver.best_moves(0, "X") == list(range(9))
+
+
+def test_best_moves_takes_winning_move(solver, board):
+    # Given
+    board.place_symbol("X", 0, 0)
+    board.place_symbol("X", 1, 0)
+    board.place_symbol("O", 0, 1)
+    board.place_symbol("O", 1, 1)
+    # When
+    moves = solver.best_moves(board.state, "X")
+    # Then
+    assert solver.value(board.state, "X") == 1
+    assert moves == [2]
+
+
+def test_best_moves_corner_opening_answered_with_center(solver, board):
+    # Given
+    board.place_symbol("X", 0, 0)
+    # When
+    moves = solver.best_moves(board.state, "O")
+    # Then
+    assert moves == [4]
+
+
+def test_best_moves_finished_game_returns_no_moves(solver, board):
+    # Given
+    for x in range(3):
+        board.place_symbol("X", x, 0)
+    # When
+    moves = solver.best_moves(board.state, "O")
+    # Then
+    assert moves == []
+    assert solver.value(board.state, "O") == -1
+
+
+def test_reachable_states_counts_legal_positions(solver):
+    # When
+    x_states = set(solver.reachable_states("X").tolist())
+    o_states = set(solver.reachable_states("O").tolist())
+    # Then
+    assert 0 in x_states and 0 in o_states
+    assert len(x_states) == len(o_states)
+
+
+def test_save_and_load_keep_table(solver, tmp_path):
+    # Given
+    path = str(tmp_path / "solver.npy")
+    # When
+    solver.save(path)
+    loaded = GameSolver.load(path)
+    # Then
+    assert (loaded.table == solver.table).all()
+
+
+def test_cached_builds_missing_table_without_writing_it(solver, tmp_path):
+    # Given
+    path = tmp_path / "solver.npy"
+    # When
+    cached = GameSolver.cached(str(path))
+    # Then
+    assert (cached.table == solver.table).all()
+    assert not path.exists()
+
+
+def test_cached_keeps_solver_in_memory(solver, tmp_path, monkeypatch):
+    # Given
+    path = str(tmp_path / "solver.npy")
+    solver.save(path)
+    cached = GameSolver.cached(path)
+    monkeypatch.setattr("numpy.load", lambda _: pytest.fail("The table was loaded again"))
+    # When & Then
+    assert GameSolver.cached(path) is cached
+
+
+def test_cached_loads_table_without_building(solver, tmp_path, monkeypatch):
+    # Given
+    path = str(tmp_path / "solver.npy")
+    solver.save(path)
+    monkeypatch.setattr(GameSolver, "build", lambda: pytest.fail("The table was built"))
+    # When
+    cached = GameSolver.cached(path)
+    # Then
+    assert (cached.table == solver.table).all()
+
+
+def test_cached_rebuilds_invalid_table(solver, tmp_path):
+    # Given
+    path = str(tmp_path / "solver.npy")
+    GameSolver(solver.table[:, :10]).save(path)
+    # When
+    cached = GameSolver.cached(path)
+    # Then
+    assert (cached.table == solver.table).all()
+
+
+def test_shipped_table_matches_build(solver):
+    # When
+    shipped = GameSolver.load(TABLE_PATH)
+    # Then
+    assert (shipped.table == solver.table).all()
+
+
+def test_evaluate_policy_perfect_policy_is_optimal(solver):
+    # Given
+    model = MonteCarloEsControl()
+    model.policy = {state: solver.best_moves(state, "O")[0] for state in solver.reachable_states("O").tolist()}
+    # When
+    report = solver.evaluate_policy(model, "O")
+    # Then
+    assert report["optimal"] == report["states"]
+    assert report["optimal_rate"] == 1.0
+    assert report["blunders"] == 0
+
+
+def test_evaluate_policy_empty_policy_is_unknown(solver):
+    # When
+    report = solver.evaluate_policy(MonteCarloEsControl(), "O")
+    # Then
+    assert report["unknown"] == report["states"]
+    assert report["optimal_rate"] == 0.0
+
+
+def test_evaluate_policy_counts_invalid_and_blunders(solver, board):
+    # Given
+    board.place_symbol("X", 1, 1)
+    model = MonteCarloEsControl()
+    # Any opening is optimal, occupied corner is invalid and an edge against the center looses
+    model.policy = {0: 4, 1: 0, board.state: 1}
+    # When
+    report = solver.evaluate_policy(model, "O")
+    # Then
+    assert report["optimal"] == 1
+    assert report["invalid"] == 1
+    assert report["blunders"] == 1
+    assert report["unknown"] == report["states"] - 3
+
+
+def test_perfect_player_never_looses_against_bot(solver):
+    # Given
+    random.seed(3)
+    perfect_player = PerfectPlayer(symbol=TicTacToe.SYMBOL_PLAYER2, solver=solver)
+    perfect_player.set_observers([])
+    bot_player = BotPlayer()
+    bot_player.set_observers([])
+    bot_player.win = lambda: pytest.fail("Perfect player lost")
+    # When & Then
+    for _ in range(200):
+        TicTacToe(bot_player, perfect_player, Board(), observers=[]).start()
+
+
+def test_perfect_player_turn_returns_optimal_position(solver, board):
+    # Given
+    board.place_symbol("X", 0, 0)
+    perfect_player = PerfectPlayer(symbol="O", solver=solver)
+    # When
+    pos_x, pos_y = perfect_player.turn(board)
+    # Then
+    assert xy_to_pos(pos_x, pos_y) == 4
+
+
+def test_perfect_player_invalid_position_raise_error(solver):
+    # When & Then
+    with pytest.raises(ValueError):
+        PerfectPlayer(solver=solver).invalid_position()
+
+
+def test_perfect_player_win_prints_message(capsys, solver):
+    # When
+    PerfectPlayer(solver=solver).win()
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out != ""
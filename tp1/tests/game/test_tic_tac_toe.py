@@ -205,3 +205,67 @@ def test_random_board_board_not_empty():
     assert len(empty_spots) < 9
     assert not game.board.is_winner(game.SYMBOL_PLAYER1)
     assert not game.board.is_winner(game.SYMBOL_PLAYER2)
+
+
+def test_start_without_observers_is_quiet(capsys):
+    # Given
+    game = TicTacToe(create_mock_player(), create_mock_player(), Board(), observers=[])
+    game.player1.turn.side_effect = lambda board: board.get_empty_spots()[0]
+    game.player2.turn.side_effect = lambda board: board.get_empty_spots()[0]
+    # When
+    game.start()
+    # Then
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_start_notifies_observers_of_messages_and_moves():
+    # Given
+    observer = Mock()
+    game = TicTacToe(create_mock_player(), create_mock_player(), Board(), observers=[observer])
+    game.player1.turn.side_effect = lambda board: board.get_empty_spots()[0]
+    game.player2.turn.side_effect = lambda board: board.get_empty_spots()[0]
+    # When
+    game.start()
+    # Then
+    observer.on_message.assert_called_once_with("New Game")
+    assert observer.on_board.call_count >= 5
+
+
+def test_start_default_observers_prints_board(capsys):
+    # Given
+    game, mock_player1, mock_player2 = create_game()
+    random.seed(1)
+    mock_player1.turn.side_effect = lambda board: (0, 0)
+    mock_player2.turn.side_effect = Exception("Exit")
+    # When
+    with pytest.raises(Exception, match="Exit"):
+        game.start()
+    # Then
+    captured = capsys.readouterr()
+    assert "New Game" in captured.out
+    assert "X  |" in captured.out
+
+
+def test_random_board_keeps_board_size():
+    # Given
+    game = TicTacToe(create_mock_player(), create_mock_player(), Board(5, 4, 4), observers=[])
+    random.seed(2)
+    # When
+    game.random_board()
+    # Then
+    assert (game.board.width, game.board.height, game.board.k) == (5, 4, 4)
+    assert not game.board.is_winner(game.SYMBOL_PLAYER1)
+    assert not game.board.is_winner(game.SYMBOL_PLAYER2)
+
+
+def test_start_on_larger_board_plays_until_k_in_a_row():
+    # Given
+    game = TicTacToe(create_mock_player(), create_mock_player(), Board(4, 4, 4), observers=[])
+    game.player1.turn.side_effect = lambda board: board.get_empty_spots()[0]
+    game.player2.turn.side_effect = lambda board: board.get_empty_spots()[-1]
+    random.seed(0)
+    # When
+    game.start()
+    # Then
+    assert game.board.is_winner(game.SYMBOL_PLAYER1) or game.board.is_winner(game.SYMBOL_PLAYER2)
@@ -1,7 +1,8 @@
 import pytest
 
 from src.game.board import Board
-from src.game.utils import board_to_index, pos_to_xy, xy_to_pos
+from src.game.utils import (board_to_index, legacy_index_to_state, pos_to_xy, xy_to_pos, canonicalize,
+                            transform_action, inverse_transform_action, symmetry_tables, state_to_board, SYMMETRIES)
 
 
 @pytest.fixture
@@ -10,6 +11,16 @@ def board():
 
 
 def test_board_to_index(board):
+    # Given
+    board.place_symbol('X', 1, 0)
+    board.place_symbol('O', 2, 2)
+    # When
+    result = board_to_index(board)
+    # Then
+    assert result == 1 * 3 ** 1 + 2 * 3 ** 8
+
+
+def test_board_to_index_assigned_grid(board):
     # Given
     board.grid = [
         ['X', 'O', 'X'],
@@ -19,7 +30,26 @@ def test_board_to_index(board):
     # When
     result = board_to_index(board)
     # Then
-    assert result == "XOXOXOX X"
+    assert result == legacy_index_to_state("XOXOXOX X")
+
+
+def test_board_to_index_empty_board_returns_zero(board):
+    # When
+    result = board_to_index(board)
+    # Then
+    assert result == 0
+
+
+def test_legacy_index_to_state_matches_board_to_index(board):
+    # Given
+    board.place_symbol('X', 0, 0)
+    board.place_symbol('O', 1, 0)
+    board.place_symbol('X', 2, 1)
+    board.place_symbol('O', 1, 2)
+    # When
+    result = legacy_index_to_state("XO   X O ")
+    # Then
+    assert result == board_to_index(board)
 
 
 def test_pos_to_xy():
@@ -38,3 +68,78 @@ def test_xy_to_pos():
     pos = xy_to_pos(x, y)
     # Then
     assert pos == 5
+
+
+def test_symmetries_are_distinct_permutations():
+    # Then
+    assert len(set(SYMMETRIES)) == 8
+    assert all(sorted(symmetry) == list(range(9)) for symmetry in SYMMETRIES)
+    assert SYMMETRIES[0] == tuple(range(9))
+
+
+def test_canonicalize_rotated_boards_share_canonical_state():
+    # Given
+    corners = [(0, 0), (2, 0), (0, 2), (2, 2)]
+    states = []
+    for pos_x, pos_y in corners:
+        board = Board()
+        board.place_symbol('X', pos_x, pos_y)
+        states.append(board.state)
+    # When
+    result = {canonicalize(state)[0] for state in states}
+    # Then
+    assert result == {1}
+
+
+def test_canonicalize_transform_maps_board_to_canonical_state(board):
+    # Given
+    board.place_symbol('X', 2, 0)
+    board.place_symbol('O', 1, 2)
+    state, transform = canonicalize(board.state)
+    # When
+    transformed = Board()
+    for pos_x, pos_y, symbol in [(2, 0, 'X'), (1, 2, 'O')]:
+        pos = transform_action(xy_to_pos(pos_x, pos_y), transform)
+        transformed.place_symbol(symbol, *pos_to_xy(pos))
+    # Then
+    assert transformed.state == state
+
+
+def test_inverse_transform_action_undoes_transform_action():
+    # Then
+    for transform in range(8):
+        for pos in range(9):
+            assert inverse_transform_action(transform_action(pos, transform), transform) == pos
+
+
+def test_transform_action_keeps_positions_outside_board():
+    # Then
+    assert transform_action(9, 3) == 9
+    assert inverse_transform_action(9, 3) == 9
+
+
+def test_symmetry_tables_count_canonical_states():
+    # When
+    canonical_states, transforms, forward, inverse = symmetry_tables()
+    # Then
+    assert len(set(canonical_states.tolist())) == 2862
+    assert (canonical_states <= range(3 ** 9)).all()
+    assert forward.shape == inverse.shape == (8, 9)
+
+
+def test_pos_to_xy_and_xy_to_pos_with_width():
+    # Then
+    assert pos_to_xy(9, 4) == (1, 2)
+    assert xy_to_pos(1, 2, 4) == 9
+
+
+def test_state_to_board_larger_board():
+    # Given
+    board = Board(4, 4, 3)
+    board.place_symbol('X', 3, 1)
+    board.place_symbol('O', 0, 3)
+    # When
+    result = state_to_board(board.state, 4, 4, 3)
+    # Then
+    assert result.grid == board.grid
+    assert result.state == board.state